@@ -0,0 +1,8 @@
+"""
+Entry point: ``python -m app`` runs the production server (see app/server.py).
+"""
+from app.server import main
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,9 @@ Account endpoints.
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.concurrency import run_blocking
 from app.db.session import get_db
-from app.dependencies import get_current_user
+from app.dependencies import ConditionalGet, get_current_user, get_user_read_db
 from app.models.account_holder import AccountHolder
 from app.schemas.account import AccountCreate, AccountResponse
 from app.services.account_service import AccountService
@@ -21,24 +22,24 @@ async def create_account(
     db: Session = Depends(get_db)
 ):
     """Create a new account."""
-    account = AccountService.create_account(db, current_user.id, request)
+    account = await run_blocking(AccountService.create_account, db, current_user.id, request)
     return account
 
 
-@router.get("", response_model=List[AccountResponse])
+@router.get("", response_model=List[AccountResponse], dependencies=[Depends(ConditionalGet())])
 async def list_accounts(
     current_user: AccountHolder = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """List all user's accounts."""
     return AccountService.get_user_accounts(db, current_user.id)
 
 
-@router.get("/{account_id}", response_model=AccountResponse)
+@router.get("/{account_id}", response_model=AccountResponse, dependencies=[Depends(ConditionalGet())])
 async def get_account(
     account_id: int,
     current_user: AccountHolder = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """Get specific account."""
     return AccountService.get_account(db, account_id, current_user.id)
@@ -1,14 +1,22 @@
 """
 Admin dashboard endpoints.
 """
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.services.admin_service import AdminService
+from app.services.search_service import SearchService
 from app.core.admin_auth import verify_admin_credentials
+from app.core.concurrency import run_blocking
+from app.core.exceptions import NotFoundError
+from app.core.logging_config import logger
+from app.core.profiling import profiler
+from app.schemas.profiling import ProfilingConfig, ProfilingStatus, ProfileInfo
+from app.schemas.search import SearchKind, SearchResults
 from app.config import settings
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -20,7 +28,7 @@ templates = Jinja2Templates(directory="app/templates")
 @router.get("", response_class=HTMLResponse)
 async def admin_dashboard(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     username: str = Depends(verify_admin_credentials)
 ):
     """
@@ -47,6 +55,83 @@ async def admin_dashboard(
     )
 
 
+@router.get("/search", response_model=SearchResults)
+async def admin_search(
+    q: str = Query(..., min_length=2, max_length=200, description="Words to match as prefixes"),
+    kind: Optional[SearchKind] = Query(None, description="Only holders, accounts or transactions"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1),
+    db: Session = Depends(get_read_db),
+    username: str = Depends(verify_admin_credentials)
+):
+    """
+    Find account holders (name, email), accounts (number) and transactions
+    (description).
+
+    Every word is matched as a prefix and all words must match. Results are
+    ranked by relevance unless the query matches very many rows, in which
+    case they are listed newest first (`ranked` is false).
+    """
+    page_size = min(page_size, settings.admin_search_max_page_size)
+    return SearchService.search(db, q, kind, page, page_size)
+
+
+def _profiling_status() -> ProfilingStatus:
+    return ProfilingStatus(
+        enabled=profiler.enabled,
+        sample_rate=profiler.sample_rate,
+        allow_header=profiler.allow_header,
+        header=settings.profiling_header,
+        header_token=profiler.header_token,
+        interval_ms=settings.profiling_interval_ms
+    )
+
+
+@router.get("/profiling", response_model=ProfilingStatus)
+async def get_profiling(username: str = Depends(verify_admin_credentials)):
+    """Get request profiler configuration."""
+    return _profiling_status()
+
+
+@router.put("/profiling", response_model=ProfilingStatus)
+async def configure_profiling(
+    config: ProfilingConfig,
+    username: str = Depends(verify_admin_credentials)
+):
+    """
+    Enable or disable request profiling.
+
+    When enabled, a `sample_rate` fraction of requests is profiled, plus any
+    request whose debug header carries `header_token` if `allow_header` is
+    set. Profiled responses carry an `X-Profile-ID` header naming the stored
+    profile.
+    """
+    profiler.configure(config.enabled, config.sample_rate, config.allow_header)
+    logger.info(
+        "Request profiling configured",
+        extra={"admin": username, **config.model_dump()}
+    )
+    return _profiling_status()
+
+
+@router.get("/profiling/profiles", response_model=List[ProfileInfo])
+async def list_profiles(
+    trace_id: Optional[str] = Query(None, description="Only profiles of the request with this trace ID"),
+    username: str = Depends(verify_admin_credentials)
+):
+    """List stored request profiles, newest first."""
+    return await run_blocking(profiler.list_profiles, trace_id)
+
+
+@router.get("/profiling/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, username: str = Depends(verify_admin_credentials)):
+    """Download a profile as folded stacks (flamegraph.pl / speedscope input)."""
+    profile = await run_blocking(profiler.read_profile, profile_id)
+    if profile is None:
+        raise NotFoundError("Profile not found")
+    return PlainTextResponse(profile)
+
+
 @router.get("/logout")
 async def admin_logout():
     """
@@ -0,0 +1,28 @@
+"""
+Spending analytics endpoints.
+"""
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.dependencies import ConditionalGet, get_current_user, get_user_read_db
+from app.models.account_holder import AccountHolder
+from app.schemas.analytics import Analytics
+from app.services.analytics_service import AnalyticsService
+
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+# The default range ends with the current period, so the ETag changes daily too
+@router.get("", response_model=Analytics, dependencies=[Depends(ConditionalGet(vary_by_day=True))])
+async def get_analytics(
+    bucket: Literal["day", "week", "month"] = Query("day", description="Period size"),
+    start: Optional[datetime] = Query(None, description="Only transactions created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only transactions created before this time"),
+    account_id: Optional[int] = Query(None, description="Filter by account ID"),
+    current_user: AccountHolder = Depends(get_current_user),
+    db: Session = Depends(get_user_read_db)
+):
+    """Get inflow/outflow totals bucketed by period and transaction type."""
+    return AnalyticsService.get_analytics(db, current_user.id, bucket, start, end, account_id)
@@ -3,6 +3,7 @@ Authentication endpoints.
 """
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
+from app.core.concurrency import run_blocking
 from app.db.session import get_db
 from app.schemas.auth import SignupRequest, LoginRequest, TokenResponse
 from app.services.auth_service import AuthService
@@ -14,7 +15,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def signup(request: SignupRequest, db: Session = Depends(get_db)):
     """Register a new user."""
-    return AuthService.signup(db, request)
+    return await run_blocking(AuthService.signup, db, request)
 
 
 @router.post("/login", response_model=TokenResponse)
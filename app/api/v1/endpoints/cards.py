@@ -4,8 +4,9 @@ Card endpoints.
 from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.core.concurrency import run_blocking
 from app.db.session import get_db
-from app.dependencies import get_current_user
+from app.dependencies import ConditionalGet, get_current_user, get_user_read_db
 from app.models.account_holder import AccountHolder
 from app.schemas.card import CardCreate, CardResponse
 from app.services.card_service import CardService
@@ -21,16 +22,19 @@ async def create_card(
     db: Session = Depends(get_db)
 ):
     """Create a new card."""
-    card = CardService.create_card(db, current_user.id, request)
+    card = await run_blocking(CardService.create_card, db, current_user.id, request)
     return CardService.get_card_response(card)
 
 
-@router.get("", response_model=List[CardResponse])
+@router.get("", response_model=List[CardResponse], dependencies=[Depends(ConditionalGet())])
 async def list_cards(
     account_id: Optional[int] = Query(None, description="Filter by account ID"),
     current_user: AccountHolder = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db),
+    primary_db: Session = Depends(get_db)
 ):
-    """List user's cards."""
+    """List user's cards, re-encrypting any stored under an old key or format."""
     cards = CardService.get_user_cards(db, current_user.id, account_id)
-    return [CardService.get_card_response(card) for card in cards]
+    responses = [CardService.get_card_response(card) for card in cards]
+    await run_blocking(CardService.reseal_card_numbers, primary_db, cards)
+    return responses
@@ -1,10 +1,11 @@
 """
 Statement endpoints.
 """
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.dependencies import get_current_user
+from app.core.compression import precompressed_response
+from app.dependencies import ConditionalGet, get_current_user, get_user_read_db
 from app.models.account_holder import AccountHolder
 from app.schemas.statement import Statement
 from app.services.statement_service import StatementService
@@ -13,10 +14,22 @@ from app.services.statement_service import StatementService
 router = APIRouter(prefix="/statements", tags=["Statements"])
 
 
-@router.get("", response_model=Statement)
+# The 30-day window moves with the date, so the ETag changes daily too
+@router.get("", response_model=Statement, dependencies=[Depends(ConditionalGet(vary_by_day=True))])
 async def get_statement(
+    request: Request,
+    response: Response,
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Calendar month (YYYY-MM)"),
     current_user: AccountHolder = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
-    """Get 30-day statement for all accounts."""
-    return StatementService.get_user_statement(db, current_user.id, days=30)
+    """Get the 30-day statement for all accounts, or the statement for a calendar month."""
+    if month is None:
+        return StatementService.get_user_statement(db, current_user.id, days=30)
+
+    # Closed months are served as stored; the open month is computed live
+    if StatementService.is_closed(month):
+        stored = StatementService.get_stored_statement(db, current_user.id, month)
+        if stored is not None:
+            return precompressed_response(stored, request.headers.get("accept-encoding"), headers=dict(response.headers))
+    return StatementService.get_month_statement(db, current_user.id, month)
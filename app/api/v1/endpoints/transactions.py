@@ -1,11 +1,13 @@
 """
 Transaction endpoints.
 """
+from datetime import datetime
 from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.core.concurrency import run_blocking
 from app.db.session import get_db
-from app.dependencies import get_current_user
+from app.dependencies import ConditionalGet, get_current_user, get_user_read_db
 from app.models.account_holder import AccountHolder
 from app.schemas.transaction import (
     DepositRequest, WithdrawalRequest, TransferRequest, TransactionResponse
@@ -23,7 +25,7 @@ async def create_deposit(
     db: Session = Depends(get_db)
 ):
     """Create a deposit transaction."""
-    return TransactionService.create_deposit(db, current_user.id, request)
+    return await run_blocking(TransactionService.create_deposit, db, current_user.id, request)
 
 
 @router.post("/withdraw", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
@@ -33,7 +35,7 @@ async def create_withdrawal(
     db: Session = Depends(get_db)
 ):
     """Create a withdrawal transaction."""
-    return TransactionService.create_withdrawal(db, current_user.id, request)
+    return await run_blocking(TransactionService.create_withdrawal, db, current_user.id, request)
 
 
 @router.post("/transfer", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
@@ -43,14 +45,16 @@ async def create_transfer(
     db: Session = Depends(get_db)
 ):
     """Create a transfer transaction."""
-    return TransactionService.create_transfer(db, current_user.id, request)
+    return await run_blocking(TransactionService.create_transfer, db, current_user.id, request)
 
 
-@router.get("", response_model=List[TransactionResponse])
+@router.get("", response_model=List[TransactionResponse], dependencies=[Depends(ConditionalGet())])
 async def list_transactions(
     account_id: Optional[int] = Query(None, description="Filter by account ID"),
+    start: Optional[datetime] = Query(None, description="Only transactions created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only transactions created before this time"),
     current_user: AccountHolder = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_user_read_db)
 ):
     """List user's transactions."""
-    return TransactionService.get_transactions(db, current_user.id, account_id)
+    return TransactionService.get_transactions(db, current_user.id, account_id, start, end)
@@ -1,8 +1,10 @@
 """
 Application configuration management using Pydantic Settings.
 """
-from typing import List
+from decimal import Decimal
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from app.core.lazy import LazyProxy
 
 
 class Settings(BaseSettings):
@@ -24,16 +26,41 @@ class Settings(BaseSettings):
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8443
-    reload: bool = True
+    reload: bool = False  # Development only: single process, restarts on code changes
+    workers: int = 0  # 0 = one per available CPU
+    keepalive_seconds: int = 5
+    backlog: int = 2048
+    graceful_timeout_seconds: int = 30  # Drain time for in-flight requests on SIGTERM
+    worker_timeout_seconds: int = 60
+    max_requests: int = 10000  # Recycle a worker after this many requests (0 = never)
+    max_requests_jitter: int = 1000
 
     # Security Keys
     secret_key: str
     encryption_key: str
+    encryption_keys: str = ""  # Extra keys for rotation: "id=key,id=key", primary first
+    encryption_format: str = "fernet"  # Format for new ciphertexts: 'fernet' or 'aes-gcm'
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
 
     # Database Configuration
     database_url: str
+    database_read_url: Optional[str] = None  # Read replica; defaults to database_url
+    read_your_writes_window_seconds: float = 5.0
+
+    # SQLite Tuning (ignored for other databases)
+    sqlite_tuning_enabled: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size: int = 268435456
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_temp_store: str = "MEMORY"
+
+    # Retry on SQLITE_BUSY (exponential backoff with full jitter)
+    db_busy_retries: int = 5
+    db_busy_retry_base_ms: float = 20.0
+    db_busy_retry_max_ms: float = 500.0
 
     # TLS/SSL Certificates
     ssl_cert_path: str = "./runtime/certs/cert.pem"
@@ -50,13 +77,101 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_per_minute: int = 60
 
+    # Response Compression (negotiated via Accept-Encoding)
+    compression_enabled: bool = True
+    compression_encodings: str = "zstd,br,gzip"  # Server preference order
+    compression_min_size: int = 1024  # Smaller bodies are sent uncompressed
+    compression_zstd_level: int = 3
+    compression_brotli_quality: int = 4
+    compression_gzip_level: int = 6
+
     # Logging Configuration
     log_level: str = "INFO"
     log_file: str = "./runtime/log/bank-api.log"
+    slow_query_log_file: str = "./runtime/log/slow-queries.log"
+    slow_query_threshold_ms: float = 100.0
+
+    # Transaction Archiving (rows older than the horizon move to transactions_archive)
+    archive_horizon_days: int = 365
+    archive_batch_size: int = 1000
+
+    # Monthly Statements (closed months materialized by scripts/materialize_statements.py)
+    statement_workers: int = 0  # Materialization processes (0 = available CPUs)
+    statement_chunk_size: int = 200  # Account holders per worker task
+
+    # Bulk Holder Import (scripts/import_holders.py)
+    import_chunk_size: int = 500  # Rows per chunk and commit
+    import_workers: int = 0  # Password-hashing processes (0 = available CPUs)
+    import_checkpoint_file: str = "./runtime/import_checkpoint.json"
+
+    # Balance Reconciliation (scripts/reconcile_balances.py)
+    reconciliation_workers: int = 0  # Worker processes (0 = available CPUs)
+    reconciliation_chunk_size: int = 5000  # Accounts per chunk and commit
+    reconciliation_report_dir: str = "./runtime/reconciliation"
+
+    # Interest Accrual (scripts/accrue_interest.py)
+    savings_interest_rate: Decimal = Decimal("0.040000")  # Annual rate, accrued daily on an actual/365 basis
+    interest_chunk_size: int = 10_000  # Accounts per chunk and commit
+
+    # Velocity Rules (limits on withdrawals and outgoing transfers per account; 0 = unlimited)
+    velocity_enabled: bool = True
+    velocity_backend: str = "memory"  # 'memory' (per process) or 'redis' (shared by all workers)
+    velocity_redis_url: str = "redis://localhost:6379/0"
+    velocity_max_accounts: int = 50_000  # Accounts kept by the memory backend
+    velocity_max_count_per_minute: int = 10
+    velocity_max_count_per_hour: int = 60
+    velocity_max_count_per_day: int = 200
+    velocity_max_amount_per_minute: Decimal = Decimal("5000.00")
+    velocity_max_amount_per_hour: Decimal = Decimal("20000.00")
+    velocity_max_amount_per_day: Decimal = Decimal("50000.00")
+    velocity_new_payee_max_amount: Decimal = Decimal("2500.00")  # First transfer to a payee
+    velocity_new_payees_per_day: int = 5
+
+    # Spending Analytics (GET /api/v1/analytics)
+    analytics_max_buckets: int = 366  # Longest range, in buckets of the requested size
+    analytics_cache_ttl_seconds: float = 30.0  # Per-user result cache (0 = off)
+    analytics_numpy_min_rows: int = 1000  # Roll up with NumPy from this many grouped rows
+
+    # Admin Search (GET /admin/search)
+    admin_search_backend: str = "auto"  # 'fts5' (SQLite), 'like' (any database) or 'auto'
+    admin_search_max_page_size: int = 100
+    admin_search_rank_limit: int = 10_000  # Broader queries are ordered newest first instead of by rank
+
+    # Transactional Outbox (post-commit side effects)
+    outbox_dispatcher_enabled: bool = True  # Run the dispatcher inside the API process
+    outbox_batch_size: int = 100
+    outbox_poll_interval_seconds: float = 1.0
+    outbox_lease_seconds: float = 30.0
+    outbox_max_attempts: int = 10
+    outbox_retry_base_seconds: float = 1.0
+    outbox_retry_max_seconds: float = 300.0
+    outbox_retention_hours: float = 24.0
+
+    # Key Rotation (re-encryption of stored SSNs and card numbers)
+    key_rotation_batch_size: int = 500
+    key_rotation_rows_per_second: float = 2000.0
+    key_rotation_checkpoint_file: str = "./runtime/key_rotation.json"
 
     # Bank Institution Details
     routing_number: str = "123456789"
 
+    # ACH Settlement (outbound NACHA files)
+    ach_output_dir: str = "./runtime/ach"
+    ach_chunk_size: int = 5000
+    ach_company_name: str = "INVISIBLE BANK"
+    ach_company_id: str = "1123456789"
+    ach_immediate_destination: Optional[str] = None  # ACH operator routing; defaults to routing_number
+    ach_immediate_destination_name: str = "ACH OPERATOR"
+
+    # Request Profiling (toggled at runtime from the admin portal)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_allow_header: bool = True
+    profiling_header: str = "X-Debug-Profile"
+    profiling_interval_ms: float = 5.0
+    profiling_dir: str = "./runtime/profiles"
+    profiling_max_profiles: int = 200
+
 
-# Global settings instance
-settings = Settings()
+# Global settings instance, read from the environment on first use
+settings: Settings = LazyProxy(Settings)
@@ -0,0 +1,285 @@
+"""
+Response compression negotiated via ``Accept-Encoding``.
+
+Pure ASGI middleware supporting zstd, brotli and gzip. zstd and brotli are
+optional dependencies; an encoding whose library is not installed is never
+offered. Responses smaller than ``settings.compression_min_size``,
+non-text content types and responses that already carry a
+``Content-Encoding`` pass through untouched.
+
+Complete bodies are compressed in one call. Streaming responses (more than
+one body message) are compressed incrementally, and each chunk is flushed
+so clients receive data as it is produced rather than when the stream ends.
+
+Bodies stored gzip-compressed (e.g. materialized statements) are served
+as-is through ``precompressed_response``.
+"""
+import gzip
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.responses import Response
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+    "application/problem+json",
+)
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def _gzip_compress(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _encoders() -> Dict[str, Tuple[Callable[[int], object], Callable[[bytes, int], bytes]]]:
+    """Installed encodings: name -> (stream factory, one-shot compress)."""
+    encoders = {"gzip": (_GzipStream, _gzip_compress)}
+    if brotli is not None:
+        encoders["br"] = (_BrotliStream, lambda data, level: brotli.compress(data, quality=level))
+    if zstandard is not None:
+        encoders["zstd"] = (_ZstdStream, lambda data, level: zstandard.ZstdCompressor(level=level).compress(data))
+    return encoders
+
+
+ENCODERS = _encoders()
+
+
+def compression_levels() -> Dict[str, int]:
+    """
+    Configured level per encoding.
+
+    Returns:
+        Dict[str, int]: Encoding name to level
+    """
+    return {
+        "zstd": settings.compression_zstd_level,
+        "br": settings.compression_brotli_quality,
+        "gzip": settings.compression_gzip_level,
+    }
+
+
+def available_encodings() -> List[str]:
+    """
+    Encodings offered by the server, in preference order.
+
+    Returns:
+        List[str]: Configured encodings whose library is installed
+    """
+    configured = [name.strip() for name in settings.compression_encodings.split(",") if name.strip()]
+    return [name for name in configured if name in ENCODERS]
+
+
+def negotiate_encoding(accept_encoding: str, offered: List[str]) -> Optional[str]:
+    """
+    Pick the encoding for a request.
+
+    The client's highest q-value wins; ties go to the server's preference
+    order. ``*`` covers encodings the client did not list, and ``q=0``
+    excludes an encoding.
+
+    Args:
+        accept_encoding: ``Accept-Encoding`` header value
+        offered: Server encodings in preference order
+
+    Returns:
+        Optional[str]: Chosen encoding, or None for identity
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in offered:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def precompressed_response(
+    body: bytes,
+    accept_encoding: Optional[str],
+    media_type: str = "application/json",
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serve a gzip-compressed body without recompressing it.
+
+    Clients accepting gzip get the stored bytes; others get them inflated.
+
+    Args:
+        body: gzip-compressed body
+        accept_encoding: Request ``Accept-Encoding`` header value
+        media_type: Content type of the uncompressed body
+        headers: Extra response headers
+
+    Returns:
+        Response: Response with ``Content-Encoding: gzip`` when accepted
+    """
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    if accept_encoding and negotiate_encoding(accept_encoding, ["gzip"]):
+        return Response(body, media_type=media_type, headers={**headers, "Content-Encoding": "gzip"})
+    return Response(gzip.decompress(body), media_type=media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses."""
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding, available_encodings()) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        minimum_size = settings.compression_min_size if self.minimum_size is None else self.minimum_size
+        responder = _CompressingResponder(send, encoding, compression_levels()[encoding], minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """Wraps ``send`` for one response, compressing its body."""
+
+    def __init__(self, send, encoding: str, level: int, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.passthrough = False
+        self.stream = None
+
+    async def __call__(self, message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = {name.lower(): value for name, value in message.get("headers", [])}
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+            self.passthrough = (
+                b"content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None and self.start_message is not None:
+            if not more_body:
+                # Complete body: compress in one call if it is worth it
+                if len(body) < self.minimum_size:
+                    await self._flush_start()
+                    await self.send(message)
+                    return
+                compressed = ENCODERS[self.encoding][1](body, self.level)
+                await self._flush_start(len(compressed))
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streaming body: compress incrementally; the total length is unknown
+            self.stream = ENCODERS[self.encoding][0](self.level)
+            await self._flush_start(None)
+
+        if more_body:
+            chunk = self.stream.compress(body) if body else b""
+            if chunk:
+                await self.send({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            tail = (self.stream.compress(body) if body else b"") + self.stream.finish()
+            await self.send({"type": "http.response.body", "body": tail})
+
+    async def _flush_start(self, compressed_length: Optional[int] = -1) -> None:
+        """
+        Send the held response start.
+
+        Args:
+            compressed_length: -1 to send headers unchanged, None for a
+                streamed encoded body, else the encoded body length
+        """
+        if self.start_message is None:
+            return
+        message, self.start_message = self.start_message, None
+        headers = list(message.get("headers", []))
+        if compressed_length != -1:
+            headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+            headers.append((b"content-encoding", self.encoding.encode()))
+            if compressed_length is not None:
+                headers.append((b"content-length", str(compressed_length).encode()))
+        headers.append((b"vary", b"Accept-Encoding"))
+        await self.send({**message, "headers": headers})
@@ -0,0 +1,31 @@
+"""
+Running blocking work from async endpoints.
+
+Service calls are synchronous: they hold SQLite locks, hash passwords and
+back off with ``time.sleep`` when the database is busy (``retry_on_busy``).
+Called directly from an ``async def`` endpoint they would stall the event
+loop, and every other request of the worker, for that long.
+"""
+from typing import Callable, TypeVar
+from starlette.concurrency import run_in_threadpool
+from app.core.profiling import follow_thread
+
+
+R = TypeVar("R")
+
+
+async def run_blocking(func: Callable[..., R], *args, **kwargs) -> R:
+    """
+    Run a blocking call in the threadpool and wait for it without blocking the event loop.
+
+    A profiled request keeps sampling the thread running the call.
+
+    Args:
+        func: Blocking function
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        The function's result
+    """
+    return await run_in_threadpool(follow_thread(func), *args, **kwargs)
@@ -1,14 +1,16 @@
 """
 Custom exceptions for the banking API.
 """
+from typing import Dict, Optional
 
 
 class BankAPIException(Exception):
     """Base exception for all API errors."""
 
-    def __init__(self, message: str, status_code: int = 400):
+    def __init__(self, message: str, status_code: int = 400, headers: Optional[Dict[str, str]] = None):
         self.message = message
         self.status_code = status_code
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -59,3 +61,12 @@ class TransactionError(BankAPIException):
 
     def __init__(self, message: str = "Transaction failed"):
         super().__init__(message, status_code=400)
+
+
+class VelocityLimitError(BankAPIException):
+    """Outgoing transaction blocked by a velocity rule."""
+
+    def __init__(self, message: str = "Transaction velocity limit exceeded", retry_after: Optional[int] = None):
+        super().__init__(
+            message, status_code=429, headers={"Retry-After": str(retry_after)} if retry_after else None
+        )
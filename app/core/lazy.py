@@ -0,0 +1,84 @@
+"""
+Lazily initialized module-level singletons.
+
+Settings, loggers and the encryption service are used as module globals
+throughout the code base. Building them at import time meant that importing
+any module read the environment, created log directories and opened log
+files. ``LazyProxy`` keeps the module-global API but defers building the
+object until its first attribute access; ``create_app()`` and the scripts
+trigger that when they actually need it.
+"""
+import threading
+from typing import Any, Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+_UNSET = object()
+
+
+class LazyProxy(Generic[T]):
+    """Proxy that builds its target with ``factory()`` on first use."""
+
+    __slots__ = ("_factory", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Initialize the proxy without building the target.
+
+        Args:
+            factory: Zero-argument callable returning the target
+        """
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", _UNSET)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self) -> T:
+        instance = self._instance
+        if instance is _UNSET:
+            with self._lock:
+                instance = self._instance
+                if instance is _UNSET:
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._resolve(), name)
+
+    def __repr__(self) -> str:
+        if self._instance is _UNSET:
+            return f"<LazyProxy of {getattr(self._factory, '__qualname__', self._factory)} (not initialized)>"
+        return repr(self._instance)
+
+
+def resolve(proxy: Any) -> Any:
+    """
+    Build a lazy singleton now (e.g. at startup, to fail fast on bad config).
+
+    Args:
+        proxy: A ``LazyProxy`` or an ordinary object
+
+    Returns:
+        The underlying object
+    """
+    return proxy._resolve() if isinstance(proxy, LazyProxy) else proxy
+
+
+def is_initialized(proxy: LazyProxy) -> bool:
+    """
+    Check whether a lazy singleton has been built.
+
+    Args:
+        proxy: Lazy singleton
+
+    Returns:
+        bool: True once the factory has run
+    """
+    return proxy._instance is not _UNSET
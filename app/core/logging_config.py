@@ -7,6 +7,21 @@ from pathlib import Path
 from logging.handlers import TimedRotatingFileHandler
 from pythonjsonlogger import jsonlogger
 from app.config import settings
+from app.core.lazy import LazyProxy
+
+
+def _json_formatter() -> jsonlogger.JsonFormatter:
+    """JSON formatter for structured logging."""
+    return jsonlogger.JsonFormatter(
+        fmt="%(asctime)s %(levelname)s %(name)s %(message)s %(pathname)s %(lineno)d",
+        rename_fields={
+            "levelname": "level",
+            "asctime": "timestamp",
+            "pathname": "file",
+            "lineno": "line"
+        },
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
 
 
 def setup_logging() -> logging.Logger:
@@ -20,6 +35,8 @@ def setup_logging() -> logging.Logger:
     log_dir = Path(settings.log_file).parent
     log_dir.mkdir(parents=True, exist_ok=True)
 
+    json_formatter = _json_formatter()
+
     # Get root logger
     logger = logging.getLogger()
     logger.setLevel(getattr(logging, settings.log_level.upper()))
@@ -27,18 +44,6 @@ def setup_logging() -> logging.Logger:
     # Clear existing handlers to avoid duplicates
     logger.handlers.clear()
 
-    # JSON formatter for structured logging
-    json_formatter = jsonlogger.JsonFormatter(
-        fmt="%(asctime)s %(levelname)s %(name)s %(message)s %(pathname)s %(lineno)d",
-        rename_fields={
-            "levelname": "level",
-            "asctime": "timestamp",
-            "pathname": "file",
-            "lineno": "line"
-        },
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-
     # Console handler for development
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(json_formatter)
@@ -70,5 +75,34 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
-# Initialize logging on module import
-logger = setup_logging()
+def setup_slow_query_logging() -> logging.Logger:
+    """
+    Configure the slow-query logger, which writes to its own rotating file.
+
+    Returns:
+        logging.Logger: Slow-query logger
+    """
+    log_dir = Path(settings.slow_query_log_file).parent
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    slow_logger = logging.getLogger("bank_api.slow_queries")
+    slow_logger.setLevel(logging.WARNING)
+    slow_logger.propagate = False
+    slow_logger.handlers.clear()
+
+    file_handler = TimedRotatingFileHandler(
+        filename=settings.slow_query_log_file,
+        when="midnight",
+        interval=1,
+        backupCount=30,
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(_json_formatter())
+    slow_logger.addHandler(file_handler)
+
+    return slow_logger
+
+
+# Loggers are configured on first use rather than on import
+logger: logging.Logger = LazyProxy(setup_logging)
+slow_query_logger: logging.Logger = LazyProxy(setup_slow_query_logging)
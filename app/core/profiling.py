@@ -0,0 +1,315 @@
+"""
+On-demand sampling profiler for live requests.
+
+Samples the stack of the thread serving a request at a fixed interval and
+writes the result as collapsed ("folded") stacks, the input format of
+flamegraph.pl, speedscope and inferno. Each profile is stored under
+``settings.profiling_dir`` as ``<profile_id>.folded``, with a
+server-generated profile ID, next to ``<profile_id>.json`` holding the
+request's trace ID and label.
+
+The sampled thread is the one running the request middleware, i.e. the
+event loop, plus any threadpool thread running a blocking call the request
+handed off with ``app.core.concurrency.run_blocking``. Event-loop stacks
+include any other request the loop interleaves meanwhile. A worker therefore profiles one request at a
+time (others are not profiled while it runs), but unprofiled concurrent
+requests can still show up in a profile; profile under light load, or read
+the stacks below the endpoint's own frames.
+
+Profiling is disabled by default; the request middleware only checks
+``profiler.enabled`` until an admin turns it on. The debug header only
+forces profiling when it carries the token shown to admins by
+``GET /admin/profiling``.
+"""
+import functools
+import hashlib
+import hmac
+import json
+import random
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.config import settings
+from app.core.lazy import LazyProxy
+
+
+# Profile IDs name files, so only accept the ones this module generates
+_PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Trace IDs are client-supplied; bound what is stored with a profile
+_MAX_TRACE_ID_LENGTH = 128
+
+R = TypeVar("R")
+
+
+class StackSampler:
+    """Background thread that samples the stacks of the threads serving one request."""
+
+    def __init__(self, thread_id: int, interval: float):
+        """
+        Initialize sampler.
+
+        Args:
+            thread_id: Identifier of the thread to sample
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        # The request's thread plus the threadpool threads it is waiting on (see ``follow_thread``)
+        self.thread_ids = {thread_id}
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.context_token = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """
+        Stop sampling and wait for the sampler thread to exit.
+
+        Returns:
+            Counter: Sample counts keyed by folded stack
+        """
+        self._stop_event.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in tuple(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[self._fold(frame)] += 1
+
+    @staticmethod
+    def _fold(frame) -> str:
+        """Render a frame chain root-first as a semicolon separated stack."""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            filename = Path(code.co_filename).name
+            stack.append(f"{code.co_name} ({filename}:{frame.f_lineno})")
+            frame = frame.f_back
+        stack.reverse()
+        return ";".join(label.replace(";", ",") for label in stack)
+
+
+# Sampler of the request being profiled; copied into the threads it hands work to
+_current_sampler: ContextVar[Optional[StackSampler]] = ContextVar("profiling_sampler", default=None)
+
+
+def follow_thread(func: Callable[..., R]) -> Callable[..., R]:
+    """
+    Wrap a function so the thread running it is sampled with its request.
+
+    Only has an effect when called in the context of a profiled request,
+    e.g. through ``run_in_threadpool``, which copies the context.
+
+    Args:
+        func: Blocking function
+
+    Returns:
+        Wrapped function
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        sampler = _current_sampler.get()
+        if sampler is None:
+            return func(*args, **kwargs)
+        thread_id = threading.get_ident()
+        sampler.thread_ids.add(thread_id)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sampler.thread_ids.discard(thread_id)
+
+    return wrapper
+
+
+class RequestProfiler:
+    """
+    Runtime-togglable request profiler.
+
+    A request is profiled when profiling is enabled, no other request of
+    this process is being profiled, and either it wins the sampling lottery
+    or it carries the debug header with the admin token (if allowed).
+    """
+
+    def __init__(self):
+        """Initialize profiler state from settings."""
+        self.enabled = settings.profiling_enabled
+        self.sample_rate = settings.profiling_sample_rate
+        self.allow_header = settings.profiling_allow_header
+        # Derived from the secret key, so every worker accepts the same token
+        self.header_token = hmac.new(
+            settings.secret_key.encode("utf-8"), b"request-profiling-header", hashlib.sha256
+        ).hexdigest()[:32]
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    def configure(self, enabled: bool, sample_rate: float, allow_header: bool) -> None:
+        """
+        Update profiler configuration.
+
+        Args:
+            enabled: Master switch
+            sample_rate: Fraction of requests to profile (0.0 - 1.0)
+            allow_header: Whether the debug header forces profiling
+        """
+        self.sample_rate = sample_rate
+        self.allow_header = allow_header
+        self.enabled = enabled
+
+    def should_profile(self, headers) -> bool:
+        """
+        Decide whether to profile a request.
+
+        Args:
+            headers: Request headers
+
+        Returns:
+            bool: True if the request should be profiled
+        """
+        if self.allow_header and hmac.compare_digest(
+            headers.get(settings.profiling_header, "").encode("utf-8"), self.header_token.encode("utf-8")
+        ):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> Optional[StackSampler]:
+        """
+        Start sampling the current thread, unless another request is being profiled.
+
+        Returns:
+            Optional[StackSampler]: Running sampler, or None if the profiler is busy
+        """
+        if not self._active.acquire(blocking=False):
+            return None
+        try:
+            sampler = StackSampler(threading.get_ident(), settings.profiling_interval_ms / 1000)
+            sampler.start()
+        except BaseException:
+            self._active.release()
+            raise
+        sampler.context_token = _current_sampler.set(sampler)
+        return sampler
+
+    def stop(self, sampler: StackSampler) -> Counter:
+        """
+        Stop a sampler started by ``start`` and free the profiler for the next request.
+
+        Must be called from the context that called ``start``.
+
+        Args:
+            sampler: Running sampler
+
+        Returns:
+            Counter: Sample counts keyed by folded stack
+        """
+        try:
+            _current_sampler.reset(sampler.context_token)
+            return sampler.stop()
+        finally:
+            self._active.release()
+
+    def save(self, samples: Counter, label: str, trace_id: str) -> Tuple[str, Path]:
+        """
+        Store samples as a folded-stack file tagged with the request's trace ID.
+
+        Writes to disk, so call it off the event loop.
+
+        Args:
+            samples: Result of ``stop``
+            label: Root frame label (e.g. "GET /api/v1/transactions")
+            trace_id: Trace ID of the profiled request
+
+        Returns:
+            Tuple[str, Path]: Profile ID and written profile
+        """
+        profile_id = uuid.uuid4().hex
+        profile_dir = Path(settings.profiling_dir)
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        path = profile_dir / f"{profile_id}.folded"
+
+        # Metadata first: a listed profile always has its trace ID
+        path.with_suffix(".json").write_text(
+            json.dumps({"trace_id": trace_id[:_MAX_TRACE_ID_LENGTH], "label": label}), encoding="utf-8"
+        )
+        root = label.replace(";", ",")
+        lines = [f"{root};{stack} {count}" for stack, count in samples.most_common()]
+        path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+
+        self._prune(profile_dir)
+        return profile_id, path
+
+    def list_profiles(self, trace_id: Optional[str] = None) -> List[Dict[str, object]]:
+        """
+        List stored profiles, newest first.
+
+        Args:
+            trace_id: Only list the profiles of this request
+
+        Returns:
+            List of profile metadata dictionaries
+        """
+        profile_dir = Path(settings.profiling_dir)
+        if not profile_dir.exists():
+            return []
+
+        profiles = []
+        paths = sorted(profile_dir.glob("*.folded"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in paths:
+            try:
+                metadata = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                metadata = {}
+            if trace_id is not None and metadata.get("trace_id") != trace_id:
+                continue
+            profiles.append({
+                "profile_id": path.stem,
+                "trace_id": metadata.get("trace_id"),
+                "label": metadata.get("label"),
+                "size_bytes": path.stat().st_size,
+                "created_at": datetime.utcfromtimestamp(path.stat().st_mtime),
+            })
+        return profiles
+
+    def read_profile(self, profile_id: str) -> Optional[str]:
+        """
+        Read a stored profile.
+
+        Args:
+            profile_id: Profile ID returned in ``X-Profile-ID``
+
+        Returns:
+            Optional[str]: Folded stacks, or None if not found
+        """
+        if not _PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = Path(settings.profiling_dir) / f"{profile_id}.folded"
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    def _prune(self, profile_dir: Path) -> None:
+        """Keep at most ``settings.profiling_max_profiles`` files."""
+        with self._lock:
+            paths = sorted(profile_dir.glob("*.folded"), key=lambda p: p.stat().st_mtime)
+            for path in paths[:max(len(paths) - settings.profiling_max_profiles, 0)]:
+                path.unlink(missing_ok=True)
+                path.with_suffix(".json").unlink(missing_ok=True)
+
+
+# Global profiler instance, initialized from settings on first use
+profiler: RequestProfiler = LazyProxy(RequestProfiler)
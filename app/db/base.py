@@ -8,7 +8,19 @@ from app.models.base import Base  # noqa
 from app.models.account_holder import AccountHolder  # noqa
 from app.models.account import Account  # noqa
 from app.models.transaction import Transaction  # noqa
+from app.models.archived_transaction import ArchivedTransaction  # noqa
 from app.models.card import Card  # noqa
+from app.models.journal_entry import JournalEntry  # noqa
+from app.models.posting import Posting  # noqa
+from app.models.outbox_event import OutboxEvent  # noqa
+from app.models.ach_transfer import AchTransfer  # noqa
+from app.models.monthly_statement import MonthlyStatement  # noqa
+from app.models.reconciled_balance import ReconciledBalance  # noqa
+from app.models.reconciliation_run import ReconciliationRun  # noqa
+from app.models.interest_accrual import InterestAccrual  # noqa
+
+# FTS index and triggers, created alongside the tables (SQLite only)
+from app.db import search_index  # noqa
 
 # This ensures all models are registered with Base.metadata
 # which is needed for Alembic auto-generation of migrations
@@ -0,0 +1,121 @@
+"""
+SQL instrumentation: per-request query statistics and slow-query logging.
+
+Engine event hooks time every cursor execution. Each statement is added to
+the current request's QueryStats (see app/utils/context.py), and statements
+slower than ``settings.slow_query_threshold_ms`` are written to the
+slow-query log with their normalized SQL and bound-parameter shapes. Bound
+values are never logged.
+"""
+import re
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.core.logging_config import slow_query_logger
+from app.utils.context import query_stats_var, request_id_var
+
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_POSTCOMPILE = re.compile(r"\(\s*__\[POSTCOMPILE_\w+\]\s*\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Normalize SQL so repeated statements group together.
+
+    Collapses whitespace, replaces inline literals with ``?`` and collapses
+    expanded ``IN (?, ?, ...)`` lists to ``IN (?...)``.
+
+    Args:
+        statement: SQL as sent to the driver
+
+    Returns:
+        str: Normalized SQL
+    """
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?...)", sql)
+    return _POSTCOMPILE.sub("(?...)", sql)
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> Any:
+    """
+    Describe bound parameters by type only.
+
+    Args:
+        parameters: DBAPI parameters (sequence or mapping; a list of them for executemany)
+        executemany: Whether this was an executemany call
+
+    Returns:
+        Type names in the shape of the parameters, e.g. ``["int", "str"]``
+    """
+    def shape(params: Any) -> Any:
+        if isinstance(params, dict):
+            return {key: type(value).__name__ for key, value in params.items()}
+        if isinstance(params, (list, tuple)):
+            return [type(value).__name__ for value in params]
+        return type(params).__name__
+
+    if executemany and parameters:
+        return {"rows": len(parameters), "row": shape(parameters[0])}
+    return shape(parameters)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()[1]) * 1000
+
+    stats = query_stats_var.get()
+    slow = duration_ms >= settings.slow_query_threshold_ms
+    if stats is None and not slow:
+        return
+
+    normalized = normalize_sql(statement)
+    if stats is not None:
+        stats.record(normalized, duration_ms)
+
+    if slow:
+        slow_query_logger.warning(
+            "Slow query",
+            extra={
+                "trace_id": request_id_var.get(),
+                "duration_ms": round(duration_ms, 2),
+                "statement": normalized,
+                "parameters": parameter_shape(parameters, executemany),
+                "executemany": executemany,
+            }
+        )
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    # so the pooled connection's stack does not grow with every error
+    conn = exception_context.connection
+    started = conn.info.get("query_start_time") if conn is not None else None
+    if started and started[-1][0] is exception_context.execution_context:
+        started.pop()
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """
+    Attach timing hooks to an engine.
+
+    Args:
+        engine: SQLAlchemy engine to instrument
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
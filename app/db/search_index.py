@@ -0,0 +1,128 @@
+"""
+Full-text search index for the admin portal (SQLite FTS5).
+
+One FTS5 table, ``search_index``, holds the searchable text of account
+holders (name, email), accounts (account number) and transactions, hot and
+archived (description). Triggers on the source tables keep it in sync in
+the same database transaction as the write, so no service has to remember
+to update it. The FTS rowid encodes the source row: ``id * 4 + kind``.
+
+The index is created by migration 0009 and, for databases built with
+``Base.metadata.create_all`` (tests, benchmarks), by a metadata event.
+Other databases have no FTS5 table; the search service falls back to LIKE
+queries there.
+"""
+from typing import List
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from app.models.base import Base
+
+
+SEARCH_TABLE = "search_index"
+
+# rowid = source id * KIND_STRIDE + kind
+KIND_STRIDE = 4
+KIND_ARCHIVED_TRANSACTION = 0
+KIND_HOLDER = 1
+KIND_ACCOUNT = 2
+KIND_TRANSACTION = 3
+
+# (source table, kind, {fts column: source column})
+_SOURCES = (
+    ("account_holders", KIND_HOLDER, {"name": "name", "email": "email"}),
+    ("accounts", KIND_ACCOUNT, {"account_number": "account_number"}),
+    ("transactions", KIND_TRANSACTION, {"description": "description"}),
+    ("transactions_archive", KIND_ARCHIVED_TRANSACTION, {"description": "description"}),
+)
+
+
+def _rowid(ref: str, kind: int) -> str:
+    return f"{ref}.id * {KIND_STRIDE} + {kind}"
+
+
+def search_index_ddl() -> List[str]:
+    """
+    Build the statements that create the FTS table and its sync triggers.
+
+    Returns:
+        List[str]: DDL statements, in order
+    """
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "name, email, account_number, description, "
+        "prefix='2 3 4', tokenize='unicode61 remove_diacritics 2')"
+    ]
+    for table, kind, columns in _SOURCES:
+        fts_columns = ", ".join(columns)
+        values = ", ".join(f"new.{source}" for source in columns.values())
+        add = f"INSERT INTO {SEARCH_TABLE}(rowid, {fts_columns}) VALUES ({_rowid('new', kind)}, {values});"
+        remove = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = {_rowid('old', kind)};"
+        watched = ", ".join(columns.values())
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN {add} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {remove} {add} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN {remove} END",
+        ]
+    return statements
+
+
+def backfill_statements() -> List[str]:
+    """
+    Build the statements that index rows already in the source tables.
+
+    Returns:
+        List[str]: INSERT ... SELECT statements, one per source table
+    """
+    statements = []
+    for table, kind, columns in _SOURCES:
+        fts_columns = ", ".join(columns)
+        source_columns = ", ".join(columns.values())
+        statements.append(
+            f"INSERT INTO {SEARCH_TABLE}(rowid, {fts_columns}) "
+            f"SELECT {_rowid(table, kind)}, {source_columns} FROM {table}"
+        )
+    return statements
+
+
+def drop_search_index_ddl() -> List[str]:
+    """
+    Build the statements that drop the triggers and the FTS table.
+
+    Returns:
+        List[str]: DDL statements, in order
+    """
+    statements = [
+        f"DROP TRIGGER IF EXISTS {table}_search_{operation}"
+        for table, _, _ in _SOURCES for operation in ("insert", "update", "delete")
+    ]
+    return statements + [f"DROP TABLE IF EXISTS {SEARCH_TABLE}"]
+
+
+def is_search_table(name: str) -> bool:
+    """
+    Check whether a table is the FTS table or one of its shadow tables.
+
+    Used to keep them out of schema comparisons against the models.
+
+    Args:
+        name: Table name
+
+    Returns:
+        bool: True for ``search_index`` and ``search_index_*``
+    """
+    return name == SEARCH_TABLE or name.startswith(f"{SEARCH_TABLE}_")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection: Connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        for statement in search_index_ddl():
+            connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection: Connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        for statement in drop_search_index_ddl():
+            connection.exec_driver_sql(statement)
@@ -1,27 +1,168 @@
 """
 Database session management.
+
+Writes go to the primary engine. Read-only endpoints use a second engine
+(``settings.database_read_url``, e.g. a replica or a copied SQLite file;
+defaults to a separate pool on the primary database). Commits that wrote
+on behalf of a user are recorded in ``write_tracker`` so that user's
+reads can fall back to the primary until replicas have caught up.
+
+Engines are created on first use (``get_engine()``/``get_read_engine()``,
+or the ``engine``/``read_engine`` module attributes), not at import, and the
+session factories bind to them when the first session is opened.
 """
-from sqlalchemy import create_engine
+import functools
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Callable, Dict, Generator
 from app.config import settings
+from app.db.instrumentation import install_query_instrumentation
+from app.db.sqlite_tuning import install_sqlite_profile, install_query_only
+
+
+def _create_engine(url: str, read_only: bool = False) -> Engine:
+    """Create an engine with the tuning and instrumentation hooks installed."""
+    new_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if "sqlite" in url else {},
+        echo=settings.debug,  # Log SQL queries in debug mode
+    )
+    install_sqlite_profile(new_engine)
+    if read_only:
+        install_query_only(new_engine)
+    install_query_instrumentation(new_engine)
+    return new_engine
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """
+    Get the primary engine, creating it on first use.
+
+    Returns:
+        Engine: Primary (read-write) engine
+    """
+    return _create_engine(settings.database_url)
+
+
+@functools.lru_cache(maxsize=None)
+def get_read_engine() -> Engine:
+    """
+    Get the read engine, creating it on first use.
+
+    Returns:
+        Engine: Read-only engine
+    """
+    return _create_engine(settings.database_read_url or settings.database_url, read_only=True)
 
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=settings.debug,  # Log SQL queries in debug mode
+def dispose_engines() -> None:
+    """Close the pooled connections of every engine created so far."""
+    for factory in (get_engine, get_read_engine):
+        if factory.cache_info().currsize:
+            factory().dispose()
+
+
+def __getattr__(name: str) -> Engine:
+    # Module attributes ``engine``/``read_engine`` create the engine on access
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds its engine when the first session is opened."""
+
+    def __init__(self, engine_factory: Callable[[], Engine], **kw):
+        super().__init__(**kw)
+        self._engine_factory = engine_factory
+
+    def __call__(self, **local_kw) -> Session:
+        if "bind" not in local_kw and self.kw.get("bind") is None:
+            self.configure(bind=self._engine_factory())
+        return super().__call__(**local_kw)
+
+
+# Create session factories
+SessionLocal = _LazySessionmaker(
+    get_engine,
+    autocommit=False,
+    autoflush=False
 )
 
-# Create session factory
-SessionLocal = sessionmaker(
+ReadSessionLocal = _LazySessionmaker(
+    get_read_engine,
     autocommit=False,
-    autoflush=False,
-    bind=engine
+    autoflush=False
 )
 
 
+class WriteTracker:
+    """
+    Remembers which account holders wrote recently (read-your-writes guard).
+
+    State is per process; with several workers, route a user's requests to
+    the same worker or keep the window above the worst-case replica lag.
+    """
+
+    def __init__(self):
+        self._last_write: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: int) -> None:
+        """
+        Record a committed write for a user.
+
+        Args:
+            user_id: Account holder ID
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_id] = now
+            if len(self._last_write) > 10_000:
+                horizon = now - settings.read_your_writes_window_seconds
+                self._last_write = {uid: t for uid, t in self._last_write.items() if t >= horizon}
+
+    def recently_wrote(self, user_id: int) -> bool:
+        """
+        Check whether a user wrote within the read-your-writes window.
+
+        Args:
+            user_id: Account holder ID
+
+        Returns:
+            bool: True if the user's reads should go to the primary
+        """
+        last_write = self._last_write.get(user_id)
+        return last_write is not None and time.monotonic() - last_write < settings.read_your_writes_window_seconds
+
+
+# Global write tracker instance
+write_tracker = WriteTracker()
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_flush_writes(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_statement_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_user_write(session):
+    if session.info.pop("wrote", False) and session.info.get("user_id") is not None:
+        write_tracker.mark(session.info["user_id"])
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function to get database session.
@@ -39,3 +180,21 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency function to get a read-only database session.
+
+    Reads may lag behind the primary. For per-user data use
+    ``app.dependencies.get_user_read_db``, which falls back to the primary
+    after the user's own writes.
+
+    Yields:
+        Session: Read-only database session
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,157 @@
+"""
+SQLite production profile: connection pragmas and busy-retry handling.
+
+Pragmas are applied on every new DBAPI connection through the engine
+"connect" event. WAL lets readers proceed while a writer holds the lock;
+busy_timeout makes SQLite wait for the lock instead of failing at once.
+Lock upgrades inside a deferred transaction can still fail with
+SQLITE_BUSY, so write paths are wrapped in ``retry_on_busy``.
+"""
+import functools
+import random
+import time
+from typing import Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.core.logging_config import logger
+
+
+F = TypeVar("F", bound=Callable)
+
+# Pragma values are interpolated into SQL, so only allow known keywords
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORE = {"DEFAULT", "FILE", "MEMORY"}
+
+_BUSY_MESSAGES = ("database is locked", "database is busy", "database table is locked")
+
+
+def _keyword(value: str, allowed: set, name: str) -> str:
+    keyword = value.upper()
+    if keyword not in allowed:
+        raise ValueError(f"Invalid {name} '{value}', expected one of {sorted(allowed)}")
+    return keyword
+
+
+def sqlite_pragmas() -> dict:
+    """
+    Build the pragma set from settings.
+
+    Returns:
+        dict: Pragma name to value, in the order they are applied
+    """
+    return {
+        "busy_timeout": int(settings.sqlite_busy_timeout_ms),
+        "journal_mode": _keyword(settings.sqlite_journal_mode, _JOURNAL_MODES, "sqlite_journal_mode"),
+        "synchronous": _keyword(settings.sqlite_synchronous, _SYNCHRONOUS, "sqlite_synchronous"),
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -int(settings.sqlite_cache_size_kib),
+        "mmap_size": int(settings.sqlite_mmap_size),
+        "temp_store": _keyword(settings.sqlite_temp_store, _TEMP_STORE, "sqlite_temp_store"),
+    }
+
+
+def _apply_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_sqlite_profile(engine: Engine) -> None:
+    """
+    Apply the SQLite pragma profile to every connection of an engine.
+
+    No-op for non-SQLite engines or when ``settings.sqlite_tuning_enabled``
+    is off.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    if engine.dialect.name != "sqlite" or not settings.sqlite_tuning_enabled:
+        return
+    if event.contains(engine, "connect", _apply_pragmas):
+        return
+    event.listen(engine, "connect", _apply_pragmas)
+
+
+def _set_query_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def install_query_only(engine: Engine) -> None:
+    """
+    Make every connection of a SQLite engine reject writes.
+
+    Used for the read engine so a misrouted write fails loudly instead of
+    silently landing outside the primary. No-op for other databases.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    if event.contains(engine, "connect", _set_query_only):
+        return
+    event.listen(engine, "connect", _set_query_only)
+
+
+def is_busy_error(exc: OperationalError) -> bool:
+    """
+    Check whether an OperationalError is SQLITE_BUSY/SQLITE_LOCKED.
+
+    Args:
+        exc: Error raised by SQLAlchemy
+
+    Returns:
+        bool: True if retrying may succeed
+    """
+    message = str(exc.orig).lower()
+    return any(busy in message for busy in _BUSY_MESSAGES)
+
+
+def retry_on_busy(func: F) -> F:
+    """
+    Retry a unit of work when the database is busy.
+
+    The wrapped function must take the session as its first argument and
+    be safe to re-run from the start after a rollback (i.e. it commits at
+    most once, at the end). Retries are bounded by ``settings.db_busy_retries``
+    and back off exponentially with full jitter.
+
+    Args:
+        func: Service function ``func(db, ...)``
+
+    Returns:
+        Wrapped function
+    """
+    @functools.wraps(func)
+    def wrapper(db, *args, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                return func(db, *args, **kwargs)
+            except OperationalError as e:
+                if not is_busy_error(e) or attempt >= settings.db_busy_retries:
+                    raise
+                db.rollback()
+                ceiling_ms = min(settings.db_busy_retry_max_ms, settings.db_busy_retry_base_ms * 2 ** attempt)
+                delay_ms = random.uniform(0, ceiling_ms)
+                attempt += 1
+                logger.warning(
+                    f"Database busy in {func.__name__}, retrying",
+                    extra={"attempt": attempt, "delay_ms": round(delay_ms, 2)}
+                )
+                time.sleep(delay_ms / 1000)
+
+    return wrapper
@@ -1,13 +1,16 @@
 """
 FastAPI dependencies for authentication and database sessions.
 """
-from fastapi import Depends, HTTPException, status
+from datetime import datetime
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import JWTError
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, write_tracker
 from app.models.account_holder import AccountHolder
 from app.core.security import decode_token
+from app.services.data_version_service import DataVersionService
+from app.utils.etag import canonical_query, etag_matches, make_etag
 
 
 # HTTP Bearer token security
@@ -54,4 +57,70 @@ async def get_current_user(
     if user is None or not user.is_active:
         raise credentials_exception
 
+    # Lets commits on this session mark the user for read-your-writes routing
+    db.info["user_id"] = user.id
+
     return user
+
+
+async def get_user_read_db(
+    current_user: AccountHolder = Depends(get_current_user),
+    read_db: Session = Depends(get_read_db),
+    db: Session = Depends(get_db)
+) -> Session:
+    """
+    Dependency to get a read session for the current user's data.
+
+    Returns the read-only session unless the user wrote within
+    ``settings.read_your_writes_window_seconds``, in which case the primary
+    session is returned so the user sees their own writes.
+
+    Args:
+        current_user: Current authenticated user
+        read_db: Read-only database session
+        db: Primary database session
+
+    Returns:
+        Session: Session to read from
+    """
+    if write_tracker.recently_wrote(current_user.id):
+        return db
+    return read_db
+
+
+class ConditionalGet:
+    """
+    Dependency answering ``If-None-Match`` from the account holder's data version.
+
+    The version is read from the same session the endpoint reads its data
+    from, before the data, so an ETag never labels data older than itself.
+    A matching request is answered with 304 before the endpoint runs; other
+    responses carry the ETag.
+    """
+
+    def __init__(self, vary_by_day: bool = False):
+        """
+        Args:
+            vary_by_day: Also change the ETag at UTC midnight, for
+                representations that depend on the current date (rolling windows)
+        """
+        self.vary_by_day = vary_by_day
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        current_user: AccountHolder = Depends(get_current_user),
+        db: Session = Depends(get_user_read_db)
+    ) -> None:
+        version = DataVersionService.get(db, current_user.id)
+        etag = make_etag(
+            version, current_user.id, request.url.path, canonical_query(request.query_params.multi_items()),
+            datetime.utcnow().date().isoformat() if self.vary_by_day else ""
+        )
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
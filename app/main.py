@@ -1,8 +1,18 @@
 """
 Main FastAPI application with middleware and security.
+
+The application is built by ``create_app()``. Importing this module has no
+side effects: settings, logging, the encryption keyring and the database
+engines are initialized on first use, and the lifespan initializes them at
+startup and releases them at shutdown. ``app.main:app`` still works (the
+instance is created on first access); servers should prefer
+``uvicorn --factory app.main:create_app``.
 """
+import os
 import uuid
 import time
+from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,42 +21,51 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.concurrency import run_blocking
+from app.core.lazy import resolve
 from app.core.logging_config import logger
 from app.core.exceptions import BankAPIException
-from app.utils.context import set_request_id, get_request_id
-from app.api.v1.endpoints import auth, accounts, transactions, cards, statements, admin
-
-
-# Create FastAPI app
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.app_version,
-    debug=settings.debug,
-    docs_url="/docs" if settings.debug else None,
-    redoc_url="/redoc" if settings.debug else None,
-)
-
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins_list,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-# Request logging middleware
-@app.middleware("http")
+from app.core.profiling import profiler
+from app.db.session import dispose_engines, get_engine, get_read_engine
+from app.services.outbox_service import outbox_dispatcher
+from app.utils.context import set_request_id, get_request_id, start_query_stats
+from app.utils.encryption import encryption_service
+from app.api.v1.endpoints import auth, accounts, transactions, cards, statements, analytics, admin
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize process resources on startup and release them on shutdown."""
+    started = time.perf_counter()
+    # Build the lazy singletons now so bad configuration fails at boot, not on the first request
+    resolve(encryption_service)
+    get_engine()
+    get_read_engine()
+
+    if settings.outbox_dispatcher_enabled:
+        outbox_dispatcher.start()
+    logger.info(
+        "Worker started",
+        extra={"pid": os.getpid(), "environment": settings.environment,
+               "startup_ms": round((time.perf_counter() - started) * 1000, 2)}
+    )
+    yield
+
+    stopping = time.perf_counter()
+    await outbox_dispatcher.stop()
+    dispose_engines()
+    logger.info(
+        "Worker stopped",
+        extra={"pid": os.getpid(), "shutdown_ms": round((time.perf_counter() - stopping) * 1000, 2)}
+    )
+
+
 async def log_requests(request: Request, call_next):
     """Log all requests with trace ID."""
     request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
     set_request_id(request_id)
+    query_stats = start_query_stats()
 
     start_time = time.time()
 
@@ -60,16 +79,38 @@ async def log_requests(request: Request, call_next):
         }
     )
 
-    response = await call_next(request)
+    # Profiling is off unless an admin enables it; keep the disabled path to one check
+    sampler = None
+    if profiler.enabled and profiler.should_profile(request.headers):
+        sampler = profiler.start()
+
+    try:
+        response = await call_next(request)
+    except BaseException:
+        if sampler is not None:
+            profiler.stop(sampler)  # frees the profiler for the next request
+        raise
 
     duration = time.time() - start_time
 
+    if sampler is not None:
+        samples = profiler.stop(sampler)
+        profile_id, profile_path = await run_blocking(
+            profiler.save, samples, f"{request.method} {request.url.path}", request_id
+        )
+        response.headers["X-Profile-ID"] = profile_id
+        logger.info(
+            "Request profiled",
+            extra={"trace_id": request_id, "profile": str(profile_path)}
+        )
+
     logger.info(
         "Request completed",
         extra={
             "trace_id": request_id,
             "status_code": response.status_code,
-            "duration_ms": round(duration * 1000, 2)
+            "duration_ms": round(duration * 1000, 2),
+            **query_stats.as_log_fields()
         }
     )
 
@@ -77,8 +118,6 @@ async def log_requests(request: Request, call_next):
     return response
 
 
-# Security headers middleware
-@app.middleware("http")
 async def add_security_headers(request: Request, call_next):
     """Add security headers to all responses."""
     response = await call_next(request)
@@ -89,8 +128,6 @@ async def add_security_headers(request: Request, call_next):
     return response
 
 
-# Exception handlers
-@app.exception_handler(BankAPIException)
 async def bank_api_exception_handler(request: Request, exc: BankAPIException):
     """Handle custom bank API exceptions."""
     logger.error(
@@ -106,11 +143,11 @@ async def bank_api_exception_handler(request: Request, exc: BankAPIException):
         content={
             "error": exc.message,
             "trace_id": get_request_id(),
-        }
+        },
+        headers=exc.headers
     )
 
 
-@app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
     logger.exception(
@@ -129,17 +166,6 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 
-# Include routers
-app.include_router(auth.router, prefix="/api/v1")
-app.include_router(accounts.router, prefix="/api/v1")
-app.include_router(transactions.router, prefix="/api/v1")
-app.include_router(cards.router, prefix="/api/v1")
-app.include_router(statements.router, prefix="/api/v1")
-app.include_router(admin.router)  # Admin dashboard (no /api/v1 prefix)
-
-
-# Health check endpoint
-@app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint."""
     return {
@@ -149,8 +175,6 @@ async def health_check():
     }
 
 
-# Root endpoint
-@app.get("/", tags=["Root"])
 async def root():
     """Root endpoint."""
     return {
@@ -158,3 +182,73 @@ async def root():
         "version": settings.app_version,
         "docs": "/docs" if settings.debug else "Documentation disabled in production"
     }
+
+
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Returns:
+        FastAPI: Configured application
+    """
+    application = FastAPI(
+        title=settings.app_name,
+        version=settings.app_version,
+        debug=settings.debug,
+        docs_url="/docs" if settings.debug else None,
+        redoc_url="/redoc" if settings.debug else None,
+        lifespan=lifespan,
+    )
+
+    # Rate limiter
+    limiter = Limiter(key_func=get_remote_address)
+    application.state.limiter = limiter
+    application.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    # Response compression; innermost so it sees each route's complete body
+    # rather than the re-streamed body BaseHTTPMiddleware hands outward
+    application.add_middleware(CompressionMiddleware)
+
+    # CORS middleware
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins_list,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Middleware added later wraps the earlier ones
+    application.middleware("http")(log_requests)
+    application.middleware("http")(add_security_headers)
+
+    # Exception handlers
+    application.add_exception_handler(BankAPIException, bank_api_exception_handler)
+    application.add_exception_handler(Exception, general_exception_handler)
+
+    # Include routers
+    application.include_router(auth.router, prefix="/api/v1")
+    application.include_router(accounts.router, prefix="/api/v1")
+    application.include_router(transactions.router, prefix="/api/v1")
+    application.include_router(cards.router, prefix="/api/v1")
+    application.include_router(statements.router, prefix="/api/v1")
+    application.include_router(analytics.router, prefix="/api/v1")
+    application.include_router(admin.router)  # Admin dashboard (no /api/v1 prefix)
+
+    application.add_api_route("/health", health_check, methods=["GET"], tags=["Health"])
+    application.add_api_route("/", root, methods=["GET"], tags=["Root"])
+
+    return application
+
+
+_app: Optional[FastAPI] = None
+
+
+def __getattr__(name: str) -> FastAPI:
+    # ``app.main:app`` builds the application on first access
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
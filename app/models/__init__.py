@@ -5,7 +5,16 @@ from app.models.base import Base, BaseModel
 from app.models.account_holder import AccountHolder
 from app.models.account import Account
 from app.models.transaction import Transaction
+from app.models.archived_transaction import ArchivedTransaction
 from app.models.card import Card
+from app.models.journal_entry import JournalEntry
+from app.models.posting import Posting
+from app.models.outbox_event import OutboxEvent
+from app.models.ach_transfer import AchTransfer
+from app.models.monthly_statement import MonthlyStatement
+from app.models.reconciled_balance import ReconciledBalance
+from app.models.reconciliation_run import ReconciliationRun
+from app.models.interest_accrual import InterestAccrual
 
 __all__ = [
     "Base",
@@ -13,5 +22,14 @@ __all__ = [
     "AccountHolder",
     "Account",
     "Transaction",
+    "ArchivedTransaction",
     "Card",
+    "JournalEntry",
+    "Posting",
+    "OutboxEvent",
+    "AchTransfer",
+    "MonthlyStatement",
+    "ReconciledBalance",
+    "ReconciliationRun",
+    "InterestAccrual",
 ]
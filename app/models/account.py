@@ -2,7 +2,7 @@
 Account model for bank accounts (checking/savings).
 """
 from decimal import Decimal
-from sqlalchemy import Column, String, Integer, ForeignKey, Boolean, CheckConstraint, Numeric
+from sqlalchemy import Column, String, Integer, ForeignKey, Boolean, CheckConstraint, Numeric, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -17,8 +17,7 @@ class Account(BaseModel):
     account_holder_id = Column(
         Integer,
         ForeignKey("account_holders.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Account identifiers
@@ -47,3 +46,8 @@ class Account(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Account(id={self.id}, account_number='{self.account_number}', type='{self.account_type}', balance={self.balance})>"
+
+
+# Per-user account lookups and admin "recent accounts" (see migration 0002)
+Index("ix_accounts_account_holder_id_id", Account.account_holder_id, Account.id)
+Index("ix_accounts_created_at", Account.created_at)
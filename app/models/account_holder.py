@@ -1,7 +1,7 @@
 """
 AccountHolder model - serves as users table with authentication and customer data.
 """
-from sqlalchemy import Column, String, Date, LargeBinary, Boolean
+from sqlalchemy import Column, String, Date, LargeBinary, Boolean, Integer
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -31,6 +31,9 @@ class AccountHolder(BaseModel):
     # Account status
     is_active = Column(Boolean, default=True, nullable=False)
 
+    # Bumped by every write to the holder's accounts, transactions or cards (drives ETags)
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
+
     # Relationships
     accounts = relationship("Account", back_populates="account_holder", cascade="all, delete-orphan")
 
@@ -0,0 +1,52 @@
+"""
+ACH transfer model for outbound external transfers.
+"""
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Numeric, Index, CheckConstraint
+from app.models.base import BaseModel
+
+
+class AchTransfer(BaseModel):
+    """
+    External transfer awaiting or going through ACH settlement.
+
+    Lifecycle: 'pending' (queued by create_transfer) -> 'batched' (claimed
+    by a settlement cycle and written to a NACHA file, ``batch_id`` names
+    the file) -> 'settled' -> optionally 'returned' (funds credited back).
+    """
+    __tablename__ = "ach_transfers"
+
+    # Originating transaction and account
+    transaction_id = Column(String(36), unique=True, nullable=False)
+    account_id = Column(
+        Integer,
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Destination
+    to_routing_number = Column(String(9), nullable=False)
+    to_account_number = Column(String(20), nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)
+
+    # Settlement state
+    status = Column(String(10), nullable=False, default="pending")
+    batch_id = Column(String(36), nullable=True)
+    trace_number = Column(String(15), nullable=True)
+    settled_at = Column(DateTime, nullable=True)
+    return_code = Column(String(3), nullable=True)
+    returned_at = Column(DateTime, nullable=True)
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint("status IN ('pending', 'batched', 'settled', 'returned')", name="check_ach_status"),
+        CheckConstraint("amount > 0", name="check_ach_positive_amount"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AchTransfer(id={self.id}, status='{self.status}', to='{self.to_routing_number}', amount={self.amount})>"
+
+
+# Cycle claim, per-file keyset scan grouped by routing number, and return lookups (see migration 0006)
+Index("ix_ach_transfers_status", AchTransfer.status)
+Index("ix_ach_transfers_batch_id_routing", AchTransfer.batch_id, AchTransfer.to_routing_number, AchTransfer.id)
+Index("ix_ach_transfers_batch_id_trace", AchTransfer.batch_id, AchTransfer.trace_number)
@@ -0,0 +1,46 @@
+"""
+Archived transaction model (cold tier of the transactions table).
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Numeric, Index
+from app.models.base import Base
+
+
+class ArchivedTransaction(Base):
+    """
+    Transaction moved out of the hot ``transactions`` table by the archive job.
+
+    Rows keep their original ``id`` and timestamps so API responses and
+    statements look the same whichever tier they come from.
+    """
+    __tablename__ = "transactions_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    transaction_id = Column(String(36), unique=True, nullable=False)
+    account_id = Column(
+        Integer,
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    transaction_type = Column(String(20), nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)
+    peer_routing_number = Column(String(9), nullable=True)
+    peer_account_number = Column(String(20), nullable=True)
+    description = Column(String(500), nullable=True)
+    journal_id = Column(String(36), nullable=True)
+    direction = Column(String(6), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ArchivedTransaction(id={self.id}, transaction_id='{self.transaction_id}', type='{self.transaction_type}', amount={self.amount})>"
+
+
+# Same access paths as the hot table (see migration 0003)
+Index(
+    "ix_transactions_archive_account_id_created_at",
+    ArchivedTransaction.account_id, ArchivedTransaction.created_at.desc(), ArchivedTransaction.id
+)
+Index("ix_transactions_archive_created_at", ArchivedTransaction.created_at)
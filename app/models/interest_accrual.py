@@ -0,0 +1,39 @@
+"""
+Interest accrual model (daily interest on savings accounts).
+"""
+from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric, String, UniqueConstraint
+from app.models.base import BaseModel
+
+
+class InterestAccrual(BaseModel):
+    """
+    Interest accrued on one savings account for one business date.
+
+    Written by the accrual job together with the interest transaction, so
+    an account is accrued at most once per date. ``amount`` is the interest
+    rounded to cents; when it is zero nothing is posted and ``journal_id``
+    is empty. Otherwise ``journal_id`` is also the id of the journal entry
+    and of the 'deposit' transaction crediting the interest.
+    """
+    __tablename__ = "interest_accruals"
+
+    business_date = Column(Date, nullable=False)
+    account_id = Column(
+        Integer,
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Balance the interest was computed on, annual rate and credited interest
+    balance = Column(Numeric(15, 2), nullable=False)
+    rate = Column(Numeric(9, 6), nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)
+    journal_id = Column(String(36), nullable=True)
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("business_date", "account_id", name="uq_interest_accruals_date_account"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<InterestAccrual(id={self.id}, business_date={self.business_date}, account_id={self.account_id}, amount={self.amount})>"
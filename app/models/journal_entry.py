@@ -0,0 +1,31 @@
+"""
+Journal entry model for the double-entry ledger.
+"""
+from sqlalchemy import Column, String
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+
+
+class JournalEntry(BaseModel):
+    """
+    One balanced business event (deposit, withdrawal, transfer, ...).
+
+    The entry's postings always sum to zero. Customer-facing Transaction
+    rows created for the event carry the same ``journal_id``.
+    """
+    __tablename__ = "journal_entries"
+
+    # Shared identifier (UUID) linking the entry to its transactions
+    journal_id = Column(String(36), unique=True, nullable=False, index=True)
+
+    # Event type, e.g. 'deposit', 'withdrawal', 'transfer'
+    entry_type = Column(String(20), nullable=False)
+
+    # Description
+    description = Column(String(500), nullable=True)
+
+    # Relationships
+    postings = relationship("Posting", back_populates="journal_entry")
+
+    def __repr__(self) -> str:
+        return f"<JournalEntry(id={self.id}, journal_id='{self.journal_id}', type='{self.entry_type}')>"
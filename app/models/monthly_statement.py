@@ -0,0 +1,35 @@
+"""
+Monthly statement model (materialized closed statement periods).
+"""
+from sqlalchemy import Column, String, Integer, ForeignKey, LargeBinary, UniqueConstraint
+from app.models.base import BaseModel
+
+
+class MonthlyStatement(BaseModel):
+    """
+    Statement of one account holder for one closed calendar month.
+
+    Closed periods never change, so the statement is rendered once by the
+    materialization job and stored as gzip-compressed JSON (the exact
+    ``GET /api/v1/statements?month=YYYY-MM`` response body). Rows are
+    written once and never updated.
+    """
+    __tablename__ = "monthly_statements"
+
+    account_holder_id = Column(
+        Integer,
+        ForeignKey("account_holders.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    month = Column(String(7), nullable=False)  # 'YYYY-MM'
+
+    transaction_count = Column(Integer, nullable=False)
+    content = Column(LargeBinary, nullable=False)  # gzip-compressed JSON Statement
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint("account_holder_id", "month", name="uq_monthly_statements_holder_month"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<MonthlyStatement(id={self.id}, account_holder_id={self.account_holder_id}, month='{self.month}')>"
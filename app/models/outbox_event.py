@@ -0,0 +1,42 @@
+"""
+Outbox event model for post-commit side effects.
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index, CheckConstraint
+from app.models.base import BaseModel
+
+
+class OutboxEvent(BaseModel):
+    """
+    Side effect recorded in the same database transaction as the change
+    that caused it, delivered later by the outbox dispatcher.
+
+    Delivery is at-least-once: handlers may see an event more than once and
+    must be idempotent (``id`` is stable across retries).
+    """
+    __tablename__ = "outbox_events"
+
+    # Event routing and body (JSON)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False)
+
+    # Delivery state
+    status = Column(String(10), nullable=False, default="pending")  # 'pending', 'delivered', 'dead'
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String(36), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    delivered_at = Column(DateTime, nullable=True)
+    last_error = Column(String(500), nullable=True)
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint("status IN ('pending', 'delivered', 'dead')", name="check_outbox_status"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent(id={self.id}, type='{self.event_type}', status='{self.status}', attempts={self.attempts})>"
+
+
+# Dispatcher claim scan (see migration 0005)
+Index("ix_outbox_events_status_available_at", OutboxEvent.status, OutboxEvent.available_at, OutboxEvent.id)
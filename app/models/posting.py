@@ -0,0 +1,48 @@
+"""
+Posting model for the double-entry ledger.
+"""
+from sqlalchemy import Column, String, Integer, ForeignKey, Numeric, Index
+from sqlalchemy.orm import relationship
+from app.models.base import BaseModel
+
+
+class Posting(BaseModel):
+    """
+    Signed line of a journal entry against one ledger account.
+
+    Postings are append-only and signed: credits positive, debits
+    negative. Customer accounts are identified by ``account_id`` (ledger
+    code ``customer_deposits``), and a customer account's balance is the
+    sum of its postings. Bank-side ledger accounts (cash, transfer
+    clearing, ...) have no ``account_id``.
+    """
+    __tablename__ = "postings"
+
+    # Owning journal entry
+    journal_entry_id = Column(
+        Integer,
+        ForeignKey("journal_entries.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    # Ledger account
+    ledger_code = Column(String(32), nullable=False)
+    account_id = Column(
+        Integer,
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        nullable=True
+    )
+
+    # Signed amount: credit > 0, debit < 0
+    amount = Column(Numeric(15, 2), nullable=False)
+
+    # Relationships
+    journal_entry = relationship("JournalEntry", back_populates="postings")
+
+    def __repr__(self) -> str:
+        return f"<Posting(id={self.id}, ledger_code='{self.ledger_code}', account_id={self.account_id}, amount={self.amount})>"
+
+
+# Balance projection rebuilds aggregate per account (see migration 0004)
+Index("ix_postings_account_id_id", Posting.account_id, Posting.id)
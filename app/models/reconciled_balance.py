@@ -0,0 +1,30 @@
+"""
+Reconciled balance model (reconciliation job state per account).
+"""
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric
+from app.models.base import Base
+
+
+class ReconciledBalance(Base):
+    """
+    Signed sum of an account's transactions up to a transaction id.
+
+    Written by the reconciliation job so the next run only has to add the
+    transactions recorded after ``through_transaction_id``. Accounts
+    without reconciled transactions have no row.
+    """
+    __tablename__ = "reconciled_balances"
+
+    account_id = Column(
+        Integer,
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        primary_key=True,
+        autoincrement=False
+    )
+    transaction_total = Column(Numeric(15, 2), nullable=False)
+    through_transaction_id = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ReconciledBalance(account_id={self.account_id}, transaction_total={self.transaction_total}, through={self.through_transaction_id})>"
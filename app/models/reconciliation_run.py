@@ -0,0 +1,28 @@
+"""
+Reconciliation run model (balance reconciliation job history and watermark).
+"""
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from app.models.base import BaseModel
+
+
+class ReconciliationRun(BaseModel):
+    """
+    One run of the reconciliation job.
+
+    A run covers transactions with ids in (``since_transaction_id``,
+    ``watermark``]; the watermark of the newest finished run is where the
+    next incremental run starts.
+    """
+    __tablename__ = "reconciliation_runs"
+
+    full = Column(Boolean, nullable=False, default=False)
+    since_transaction_id = Column(Integer, nullable=False)
+    watermark = Column(Integer, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    accounts_checked = Column(Integer, nullable=True)
+    discrepancies = Column(Integer, nullable=True)
+    report_path = Column(String(500), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ReconciliationRun(id={self.id}, since={self.since_transaction_id}, watermark={self.watermark})>"
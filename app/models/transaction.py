@@ -2,7 +2,7 @@
 Transaction model for financial transactions.
 """
 from decimal import Decimal
-from sqlalchemy import Column, String, Integer, ForeignKey, CheckConstraint, Numeric
+from sqlalchemy import Column, String, Integer, ForeignKey, CheckConstraint, Numeric, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -20,8 +20,7 @@ class Transaction(BaseModel):
     account_id = Column(
         Integer,
         ForeignKey("accounts.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Transaction details
@@ -35,10 +34,17 @@ class Transaction(BaseModel):
     # Description
     description = Column(String(500), nullable=True)
 
-    # Constraints
+    # Ledger link: journal entry shared by all legs of the event, and the
+    # effect on this account ('credit' adds to the balance, 'debit' subtracts)
+    journal_id = Column(String(36), nullable=True, index=True)
+    direction = Column(String(6), nullable=True)
+
+    # Constraints. Ids are never reused on SQLite (AUTOINCREMENT): archived
+    # rows keep their id, and the archive would reject a reused one.
     __table_args__ = (
         CheckConstraint("transaction_type IN ('deposit', 'withdrawal', 'transfer')", name="check_transaction_type"),
         CheckConstraint("amount > 0", name="check_positive_amount"),
+        {"sqlite_autoincrement": True},
     )
 
     # Relationships
@@ -46,3 +52,11 @@ class Transaction(BaseModel):
 
     def __repr__(self) -> str:
         return f"<Transaction(id={self.id}, transaction_id='{self.transaction_id}', type='{self.transaction_type}', amount={self.amount})>"
+
+
+# Per-account listing and statement range scans (see migration 0002)
+Index(
+    "ix_transactions_account_id_created_at",
+    Transaction.account_id, Transaction.created_at.desc(), Transaction.id
+)
+Index("ix_transactions_created_at", Transaction.created_at)
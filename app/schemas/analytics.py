@@ -0,0 +1,45 @@
+"""
+Spending analytics schemas.
+"""
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel
+from typing import List
+
+
+class FlowTotals(BaseModel):
+    """Money in and out over a set of transactions."""
+    inflow: Decimal
+    outflow: Decimal
+    net: Decimal
+    inflow_count: int
+    outflow_count: int
+    average_inflow: Decimal
+    average_outflow: Decimal
+
+
+class AnalyticsBucket(FlowTotals):
+    """Totals of one transaction type in one period."""
+    period: str  # Bucket start: YYYY-MM-DD (day, week starting Monday) or YYYY-MM (month)
+    transaction_type: str
+
+
+class TypeTotals(FlowTotals):
+    """Totals of one transaction type over the whole range."""
+    transaction_type: str
+
+
+class AccountTotals(FlowTotals):
+    """Totals of one account over the whole range."""
+    account_id: int
+
+
+class Analytics(BaseModel):
+    """Bucketed inflow/outflow analytics for a user's accounts."""
+    bucket: str
+    period_start: datetime
+    period_end: datetime
+    buckets: List[AnalyticsBucket]
+    by_type: List[TypeTotals]
+    by_account: List[AccountTotals]
+    totals: FlowTotals
@@ -0,0 +1,29 @@
+"""
+Request profiling schemas.
+"""
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class ProfilingConfig(BaseModel):
+    """Profiler configuration (admin)."""
+    enabled: bool
+    sample_rate: float = Field(0.0, ge=0.0, le=1.0)
+    allow_header: bool = True
+
+
+class ProfilingStatus(ProfilingConfig):
+    """Profiler status."""
+    header: str
+    header_token: str  # value the debug header must carry
+    interval_ms: float
+
+
+class ProfileInfo(BaseModel):
+    """Stored profile metadata."""
+    profile_id: str
+    trace_id: Optional[str] = None  # X-Request-ID of the profiled request
+    label: Optional[str] = None  # "METHOD /path"
+    size_bytes: int
+    created_at: datetime
@@ -0,0 +1,31 @@
+"""
+Admin search schemas.
+"""
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel
+
+
+SearchKind = Literal["holder", "account", "transaction"]
+
+
+class SearchHit(BaseModel):
+    """One matching holder, account or transaction."""
+    kind: SearchKind
+    id: int
+    holder_id: int
+    title: str
+    detail: Optional[str] = None
+    created_at: datetime
+    score: Optional[float] = None  # bm25, lower is better; None when not ranked
+
+
+class SearchResults(BaseModel):
+    """One page of admin search results."""
+    query: str
+    kind: Optional[SearchKind] = None
+    page: int
+    page_size: int
+    ranked: bool
+    has_more: bool
+    results: List[SearchHit]
@@ -12,6 +12,7 @@ class StatementTransaction(BaseModel):
     transaction_id: str
     transaction_type: str
     amount: Decimal
+    direction: Optional[str] = None
     description: Optional[str]
     created_at: datetime
 
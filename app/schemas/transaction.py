@@ -40,6 +40,8 @@ class TransactionResponse(BaseModel):
     peer_routing_number: Optional[str]
     peer_account_number: Optional[str]
     description: Optional[str]
+    journal_id: Optional[str] = None
+    direction: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
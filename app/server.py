@@ -0,0 +1,234 @@
+"""
+Production server: gunicorn managing uvicorn workers.
+
+``python -m app`` starts a gunicorn master that imports and builds the
+application once (``preload_app``) and forks the workers from it, so the
+import and route-building cost is paid once and shared copy-on-write.
+Per-process resources (log files, keyring, database engines) are lazy and
+are created in each worker by the app lifespan, after the fork. The master
+never touches the application logger, so no log file handle is inherited
+by the workers; it reports through gunicorn's own logger (stderr).
+
+- Worker count defaults to the CPUs available to the process (affinity and
+  cgroup quota aware), or to one worker while velocity windows are kept per
+  process (``VELOCITY_BACKEND=memory``).
+- Workers run uvloop and httptools when installed (``uvicorn[standard]``).
+- SIGTERM drains in-flight requests for ``graceful_timeout_seconds``.
+- Workers are recycled after ``max_requests`` (plus jitter) requests to cap
+  memory growth.
+
+``--reload`` runs a single uvicorn process instead, for development.
+"""
+import argparse
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from app.config import settings
+from app.core.logging_config import logger
+
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus(cpu_max: Path = CGROUP_CPU_MAX) -> int:
+    """
+    Count the CPUs this process may use.
+
+    Takes the smaller of the scheduler affinity mask and the cgroup v2 CPU
+    quota, so a container limited to 2 CPUs on a 64-core host gets 2.
+
+    Args:
+        cpu_max: cgroup ``cpu.max`` file ("<quota> <period>" or "max <period>")
+
+    Returns:
+        int: Usable CPUs (at least 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+
+    try:
+        quota, period = cpu_max.read_text().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def tls_files(keyfile: Optional[str] = None, certfile: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve the TLS key and certificate.
+
+    Explicit paths win; otherwise ``settings.ssl_key_path``/``ssl_cert_path``
+    are used when both files exist, and the server runs plain HTTP if not.
+
+    Args:
+        keyfile: TLS private key from the command line
+        certfile: TLS certificate from the command line
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (keyfile, certfile), or (None, None)
+    """
+    if keyfile or certfile:
+        return keyfile, certfile
+    if Path(settings.ssl_key_path).is_file() and Path(settings.ssl_cert_path).is_file():
+        return settings.ssl_key_path, settings.ssl_cert_path
+    return None, None
+
+
+class BankUvicornWorker(UvicornWorker):
+    """Uvicorn worker with the fastest available event loop and HTTP parser."""
+
+    # "auto" selects uvloop/httptools when installed and falls back to asyncio/h11.
+    # Lifespan "on" makes a worker whose startup fails exit instead of serving.
+    CONFIG_KWARGS = {"loop": "auto", "http": "auto", "lifespan": "on"}
+
+
+def _when_ready(server) -> None:
+    # Runs in the master: the app logger would open its log file before the fork
+    cfg = server.cfg
+    server.log.info(
+        "Starting server: bind=%s workers=%s keepalive=%s backlog=%s max_requests=%s preload_ms=%s",
+        ",".join(cfg.bind), cfg.workers, cfg.keepalive, cfg.backlog, cfg.max_requests,
+        getattr(server.app, "load_ms", None)
+    )
+
+
+def _post_fork(server, worker) -> None:
+    worker.forked_at = time.monotonic()
+
+
+def _worker_exit(server, worker) -> None:
+    logger.info(
+        "Worker exited",
+        extra={"pid": worker.pid, "uptime_s": round(time.monotonic() - getattr(worker, "forked_at", 0.0), 1)}
+    )
+
+
+def server_options(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    ssl_keyfile: Optional[str] = None,
+    ssl_certfile: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build the gunicorn configuration from settings.
+
+    Args:
+        host: Bind address (default: ``settings.host``)
+        port: Bind port (default: ``settings.port``)
+        workers: Worker processes (default: ``settings.workers``, 0 = available CPUs, or 1
+            with the per-process velocity backend)
+        ssl_keyfile: TLS private key (default: see ``tls_files``)
+        ssl_certfile: TLS certificate (default: see ``tls_files``)
+
+    Returns:
+        Dict[str, Any]: gunicorn settings
+
+    Raises:
+        ValueError: If several workers are requested explicitly but would each keep
+            their own velocity windows
+    """
+    workers = workers if workers is not None else settings.workers
+    per_process_velocity = settings.velocity_enabled and settings.velocity_backend == "memory"
+    if not workers:
+        workers = available_cpus()
+        if workers > 1 and per_process_velocity:
+            # Not the app logger: the master must not open the app log file before the fork
+            logging.getLogger("gunicorn.error").warning(
+                "velocity_backend 'memory' is per process; running 1 worker instead of %s "
+                "(set VELOCITY_BACKEND=redis to use every CPU)", workers
+            )
+            workers = 1
+    elif workers > 1 and per_process_velocity:
+        # Each worker would count only its own outflows, multiplying every limit by the worker count
+        raise ValueError(
+            f"velocity_backend 'memory' is per process and cannot enforce limits across {workers} workers; "
+            "set VELOCITY_BACKEND=redis or run a single worker (WORKERS=1)"
+        )
+    options = {
+        "bind": f"{host or settings.host}:{port or settings.port}",
+        "workers": workers,
+        "worker_class": f"{BankUvicornWorker.__module__}.{BankUvicornWorker.__qualname__}",
+        "preload_app": True,
+        "keepalive": settings.keepalive_seconds,
+        "backlog": settings.backlog,
+        "graceful_timeout": settings.graceful_timeout_seconds,
+        "timeout": settings.worker_timeout_seconds,
+        "max_requests": settings.max_requests,
+        "max_requests_jitter": settings.max_requests_jitter if settings.max_requests else 0,
+        "accesslog": None,  # requests are logged by the app middleware
+        "when_ready": _when_ready,
+        "post_fork": _post_fork,
+        "worker_exit": _worker_exit,
+    }
+    keyfile, certfile = tls_files(ssl_keyfile, ssl_certfile)
+    if keyfile or certfile:
+        options.update(keyfile=keyfile, certfile=certfile)
+    return options
+
+
+class ServerApplication(BaseApplication):
+    """gunicorn application serving ``create_app()``."""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.options = options
+        self.load_ms: Optional[float] = None
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import create_app
+
+        started = time.perf_counter()
+        application = create_app()
+        self.load_ms = round((time.perf_counter() - started) * 1000, 2)  # reported by _when_ready
+        return application
+
+
+def main(argv: Optional[list] = None) -> None:
+    """
+    Run the server.
+
+    Args:
+        argv: Command line arguments (default: ``sys.argv[1:]``)
+    """
+    parser = argparse.ArgumentParser(prog="python -m app", description="Run the Invisible Bank API server")
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--workers", type=int, help="worker processes (0 = available CPUs)")
+    parser.add_argument("--ssl-keyfile")
+    parser.add_argument("--ssl-certfile")
+    parser.add_argument("--reload", action="store_true", default=None,
+                        help="development mode: one process, restart on code changes")
+    args = parser.parse_args(argv)
+
+    if args.reload or (args.reload is None and settings.reload):
+        import uvicorn
+
+        keyfile, certfile = tls_files(args.ssl_keyfile, args.ssl_certfile)
+        uvicorn.run(
+            "app.main:create_app", factory=True, reload=True,
+            host=args.host or settings.host, port=args.port or settings.port,
+            ssl_keyfile=keyfile, ssl_certfile=certfile,
+        )
+        return
+
+    try:
+        options = server_options(args.host, args.port, args.workers, args.ssl_keyfile, args.ssl_certfile)
+    except ValueError as e:
+        parser.error(str(e))
+    ServerApplication(options).run()
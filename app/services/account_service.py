@@ -9,12 +9,15 @@ from app.utils.generators import generate_account_number
 from app.config import settings
 from app.core.exceptions import NotFoundError, UnauthorizedError
 from app.core.logging_config import logger
+from app.db.sqlite_tuning import retry_on_busy
+from app.services.data_version_service import DataVersionService
 
 
 class AccountService:
     """Account management service."""
 
     @staticmethod
+    @retry_on_busy
     def create_account(db: Session, user_id: int, request: AccountCreate) -> Account:
         """
         Create a new account for user.
@@ -39,6 +42,7 @@ class AccountService:
         )
 
         db.add(account)
+        DataVersionService.bump(db, user_id)
         db.commit()
         db.refresh(account)
 
@@ -6,6 +6,7 @@ from sqlalchemy import func
 from typing import List, Dict, Any
 from app.models.account import Account
 from app.models.transaction import Transaction
+from app.models.archived_transaction import ArchivedTransaction
 from app.models.account_holder import AccountHolder
 from datetime import datetime
 
@@ -98,7 +99,7 @@ class AdminService:
             Dictionary with system statistics
         """
         total_accounts = db.query(Account).count()
-        total_transactions = db.query(Transaction).count()
+        total_transactions = db.query(Transaction).count() + db.query(ArchivedTransaction).count()
         total_users = db.query(AccountHolder).count()
 
         # Calculate total system balance
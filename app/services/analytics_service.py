@@ -0,0 +1,357 @@
+"""
+Analytics service: inflow/outflow totals bucketed by period and type.
+
+Aggregation runs in the database: one ``GROUP BY`` per transaction table
+returns a row per (account, period, transaction type, direction) with the
+count and the sum in integer cents. Those rows are rolled up across
+accounts in Python, or with NumPy when it is installed and the result set
+is large. The range is capped at ``settings.analytics_max_buckets``
+periods, so the response size does not grow with history.
+
+Results are cached per user for ``settings.analytics_cache_ttl_seconds``.
+The user's data version is part of the cache key, so a write is visible
+on the next request.
+"""
+import functools
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from sqlalchemy import Integer, case, cast, func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.exceptions import UnauthorizedError, ValidationError
+from app.models.account import Account
+from app.models.archived_transaction import ArchivedTransaction
+from app.models.transaction import Transaction
+from app.schemas.analytics import AccountTotals, Analytics, AnalyticsBucket, FlowTotals, TypeTotals
+from app.services.archive_service import ArchiveService
+from app.services.data_version_service import DataVersionService
+from app.utils.ttl_cache import TTLCache
+
+
+BUCKETS = ("day", "week", "month")
+
+# Periods covered when no start is given
+DEFAULT_PERIODS = {"day": 30, "week": 26, "month": 12}
+
+# (account_id, period, transaction_type, is_outflow, count, cents)
+GroupRow = Tuple[int, str, str, int, int, int]
+
+# inflow cents, outflow cents, inflow count, outflow count
+Flows = Tuple[int, int, int, int]
+
+analytics_cache = TTLCache(max_entries=10_000)
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """NumPy module, or None if it is not installed (imported on first use)."""
+    try:
+        import numpy
+    except ImportError:  # optional dependency
+        return None
+    return numpy
+
+
+def bucket_start(bucket: str, moment: datetime) -> datetime:
+    """
+    Get the start of the period containing a moment.
+
+    Args:
+        bucket: 'day', 'week' (starting Monday) or 'month'
+        moment: Point in time
+
+    Returns:
+        datetime: Period start
+    """
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def shift_buckets(bucket: str, start: datetime, periods: int) -> datetime:
+    """
+    Move a period start by a number of periods.
+
+    Args:
+        bucket: 'day', 'week' or 'month'
+        start: Period start
+        periods: Periods to move (negative moves back)
+
+    Returns:
+        datetime: Start of the resulting period
+    """
+    if bucket == "month":
+        months = start.year * 12 + start.month - 1 + periods
+        return start.replace(year=months // 12, month=months % 12 + 1)
+    return start + timedelta(days=periods * (7 if bucket == "week" else 1))
+
+
+def count_buckets(bucket: str, start: datetime, end: datetime) -> int:
+    """
+    Count the periods a range touches.
+
+    Args:
+        bucket: 'day', 'week' or 'month'
+        start: Inclusive range start
+        end: Exclusive range end
+
+    Returns:
+        int: Number of periods
+    """
+    first = bucket_start(bucket, start)
+    last = bucket_start(bucket, end - timedelta(microseconds=1))
+    if bucket == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    return (last - first).days // (7 if bucket == "week" else 1) + 1
+
+
+def _period_key(dialect: str, bucket: str, column):
+    """SQL expression labelling a timestamp with its period start."""
+    if dialect == "sqlite":
+        if bucket == "day":
+            return func.strftime("%Y-%m-%d", column)
+        if bucket == "week":
+            # Next Sunday (or the day itself), then back to that week's Monday
+            return func.date(column, "weekday 0", "-6 days")
+        return func.strftime("%Y-%m", column)
+    return func.to_char(func.date_trunc(bucket, column), "YYYY-MM" if bucket == "month" else "YYYY-MM-DD")
+
+
+def _to_money(cents: int) -> Decimal:
+    return (Decimal(int(cents)) / 100).quantize(Decimal("0.01"))
+
+
+def _flow_fields(flows: Flows) -> dict:
+    inflow, outflow, inflow_count, outflow_count = (int(v) for v in flows)
+    return {
+        "inflow": _to_money(inflow),
+        "outflow": _to_money(outflow),
+        "net": _to_money(inflow - outflow),
+        "inflow_count": inflow_count,
+        "outflow_count": outflow_count,
+        "average_inflow": _to_money(round(inflow / inflow_count)) if inflow_count else _to_money(0),
+        "average_outflow": _to_money(round(outflow / outflow_count)) if outflow_count else _to_money(0),
+    }
+
+
+def _rollup_python(rows: Sequence[GroupRow]) -> Tuple[dict, dict, dict]:
+    """Roll group rows up to (period, type), type and account totals."""
+    series: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    by_type: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    by_account: Dict[int, List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    for account_id, period, transaction_type, is_outflow, count, cents in rows:
+        for totals in (series[period, transaction_type], by_type[transaction_type], by_account[account_id]):
+            totals[1 if is_outflow else 0] += cents
+            totals[3 if is_outflow else 2] += count
+    return series, by_type, by_account
+
+
+def _rollup_numpy(rows: Sequence[GroupRow]) -> Tuple[dict, dict, dict]:
+    """Vectorized equivalent of ``_rollup_python``."""
+    np = _numpy()
+    accounts, periods, types, is_outflow, counts, cents = zip(*rows)
+    account_keys, account_idx = np.unique(np.asarray(accounts, dtype=np.int64), return_inverse=True)
+    period_keys, period_idx = np.unique(np.asarray(periods), return_inverse=True)
+    type_keys, type_idx = np.unique(np.asarray(types), return_inverse=True)
+
+    outflow = np.asarray(is_outflow, dtype=bool)
+    counts = np.asarray(counts, dtype=np.int64)
+    cents = np.asarray(cents, dtype=np.int64)
+    values = np.zeros((len(rows), 4), dtype=np.int64)
+    values[:, 0] = np.where(outflow, 0, cents)
+    values[:, 1] = np.where(outflow, cents, 0)
+    values[:, 2] = np.where(outflow, 0, counts)
+    values[:, 3] = np.where(outflow, counts, 0)
+
+    def group(index, size: int):
+        totals = np.zeros((size, 4), dtype=np.int64)
+        np.add.at(totals, index, values)
+        return totals
+
+    n_types = len(type_keys)
+    series = group(period_idx * n_types + type_idx, len(period_keys) * n_types)
+    present = np.flatnonzero(series[:, 2] + series[:, 3])
+    return (
+        {(str(period_keys[i // n_types]), str(type_keys[i % n_types])): series[i].tolist() for i in present},
+        dict(zip(map(str, type_keys), group(type_idx, n_types).tolist())),
+        dict(zip(map(int, account_keys), group(account_idx, len(account_keys)).tolist())),
+    )
+
+
+def rollup(rows: Sequence[GroupRow]) -> Tuple[dict, dict, dict]:
+    """
+    Roll per-account group rows up across accounts.
+
+    Uses NumPy for at least ``settings.analytics_numpy_min_rows`` rows
+    when it is installed; both paths give identical results.
+
+    Args:
+        rows: (account_id, period, transaction_type, is_outflow, count, cents) rows
+
+    Returns:
+        Tuple[dict, dict, dict]: Flows per (period, type), per type and per account
+    """
+    if rows and len(rows) >= settings.analytics_numpy_min_rows and _numpy() is not None:
+        return _rollup_numpy(rows)
+    return _rollup_python(rows)
+
+
+class AnalyticsService:
+    """Spending analytics service."""
+
+    @staticmethod
+    def resolve_range(
+        bucket: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        now: Optional[datetime] = None
+    ) -> Tuple[datetime, datetime]:
+        """
+        Apply defaults to a requested range and check its size.
+
+        Without ``end`` the range runs to the end of the current period;
+        without ``start`` it covers ``DEFAULT_PERIODS[bucket]`` periods.
+        Default bounds fall on period starts, so they stay the same for the
+        whole current period. Timezone-aware bounds are converted to naive
+        UTC, the way timestamps are stored.
+
+        Args:
+            bucket: 'day', 'week' or 'month'
+            start: Optional inclusive start
+            end: Optional exclusive end
+            now: Reference time (default: now, UTC)
+
+        Returns:
+            Tuple[datetime, datetime]: Inclusive start and exclusive end
+
+        Raises:
+            ValidationError: If the bucket is unknown or the range is empty or too long
+        """
+        if bucket not in BUCKETS:
+            raise ValidationError(f"Bucket must be one of {', '.join(BUCKETS)}")
+        start, end = (
+            moment.astimezone(timezone.utc).replace(tzinfo=None) if moment and moment.tzinfo else moment
+            for moment in (start, end)
+        )
+        if end is None:
+            end = shift_buckets(bucket, bucket_start(bucket, now or datetime.utcnow()), 1)
+        if start is None:
+            start = shift_buckets(bucket, bucket_start(bucket, end - timedelta(microseconds=1)),
+                                  1 - DEFAULT_PERIODS[bucket])
+        if start >= end:
+            raise ValidationError("Start must be before end")
+        if count_buckets(bucket, start, end) > settings.analytics_max_buckets:
+            raise ValidationError(
+                f"Range spans more than {settings.analytics_max_buckets} {bucket} buckets; narrow it or use a larger bucket"
+            )
+        return start, end
+
+    @staticmethod
+    def group_rows(
+        db: Session,
+        account_ids: List[int],
+        bucket: str,
+        start: datetime,
+        end: datetime
+    ) -> List[GroupRow]:
+        """
+        Aggregate transactions per account, period, type and direction in SQL.
+
+        Args:
+            db: Database session
+            account_ids: Accounts to include
+            bucket: 'day', 'week' or 'month'
+            start: Inclusive start
+            end: Exclusive end
+
+        Returns:
+            List[GroupRow]: (account_id, period, transaction_type, is_outflow, count, cents) rows
+        """
+        if not account_ids:
+            return []
+        dialect = db.get_bind().dialect.name
+        models = [Transaction]
+        if ArchiveService.needs_archive(db, start):
+            models.append(ArchivedTransaction)
+
+        rows: List[GroupRow] = []
+        for model in models:
+            period = _period_key(dialect, bucket, model.created_at)
+            is_outflow = case((model.direction == "debit", 1), else_=0)
+            # Sum whole cents so totals are exact whatever the backend's numeric type
+            cents = cast(func.round(model.amount * 100), Integer)
+            rows += db.execute(
+                select(model.account_id, period, model.transaction_type, is_outflow, func.count(), func.sum(cents))
+                .where(model.account_id.in_(account_ids), model.created_at >= start, model.created_at < end)
+                .group_by(model.account_id, period, model.transaction_type, is_outflow)
+            ).all()
+        return rows
+
+    @staticmethod
+    def get_analytics(
+        db: Session,
+        user_id: int,
+        bucket: str = "day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        account_id: Optional[int] = None
+    ) -> Analytics:
+        """
+        Get inflow/outflow analytics for a user's accounts.
+
+        Args:
+            db: Database session
+            user_id: Account holder ID
+            bucket: 'day', 'week' (starting Monday) or 'month'
+            start: Optional inclusive start (default: see ``resolve_range``)
+            end: Optional exclusive end (default: end of the current period)
+            account_id: Optional account filter
+
+        Returns:
+            Analytics: Bucketed and total flows
+
+        Raises:
+            UnauthorizedError: If the account belongs to another user
+            ValidationError: If the range is invalid or too long
+        """
+        start, end = AnalyticsService.resolve_range(bucket, start, end)
+
+        key: Hashable = (user_id, DataVersionService.get(db, user_id), bucket, start, end, account_id)
+        cached = analytics_cache.get(key)
+        if cached is not None:
+            return cached
+
+        account_ids = list(db.scalars(select(Account.id).where(Account.account_holder_id == user_id)))
+        if account_id:
+            if account_id not in account_ids:
+                raise UnauthorizedError("Access denied to this account")
+            account_ids = [account_id]
+
+        series, by_type, by_account = rollup(AnalyticsService.group_rows(db, account_ids, bucket, start, end))
+        totals = [sum(column) for column in zip(*by_type.values())] or [0, 0, 0, 0]
+
+        analytics = Analytics(
+            bucket=bucket,
+            period_start=start,
+            period_end=end,
+            buckets=[
+                AnalyticsBucket(period=period, transaction_type=transaction_type, **_flow_fields(flows))
+                for (period, transaction_type), flows in sorted(series.items())
+            ],
+            by_type=[
+                TypeTotals(transaction_type=transaction_type, **_flow_fields(flows))
+                for transaction_type, flows in sorted(by_type.items())
+            ],
+            by_account=[
+                AccountTotals(account_id=account, **_flow_fields(by_account.get(account, (0, 0, 0, 0))))
+                for account in sorted(account_ids)
+            ],
+            totals=FlowTotals(**_flow_fields(totals)),
+        )
+        analytics_cache.set(key, analytics, settings.analytics_cache_ttl_seconds)
+        return analytics
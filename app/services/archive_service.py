@@ -0,0 +1,152 @@
+"""
+Archive service: hot/cold tiering of transactions.
+
+Transactions older than ``settings.archive_horizon_days`` are moved from
+``transactions`` to ``transactions_archive`` in batches, each batch in its
+own database transaction. Readers consult the archive only when the range
+they ask for starts at or before the archive watermark (the newest
+archived ``created_at``), so recent-history queries touch the hot table
+alone.
+"""
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.sqlite_tuning import retry_on_busy
+from app.models.archived_transaction import ArchivedTransaction
+from app.models.transaction import Transaction
+
+
+# Columns copied verbatim from the hot table
+_COPIED_COLUMNS = (
+    "id", "created_at", "updated_at", "transaction_id", "account_id", "transaction_type",
+    "amount", "peer_routing_number", "peer_account_number", "description", "journal_id", "direction",
+)
+
+
+class ArchiveService:
+    """Transaction archiving service."""
+
+    @staticmethod
+    def archive_watermark(db: Session) -> Optional[datetime]:
+        """
+        Get the newest ``created_at`` in the archive.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Optional[datetime]: Watermark, or None if nothing is archived
+        """
+        return db.query(func.max(ArchivedTransaction.created_at)).scalar()
+
+    @staticmethod
+    def needs_archive(db: Session, start: Optional[datetime]) -> bool:
+        """
+        Check whether a range starting at ``start`` reaches into the archive.
+
+        Args:
+            db: Database session
+            start: Inclusive range start (None means all history)
+
+        Returns:
+            bool: True if archived rows may fall in the range
+        """
+        watermark = ArchiveService.archive_watermark(db)
+        return watermark is not None and (start is None or start <= watermark)
+
+    @staticmethod
+    def get_archived_transactions(
+        db: Session,
+        account_ids: List[int],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[ArchivedTransaction]:
+        """
+        Get archived transactions for accounts, newest first.
+
+        Args:
+            db: Database session
+            account_ids: Account IDs to include
+            start: Optional inclusive lower bound on created_at
+            end: Optional exclusive upper bound on created_at
+
+        Returns:
+            List[ArchivedTransaction]: Archived transactions
+        """
+        query = db.query(ArchivedTransaction).filter(ArchivedTransaction.account_id.in_(account_ids))
+        if start is not None:
+            query = query.filter(ArchivedTransaction.created_at >= start)
+        if end is not None:
+            query = query.filter(ArchivedTransaction.created_at < end)
+        return query.order_by(ArchivedTransaction.created_at.desc()).all()
+
+    @staticmethod
+    @retry_on_busy
+    def _move_batch(db: Session, ids: List[int]) -> int:
+        """Copy one batch of transactions to the archive and delete them from the hot table."""
+        columns = [getattr(Transaction, name) for name in _COPIED_COLUMNS]
+        db.execute(
+            insert(ArchivedTransaction).from_select(
+                [*_COPIED_COLUMNS, "archived_at"],
+                select(*columns, literal(datetime.utcnow())).where(Transaction.id.in_(ids))
+            )
+        )
+        result = db.execute(
+            delete(Transaction).where(Transaction.id.in_(ids)),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def archive_transactions(
+        db: Session,
+        before: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> int:
+        """
+        Move transactions created before a cutoff into the archive.
+
+        Each batch commits on its own, so the job can be stopped and
+        re-run at any point.
+
+        Args:
+            db: Database session
+            before: Cutoff (default: now minus ``settings.archive_horizon_days``)
+            batch_size: Rows per batch (default: ``settings.archive_batch_size``)
+            max_batches: Optional limit on batches for this run
+
+        Returns:
+            int: Number of transactions archived
+        """
+        before = before or datetime.utcnow() - timedelta(days=settings.archive_horizon_days)
+        batch_size = batch_size or settings.archive_batch_size
+
+        archived = 0
+        batches = 0
+        started = time.perf_counter()
+        while max_batches is None or batches < max_batches:
+            ids = [row.id for row in db.query(Transaction.id).filter(
+                Transaction.created_at < before
+            ).order_by(Transaction.created_at).limit(batch_size).all()]
+            if not ids:
+                break
+
+            archived += ArchiveService._move_batch(db, ids)
+            batches += 1
+
+        logger.info(
+            "Transactions archived",
+            extra={
+                "archived": archived,
+                "batches": batches,
+                "before": before.isoformat(),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+        )
+        return archived
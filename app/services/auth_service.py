@@ -5,15 +5,17 @@ from sqlalchemy.orm import Session
 from app.models.account_holder import AccountHolder
 from app.schemas.auth import SignupRequest, LoginRequest, TokenResponse
 from app.core.security import hash_password, verify_password, create_access_token, create_refresh_token
-from app.utils.encryption import encryption_service
+from app.utils.encryption import encryption_service, row_aad
 from app.core.exceptions import AuthenticationError, ValidationError
 from app.core.logging_config import logger
+from app.db.sqlite_tuning import retry_on_busy
 
 
 class AuthService:
     """Authentication service."""
 
     @staticmethod
+    @retry_on_busy
     def signup(db: Session, request: SignupRequest) -> TokenResponse:
         """
         Register a new user.
@@ -36,22 +38,27 @@ class AuthService:
         if existing_user:
             raise ValidationError("Email already registered")
 
-        # Hash password and encrypt SSN
+        # Hash password
         password_hash = hash_password(request.password)
-        ssn_encrypted = encryption_service.encrypt(request.ssn)
 
         # Create new account holder
         account_holder = AccountHolder(
             name=request.name,
             email=request.email,
             password_hash=password_hash,
-            ssn_encrypted=ssn_encrypted,
+            ssn_encrypted=b"",
             date_of_birth=request.date_of_birth,
             mailing_address=request.mailing_address,
             is_active=True
         )
 
         db.add(account_holder)
+        db.flush()
+
+        # Encrypt SSN bound to the new row id
+        account_holder.ssn_encrypted = encryption_service.encrypt(
+            request.ssn, row_aad(AccountHolder.__tablename__, account_holder.id)
+        )
         db.commit()
         db.refresh(account_holder)
 
@@ -1,21 +1,26 @@
 """
 Card service for managing debit/credit cards.
 """
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.card import Card
 from app.models.account import Account
 from app.schemas.card import CardCreate, CardResponse
 from app.utils.generators import generate_card_number
-from app.utils.encryption import encryption_service
+from app.utils.encryption import encryption_service, row_aad
 from app.core.exceptions import AccountNotFoundError, UnauthorizedError
 from app.core.logging_config import logger
+from app.db.sqlite_tuning import retry_on_busy
+from app.services.data_version_service import DataVersionService
+from app.services.key_rotation_service import KeyRotationService
 
 
 class CardService:
     """Card management service."""
 
     @staticmethod
+    @retry_on_busy
     def create_card(db: Session, user_id: int, request: CardCreate) -> Card:
         """
         Create a new card for an account.
@@ -35,18 +40,21 @@ class CardService:
         if account.account_holder_id != user_id:
             raise UnauthorizedError("Access denied to this account")
 
-        # Generate and encrypt card number
-        card_number = generate_card_number()
-        card_number_encrypted = encryption_service.encrypt(card_number)
-
         card = Card(
             account_id=request.account_id,
-            card_number_encrypted=card_number_encrypted,
+            card_number_encrypted=b"",
             card_type=request.card_type,
             is_active=True
         )
 
         db.add(card)
+        db.flush()
+
+        # Generate and encrypt card number bound to the new row id
+        card.card_number_encrypted = encryption_service.encrypt(
+            generate_card_number(), row_aad(Card.__tablename__, card.id)
+        )
+        DataVersionService.bump(db, user_id)
         db.commit()
         db.refresh(card)
 
@@ -67,7 +75,7 @@ class CardService:
             List[Card]: User's cards
         """
         # Get user's account IDs
-        account_ids = [acc.id for acc in db.query(Account).filter(
+        account_ids = [acc.id for acc in db.query(Account.id).filter(
             Account.account_holder_id == user_id
         ).all()]
 
@@ -92,7 +100,9 @@ class CardService:
             CardResponse: Response with last 4 digits only
         """
         # Decrypt card number and get last 4 digits
-        card_number = encryption_service.decrypt(card.card_number_encrypted)
+        card_number = encryption_service.decrypt(
+            card.card_number_encrypted, row_aad(Card.__tablename__, card.id)
+        )
         last4 = card_number[-4:]
 
         return CardResponse(
@@ -104,3 +114,26 @@ class CardService:
             created_at=card.created_at,
             updated_at=card.updated_at
         )
+
+    @staticmethod
+    def reseal_card_numbers(db: Session, cards: List[Card]) -> int:
+        """
+        Re-encrypt listed card numbers not under the primary key and current format.
+
+        Failures are logged rather than raised: the cards were already read,
+        and the rotation job converts anything left behind.
+
+        Args:
+            db: Primary database session
+            cards: Cards just read
+
+        Returns:
+            int: Number of card numbers re-encrypted
+        """
+        rows = [(card.id, card.card_number_encrypted) for card in cards]
+        try:
+            return KeyRotationService.reseal(db, Card, "card_number_encrypted", rows)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Card number re-encryption skipped: {e}")
+            return 0
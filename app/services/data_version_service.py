@@ -0,0 +1,74 @@
+"""
+Data version service: per-account-holder change counters.
+
+Every write that changes what an account holder sees through the API
+(balances, transactions, accounts, cards) bumps the holder's
+``data_version`` in the same database transaction. Read endpoints derive
+their ETag from it, so a poll with a matching ``If-None-Match`` is answered
+with 304 after a single primary-key lookup.
+"""
+from typing import Iterable
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+
+
+class DataVersionService:
+    """Per-account-holder data version counters."""
+
+    @staticmethod
+    def get(db: Session, user_id: int) -> int:
+        """
+        Get an account holder's current data version.
+
+        Args:
+            db: Database session
+            user_id: Account holder ID
+
+        Returns:
+            int: Data version (0 if the holder does not exist)
+        """
+        version = db.execute(
+            select(AccountHolder.data_version).where(AccountHolder.id == user_id)
+        ).scalar()
+        return version or 0
+
+    @staticmethod
+    def bump(db: Session, *user_ids: int) -> None:
+        """
+        Bump the data version of account holders (committed by the caller).
+
+        Args:
+            db: Database session
+            user_ids: Account holder IDs
+        """
+        ids = sorted(set(user_ids))
+        if not ids:
+            return
+        db.execute(
+            update(AccountHolder)
+            .where(AccountHolder.id.in_(ids))
+            .values(data_version=AccountHolder.data_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def bump_accounts(db: Session, account_ids: Iterable[int]) -> None:
+        """
+        Bump the data version of the holders owning the given accounts.
+
+        Args:
+            db: Database session
+            account_ids: Account IDs
+        """
+        ids = sorted(set(account_ids))
+        if not ids:
+            return
+        owners = select(Account.account_holder_id).where(Account.id.in_(ids))
+        db.execute(
+            update(AccountHolder)
+            .where(AccountHolder.id.in_(owners))
+            .values(data_version=AccountHolder.data_version + 1)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,310 @@
+"""
+Bulk onboarding import: stream a CSV of account holders and their accounts.
+
+Used to migrate a partner bank's customers without going through
+``POST /auth/signup`` once per user. The file is read in chunks of
+``chunk_size`` rows; for each chunk rows are validated with the signup
+schema, emails are checked against the database in one query, passwords are
+hashed across a process pool (Argon2 dominates the cost), holders and
+accounts are bulk-inserted, SSNs are encrypted with their row ids and
+written back in one batch, and the chunk is committed. Progress is
+checkpointed after every commit, so an interrupted import resumes at the
+first uncommitted chunk; rows committed just before a crash are skipped on
+re-run as existing emails.
+
+CSV columns: name, email, password, ssn, date_of_birth (YYYY-MM-DD),
+mailing_address, and optionally accounts (account types separated by
+``;``, e.g. ``checking;savings``). Opened accounts start with a zero
+balance; opening balances are not migrated by this import.
+"""
+import csv
+import json
+import os
+import time
+from concurrent.futures import Executor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.logging_config import logger
+from app.core.security import hash_password
+from app.db.sqlite_tuning import retry_on_busy
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.schemas.auth import SignupRequest
+from app.utils.encryption import encryption_service, row_aad
+from app.utils.generators import generate_account_numbers
+
+
+REQUIRED_COLUMNS = ("name", "email", "password", "ssn", "date_of_birth", "mailing_address")
+ACCOUNT_TYPES = ("checking", "savings")
+
+# Called with (line number, raw row, reason) for every row that is not imported
+RejectCallback = Callable[[int, Dict[str, str], str], None]
+
+
+class ImportService:
+    """Bulk import of account holders."""
+
+    @staticmethod
+    def load_checkpoint(path: Path, source: Path) -> Dict:
+        """
+        Load the checkpoint for a source file.
+
+        A checkpoint written for a different file (path or size) is ignored.
+
+        Args:
+            path: Checkpoint file
+            source: CSV being imported
+
+        Returns:
+            Dict: {"source": ..., "size": ..., "rows_done": n}
+        """
+        identity = {"source": str(source.resolve()), "size": source.stat().st_size}
+        if path.exists():
+            checkpoint = json.loads(path.read_text())
+            if all(checkpoint.get(key) == value for key, value in identity.items()):
+                return checkpoint
+        return {**identity, "rows_done": 0}
+
+    @staticmethod
+    def save_checkpoint(path: Path, checkpoint: Dict) -> None:
+        """
+        Atomically write the checkpoint.
+
+        Args:
+            path: Checkpoint file
+            checkpoint: Checkpoint data
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+        partial.write_text(json.dumps(checkpoint))
+        os.replace(partial, path)
+
+    @staticmethod
+    def parse_row(row: Dict[str, str]) -> Tuple[SignupRequest, List[str]]:
+        """
+        Validate one CSV row with the signup rules.
+
+        Args:
+            row: Raw CSV row
+
+        Returns:
+            Tuple[SignupRequest, List[str]]: Holder data and account types to open
+
+        Raises:
+            ValueError: If the row is invalid
+        """
+        try:
+            request = SignupRequest(**{column: (row.get(column) or "").strip() for column in REQUIRED_COLUMNS})
+        except PydanticValidationError as e:
+            error = e.errors()[0]
+            raise ValueError(f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+        account_types = [t.strip().lower() for t in (row.get("accounts") or "").split(";") if t.strip()]
+        for account_type in account_types:
+            if account_type not in ACCOUNT_TYPES:
+                raise ValueError(f"accounts: unknown account type '{account_type}'")
+        return request, account_types
+
+    @staticmethod
+    @retry_on_busy
+    def _write_chunk(db: Session, holders: List[Tuple[SignupRequest, List[str], str]]) -> Tuple[int, int, Set[str]]:
+        """
+        Insert one validated chunk of holders (with password hashes) and their accounts, then commit.
+
+        Returns the imported holder and account counts and the emails skipped as already registered.
+        """
+        # Re-checked inside the write transaction; the caller checked before hashing
+        emails = [request.email for request, _, _ in holders]
+        existing = set(db.scalars(select(AccountHolder.email).where(AccountHolder.email.in_(emails))))
+        holders = [holder for holder in holders if holder[0].email not in existing]
+        if not holders:
+            return 0, 0, existing
+
+        inserted = db.execute(
+            insert(AccountHolder).returning(AccountHolder.id, AccountHolder.email),
+            [{
+                "name": request.name,
+                "email": request.email,
+                "password_hash": password_hash,
+                "ssn_encrypted": b"",
+                "date_of_birth": request.date_of_birth,
+                "mailing_address": request.mailing_address,
+                "is_active": True,
+            } for request, _, password_hash in holders]
+        ).all()
+        ids = {email: holder_id for holder_id, email in inserted}
+
+        # SSNs are bound to the new row ids, so they are encrypted after the insert
+        table = AccountHolder.__table__
+        db.execute(
+            table.update().where(table.c.id == bindparam("b_id")).values(ssn_encrypted=bindparam("b_ssn")),
+            [{
+                "b_id": ids[request.email],
+                "b_ssn": encryption_service.encrypt(request.ssn, row_aad(AccountHolder.__tablename__, ids[request.email]))
+            } for request, _, _ in holders]
+        )
+
+        accounts = [(ids[request.email], account_type) for request, account_types, _ in holders
+                    for account_type in account_types]
+        if accounts:
+            numbers = generate_account_numbers(db, len(accounts))
+            db.execute(insert(Account), [{
+                "account_holder_id": holder_id,
+                "account_number": number,
+                "routing_number": settings.routing_number,
+                "account_type": account_type,
+                "balance": 0,
+                "is_active": True,
+            } for (holder_id, account_type), number in zip(accounts, numbers)])
+
+        db.commit()
+        return len(holders), len(accounts), existing
+
+    @staticmethod
+    def import_chunk(
+        db: Session,
+        rows: List[Tuple[int, Dict[str, str]]],
+        pool: Optional[Executor] = None,
+        reject: Optional[RejectCallback] = None
+    ) -> Dict[str, int]:
+        """
+        Validate, hash and insert one chunk of CSV rows.
+
+        Args:
+            db: Database session
+            rows: (line number, raw row) pairs
+            pool: Executor used to hash passwords (default: hash in-process)
+            reject: Optional callback for rows that are not imported
+
+        Returns:
+            Dict[str, int]: Counts of imported holders, opened accounts and rejected rows
+        """
+        valid = []
+        rejected = 0
+
+        def skip(line: int, row: Dict[str, str], reason: str) -> None:
+            nonlocal rejected
+            rejected += 1
+            if reject:
+                reject(line, row, reason)
+
+        seen = set()
+        for line, row in rows:
+            try:
+                request, account_types = ImportService.parse_row(row)
+            except ValueError as e:
+                skip(line, row, str(e))
+                continue
+            if request.email in seen:
+                skip(line, row, "email: duplicated in file")
+                continue
+            seen.add(request.email)
+            valid.append((line, row, request, account_types))
+
+        # One uniqueness query per chunk, before paying for the password hashes
+        registered = set(db.scalars(select(AccountHolder.email).where(AccountHolder.email.in_(seen))))
+        db.rollback()  # end the read transaction before hashing
+        for line, row, request, _ in valid:
+            if request.email in registered:
+                skip(line, row, "email: already registered")
+        valid = [item for item in valid if item[2].email not in registered]
+
+        passwords = [request.password for _, _, request, _ in valid]
+        hashes = list(pool.map(hash_password, passwords, chunksize=max(1, len(passwords) // 32))
+                      if pool else map(hash_password, passwords))
+
+        holders = [(request, account_types, password_hash)
+                   for (_, _, request, account_types), password_hash in zip(valid, hashes)]
+        imported, accounts, existing = ImportService._write_chunk(db, holders) if holders else (0, 0, set())
+
+        # Registered concurrently while this chunk was being hashed
+        for line, row, request, _ in valid:
+            if request.email in existing:
+                skip(line, row, "email: already registered")
+        return {"imported": imported, "accounts": accounts, "rejected": rejected}
+
+    @staticmethod
+    def read_rows(path: Path, skip: int = 0) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Stream CSV rows with their line numbers.
+
+        Args:
+            path: CSV file with a header row
+            skip: Data rows to skip (already imported)
+
+        Yields:
+            Tuple[int, Dict[str, str]]: (line number, row)
+
+        Raises:
+            ValueError: If a required column is missing from the header
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+            for row in islice(reader, skip, None):
+                yield reader.line_num, row
+
+    @staticmethod
+    def import_csv(
+        db: Session,
+        path: str,
+        chunk_size: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        pool: Optional[Executor] = None,
+        reject: Optional[RejectCallback] = None,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Import a CSV of account holders, resuming from the checkpoint.
+
+        Args:
+            db: Database session
+            path: CSV file
+            chunk_size: Rows per chunk and commit (default: ``settings.import_chunk_size``)
+            checkpoint_path: Checkpoint file (default: ``settings.import_checkpoint_file``)
+            pool: Executor used to hash passwords (default: hash in-process)
+            reject: Optional callback for rows that are not imported
+            progress: Optional callback receiving the status dict after each chunk
+
+        Returns:
+            Dict: Final status (rows read, imported, accounts, rejected, rows_per_second)
+        """
+        source = Path(path)
+        checkpoint_file = Path(checkpoint_path or settings.import_checkpoint_file)
+        checkpoint = ImportService.load_checkpoint(checkpoint_file, source)
+        chunk_size = chunk_size or settings.import_chunk_size
+
+        status = {"source": str(source), "resumed_at": checkpoint["rows_done"],
+                  "rows": 0, "imported": 0, "accounts": 0, "rejected": 0}
+        logger.info("Holder import started", extra={"source": str(source), "resumed_at": checkpoint["rows_done"]})
+        started = time.perf_counter()
+
+        rows = ImportService.read_rows(source, skip=checkpoint["rows_done"])
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            counts = ImportService.import_chunk(db, chunk, pool, reject)
+
+            checkpoint["rows_done"] += len(chunk)
+            ImportService.save_checkpoint(checkpoint_file, checkpoint)
+
+            status["rows"] += len(chunk)
+            for key, value in counts.items():
+                status[key] += value
+            elapsed = time.perf_counter() - started
+            status["rows_per_second"] = round(status["rows"] / elapsed, 1) if elapsed else None
+            logger.info("Holder import progress", extra=status)
+            if progress:
+                progress(dict(status))
+
+        status["elapsed_s"] = round(time.perf_counter() - started, 2)
+        status["rows_per_second"] = round(status["rows"] / status["elapsed_s"], 1) if status["elapsed_s"] else None
+        logger.info("Holder import finished", extra=status)
+        return status
@@ -0,0 +1,205 @@
+"""
+Interest service: daily interest accrual on savings accounts.
+
+Interest for a business date is computed for all active savings accounts
+with a positive balance at ``settings.savings_interest_rate`` (annual,
+actual/365), rounded to cents, on the balance at the time the job runs;
+run it shortly after the end of the business day.
+
+Accounts are processed in chunks of consecutive ids, each in one database
+transaction made of a few set-based statements: an INSERT ... SELECT
+computes the chunk's accruals, then the journal entries, balance updates,
+'deposit' transactions and postings are all derived from those rows in
+bulk. Accruals are unique per (business date, account) and every statement
+skips rows it already wrote, so a date can be re-run or resumed after a
+crash without crediting anyone twice. Interest rows use
+``interest-<date>-<account id>`` as their journal and transaction id.
+Accruals that round to zero are recorded (the account counts as done)
+but not posted.
+"""
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Dict, Optional
+from sqlalchemy import (
+    Date, Numeric, String, bindparam, case, cast, exists, func, insert, literal, null, select, update
+)
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.sqlite_tuning import retry_on_busy
+from app.models.account import Account
+from app.models.interest_accrual import InterestAccrual
+from app.models.journal_entry import JournalEntry
+from app.models.posting import Posting
+from app.models.transaction import Transaction
+from app.services.data_version_service import DataVersionService
+from app.services.ledger_service import LEDGER_CUSTOMER, LEDGER_INTEREST_EXPENSE, to_money
+
+
+DAYS_PER_YEAR = 365
+
+
+class InterestService:
+    """Savings interest accrual service."""
+
+    @staticmethod
+    @retry_on_busy
+    def accrue_range(
+        db: Session,
+        business_date: date,
+        first_id: int,
+        last_id: int,
+        rate: Optional[Decimal] = None
+    ) -> Dict:
+        """
+        Accrue and post one business date's interest for the accounts with ids in [first_id, last_id].
+
+        Args:
+            db: Database session
+            business_date: Business date the interest is for
+            first_id: First account id of the chunk
+            last_id: Last account id of the chunk
+            rate: Annual interest rate (default: ``settings.savings_interest_rate``)
+
+        Returns:
+            Dict: Accounts accrued, accounts credited and total interest credited by this call
+        """
+        rate = settings.savings_interest_rate if rate is None else rate
+        day = bindparam("business_date", business_date, type_=Date)
+        annual_rate = bindparam("rate", rate, type_=Numeric(9, 6))
+        description = f"Savings interest for {business_date.isoformat()}"
+        in_chunk = InterestAccrual.account_id.between(first_id, last_id)
+        posted = (InterestAccrual.business_date == day) & in_chunk & InterestAccrual.journal_id.is_not(None)
+
+        # 1. Accruals, computed in SQL for every eligible account of the chunk not accrued yet
+        interest = func.round(Account.balance * annual_rate / DAYS_PER_YEAR, 2)
+        journal_id = case((interest > 0, literal(f"interest-{business_date.isoformat()}-") + cast(Account.id, String)))
+        accrued = db.execute(
+            insert(InterestAccrual).from_select(
+                ["business_date", "account_id", "balance", "rate", "amount", "journal_id"],
+                select(day, Account.id, Account.balance, annual_rate, interest, journal_id).where(
+                    Account.id.between(first_id, last_id),
+                    Account.account_type == "savings",
+                    Account.is_active.is_(True),
+                    Account.balance > 0,
+                    ~exists().where(InterestAccrual.business_date == day, InterestAccrual.account_id == Account.id),
+                )
+            ).returning(InterestAccrual.account_id, InterestAccrual.amount)
+        ).all()
+        credited = [(account_id, to_money(amount)) for account_id, amount in accrued if to_money(amount) > 0]
+
+        if credited:
+            # 2. One journal entry per credited accrual
+            db.execute(insert(JournalEntry).from_select(
+                ["journal_id", "entry_type", "description"],
+                select(InterestAccrual.journal_id, literal("interest"), literal(description)).where(
+                    posted, ~exists().where(JournalEntry.journal_id == InterestAccrual.journal_id)
+                )
+            ))
+
+            # 3. Balances, for accruals whose transaction is not written yet
+            DataVersionService.bump_accounts(db, [account_id for account_id, _ in credited])
+            db.execute(
+                update(Account)
+                .where(Account.id.between(first_id, last_id), exists().where(
+                    posted, InterestAccrual.account_id == Account.id,
+                    ~exists().where(Transaction.transaction_id == InterestAccrual.journal_id)
+                ))
+                .values(balance=Account.balance + select(InterestAccrual.amount).where(
+                    InterestAccrual.business_date == day, InterestAccrual.account_id == Account.id
+                ).scalar_subquery())
+                .execution_options(synchronize_session=False)
+            )
+
+            # 4. Customer-facing 'deposit' transactions
+            db.execute(insert(Transaction).from_select(
+                ["transaction_id", "account_id", "transaction_type", "amount", "description", "journal_id", "direction"],
+                select(InterestAccrual.journal_id, InterestAccrual.account_id, literal("deposit"),
+                       InterestAccrual.amount, literal(description), InterestAccrual.journal_id,
+                       literal("credit")).where(
+                    posted, ~exists().where(Transaction.transaction_id == InterestAccrual.journal_id)
+                )
+            ))
+
+            # 5. Postings: credit the customer, debit interest expense
+            for code, account_id, amount in (
+                (LEDGER_CUSTOMER, InterestAccrual.account_id, InterestAccrual.amount),
+                (LEDGER_INTEREST_EXPENSE, null(), -InterestAccrual.amount),
+            ):
+                db.execute(insert(Posting).from_select(
+                    ["journal_entry_id", "ledger_code", "account_id", "amount"],
+                    select(JournalEntry.id, literal(code), account_id, amount)
+                    .select_from(InterestAccrual)
+                    .join(JournalEntry, JournalEntry.journal_id == InterestAccrual.journal_id)
+                    .where(posted, ~exists().where(Posting.journal_entry_id == JournalEntry.id,
+                                                    Posting.ledger_code == code))
+                ))
+
+        db.commit()
+        return {
+            "accrued": len(accrued),
+            "credited": len(credited),
+            "interest": sum((amount for _, amount in credited), Decimal("0.00")),
+        }
+
+    @staticmethod
+    def accrue(
+        db: Session,
+        business_date: date,
+        chunk_size: Optional[int] = None,
+        rate: Optional[Decimal] = None,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Accrue one business date's interest for all savings accounts, chunk by chunk.
+
+        Accounts already accrued for the date are skipped, so an
+        interrupted run resumes when called again.
+
+        Args:
+            db: Database session
+            business_date: Business date the interest is for; must be in the past
+            chunk_size: Accounts per chunk and commit (default: ``settings.interest_chunk_size``)
+            rate: Annual interest rate (default: ``settings.savings_interest_rate``)
+            progress: Optional callback receiving the status dict after each chunk
+
+        Returns:
+            Dict: Final status (accrued, credited, interest, elapsed_s, accounts_per_second)
+
+        Raises:
+            ValueError: If the business date has not ended yet
+        """
+        if business_date >= datetime.utcnow().date():
+            raise ValueError(f"Business date {business_date} has not ended yet")
+        chunk_size = chunk_size or settings.interest_chunk_size
+
+        status = {"business_date": business_date.isoformat(), "accrued": 0, "credited": 0,
+                  "interest": Decimal("0.00")}
+        logger.info("Interest accrual started", extra={"business_date": status["business_date"]})
+        started = time.perf_counter()
+
+        last_account_id = db.scalar(select(func.max(Account.id))) or 0
+        first_id = 1
+        while first_id <= last_account_id:
+            # Keyset chunk boundary: the chunk_size-th account id from first_id
+            last_id = db.scalar(
+                select(Account.id).where(Account.id >= first_id).order_by(Account.id)
+                .offset(chunk_size - 1).limit(1)
+            ) or last_account_id
+            db.rollback()  # end the read transaction before writing
+
+            counts = InterestService.accrue_range(db, business_date, first_id, last_id, rate)
+            for key, value in counts.items():
+                status[key] += value
+            elapsed = time.perf_counter() - started
+            status["accounts_per_second"] = round(status["accrued"] / elapsed, 1) if elapsed else None
+            if progress:
+                progress(dict(status))
+            first_id = last_id + 1
+
+        status["elapsed_s"] = round(time.perf_counter() - started, 2)
+        status["accounts_per_second"] = (round(status["accrued"] / status["elapsed_s"], 1)
+                                         if status["elapsed_s"] else None)
+        logger.info("Interest accrual finished", extra={**status, "interest": str(status["interest"])})
+        return status
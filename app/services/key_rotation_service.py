@@ -0,0 +1,244 @@
+"""
+Key rotation service: re-encrypt stored secrets under the primary key and
+the configured ciphertext format.
+
+Walks each encrypted column in keyset-paginated batches (``id > last_id``),
+re-encrypting values whose key id is not the primary one or whose format is
+not ``settings.encryption_format``. Each value is re-sealed with its row's
+associated data (``row_aad``), which the aes-gcm format authenticates. Writes are
+compare-and-swap (the row is only updated if the ciphertext is unchanged),
+so rotation can run while the API is serving traffic. Throughput is capped
+at ``settings.key_rotation_rows_per_second`` and progress is checkpointed
+after every batch, so an interrupted run resumes where it stopped.
+
+``reseal`` applies the same compare-and-swap to rows a request has just
+read, so card numbers migrate as they are listed without waiting for the job.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.sqlite_tuning import retry_on_busy
+from app.models.account_holder import AccountHolder
+from app.models.card import Card
+from app.utils.encryption import FORMAT_FERNET, EncryptionService, encryption_service, row_aad
+
+
+# (model, encrypted column) pairs to rotate
+ROTATION_TARGETS = (
+    (AccountHolder, "ssn_encrypted"),
+    (Card, "card_number_encrypted"),
+)
+
+
+class KeyRotationService:
+    """Online re-encryption of stored secrets."""
+
+    @staticmethod
+    def load_checkpoint(path: Path, primary_key_id: str, ciphertext_format: str = FORMAT_FERNET) -> Dict:
+        """
+        Load the checkpoint for the current primary key and format.
+
+        A checkpoint written for a different primary key or format is ignored.
+
+        Args:
+            path: Checkpoint file
+            primary_key_id: Current primary key id
+            ciphertext_format: Current ciphertext format
+
+        Returns:
+            Dict: {"primary_key_id": ..., "format": ..., "last_ids": {"table.column": id}}
+        """
+        if path.exists():
+            checkpoint = json.loads(path.read_text())
+            if (checkpoint.get("primary_key_id") == primary_key_id
+                    and checkpoint.get("format", FORMAT_FERNET) == ciphertext_format):
+                return checkpoint
+        return {"primary_key_id": primary_key_id, "format": ciphertext_format, "last_ids": {}}
+
+    @staticmethod
+    def save_checkpoint(path: Path, checkpoint: Dict) -> None:
+        """
+        Atomically write the checkpoint.
+
+        Args:
+            path: Checkpoint file
+            checkpoint: Checkpoint data
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+        partial.write_text(json.dumps(checkpoint))
+        os.replace(partial, path)
+
+    @staticmethod
+    @retry_on_busy
+    def _write_batch(db: Session, model, column: str, updates: List[Dict]) -> int:
+        """
+        Compare-and-swap the re-encrypted values of one batch.
+
+        ``updated_at`` is kept: re-encryption does not change the data, and
+        responses must stay identical under an unchanged ETag.
+        """
+        table = model.__table__
+        result = db.execute(
+            table.update()
+            .where(table.c.id == bindparam("b_id"), table.c[column] == bindparam("b_old"))
+            .values({column: bindparam("b_new"), "updated_at": table.c.updated_at}),
+            updates
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def reseal(
+        db: Session,
+        model,
+        column: str,
+        rows: Iterable[Tuple[int, bytes]],
+        service: Optional[EncryptionService] = None
+    ) -> int:
+        """
+        Re-encrypt values a request has read if they need rotation.
+
+        Uses the rotation job's compare-and-swap write, so a row changed
+        concurrently (or already rotated by the job) is left alone.
+
+        Args:
+            db: Primary database session (committed when anything is written)
+            model: Model class with an integer ``id``
+            column: Encrypted column name
+            rows: ``(id, ciphertext)`` pairs as read
+            service: Encryption service (default: the global one)
+
+        Returns:
+            int: Number of rows re-encrypted
+        """
+        service = service or encryption_service
+        updates = [
+            {"b_id": row_id, "b_old": value, "b_new": service.rotate(value, row_aad(model.__tablename__, row_id))}
+            for row_id, value in rows if service.needs_rotation(value)
+        ]
+        if not updates:
+            return 0
+        return KeyRotationService._write_batch(db, model, column, updates)
+
+    @staticmethod
+    def rotate_column(
+        db: Session,
+        model,
+        column: str,
+        checkpoint: Dict,
+        checkpoint_path: Path,
+        service: EncryptionService,
+        batch_size: int,
+        rows_per_second: float,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Re-encrypt one column, resuming from the checkpoint.
+
+        Args:
+            db: Database session
+            model: Model class with an integer ``id``
+            column: Encrypted column name
+            checkpoint: Checkpoint data (updated in place)
+            checkpoint_path: Where to persist the checkpoint
+            service: Encryption service holding the keyring
+            batch_size: Rows per batch
+            rows_per_second: Scan rate limit (0 for unlimited)
+            progress: Optional callback receiving the progress dict after each batch
+
+        Returns:
+            Dict: Final progress for the column
+        """
+        name = f"{model.__tablename__}.{column}"
+        id_column = model.id
+        value_column = getattr(model, column)
+        last_id = checkpoint["last_ids"].get(name, 0)
+
+        remaining = db.query(func.count(id_column)).filter(id_column > last_id).scalar()
+        status = {"column": name, "scanned": 0, "rotated": 0, "conflicts": 0, "total": remaining, "last_id": last_id}
+        started = time.perf_counter()
+
+        while True:
+            rows = db.query(id_column, value_column).filter(
+                id_column > last_id
+            ).order_by(id_column).limit(batch_size).all()
+            db.rollback()  # end the read transaction between batches
+            if not rows:
+                break
+
+            updates = [
+                {"b_id": row_id, "b_old": value, "b_new": service.rotate(value, row_aad(model.__tablename__, row_id))}
+                for row_id, value in rows if service.needs_rotation(value)
+            ]
+            if updates:
+                written = KeyRotationService._write_batch(db, model, column, updates)
+                status["rotated"] += written
+                status["conflicts"] += len(updates) - written
+
+            last_id = rows[-1][0]
+            checkpoint["last_ids"][name] = last_id
+            KeyRotationService.save_checkpoint(checkpoint_path, checkpoint)
+
+            status["scanned"] += len(rows)
+            status["last_id"] = last_id
+            elapsed = time.perf_counter() - started
+            status["percent"] = round(100.0 * status["scanned"] / max(status["total"], 1), 1)
+            status["rows_per_second"] = round(status["scanned"] / elapsed, 1) if elapsed else None
+            logger.info("Key rotation progress", extra=status)
+            if progress:
+                progress(dict(status))
+
+            if rows_per_second > 0:
+                ahead = status["scanned"] / rows_per_second - (time.perf_counter() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        return status
+
+    @staticmethod
+    def rotate_all(
+        db: Session,
+        batch_size: Optional[int] = None,
+        rows_per_second: Optional[float] = None,
+        checkpoint_path: Optional[str] = None,
+        service: Optional[EncryptionService] = None,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Re-encrypt every encrypted column under the primary key and current format.
+
+        Args:
+            db: Database session
+            batch_size: Rows per batch (default: ``settings.key_rotation_batch_size``)
+            rows_per_second: Rate limit (default: ``settings.key_rotation_rows_per_second``)
+            checkpoint_path: Checkpoint file (default: ``settings.key_rotation_checkpoint_file``)
+            service: Encryption service (default: the global one)
+            progress: Optional per-batch progress callback
+
+        Returns:
+            List[Dict]: Final progress per column
+        """
+        service = service or encryption_service
+        path = Path(checkpoint_path or settings.key_rotation_checkpoint_file)
+        checkpoint = KeyRotationService.load_checkpoint(path, service.primary_key_id, service.format)
+        batch_size = batch_size or settings.key_rotation_batch_size
+        rate = settings.key_rotation_rows_per_second if rows_per_second is None else rows_per_second
+
+        logger.info("Key rotation started", extra={"primary_key_id": service.primary_key_id,
+                                                   "format": service.format})
+        results = [
+            KeyRotationService.rotate_column(
+                db, model, column, checkpoint, path, service, batch_size, rate, progress
+            )
+            for model, column in ROTATION_TARGETS
+        ]
+        logger.info("Key rotation finished", extra={"primary_key_id": service.primary_key_id,
+                                                    "rotated": sum(r["rotated"] for r in results)})
+        return results
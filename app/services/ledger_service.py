@@ -0,0 +1,234 @@
+"""
+Ledger service: double-entry journal and the account balance projection.
+
+Every money movement is recorded as a JournalEntry whose Postings sum to
+zero. The postings are the source of truth; ``Account.balance`` is a cached
+projection kept up to date in the same database transaction and can be
+verified or rebuilt from the postings at any time.
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+from app.core.exceptions import InsufficientFundsError, TransactionError
+from app.core.logging_config import logger
+from app.models.account import Account
+from app.models.archived_transaction import ArchivedTransaction
+from app.models.journal_entry import JournalEntry
+from app.models.posting import Posting
+from app.models.transaction import Transaction
+from app.services.data_version_service import DataVersionService
+
+
+# Ledger codes
+LEDGER_CUSTOMER = "customer_deposits"
+LEDGER_CASH = "cash"
+LEDGER_TRANSFER_CLEARING = "transfer_clearing"
+LEDGER_ACH_CLEARING = "ach_clearing"
+LEDGER_INTEREST_EXPENSE = "interest_expense"
+
+CENT = Decimal("0.01")
+
+# (ledger_code, account_id or None, signed amount)
+PostingLine = Tuple[str, Optional[int], Decimal]
+
+
+def to_money(value) -> Decimal:
+    """Normalize a database sum (Decimal or float on SQLite) to cents."""
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+class LedgerService:
+    """Double-entry ledger service."""
+
+    @staticmethod
+    def _insert_entry(
+        db: Session,
+        entry_type: str,
+        lines: Sequence[PostingLine],
+        description: Optional[str] = None
+    ) -> JournalEntry:
+        """Insert a balanced journal entry and its postings without touching balances."""
+        if sum((amount for _, _, amount in lines), Decimal("0")) != 0:
+            raise TransactionError("Unbalanced journal entry")
+
+        entry = JournalEntry(
+            journal_id=str(uuid.uuid4()),
+            entry_type=entry_type,
+            description=description
+        )
+        db.add(entry)
+        db.flush()
+
+        db.execute(insert(Posting), [
+            {"journal_entry_id": entry.id, "ledger_code": code, "account_id": account_id, "amount": amount}
+            for code, account_id, amount in lines
+        ])
+        return entry
+
+    @staticmethod
+    def post_entry(
+        db: Session,
+        entry_type: str,
+        lines: Sequence[PostingLine],
+        description: Optional[str] = None
+    ) -> JournalEntry:
+        """
+        Record a journal entry and apply it to the balance projection.
+
+        Postings are appended; each affected account's cached balance is
+        adjusted with a single conditional UPDATE, so no balance is read
+        and written back. Does not commit; on error the caller must roll
+        back.
+
+        Args:
+            db: Database session
+            entry_type: Event type, e.g. 'deposit'
+            lines: (ledger_code, account_id, signed amount) per posting; must sum to zero
+            description: Optional description
+
+        Returns:
+            JournalEntry: Created entry
+
+        Raises:
+            TransactionError: If the postings do not balance
+            InsufficientFundsError: If an account balance would go negative
+        """
+        entry = LedgerService._insert_entry(db, entry_type, lines, description)
+
+        deltas: Dict[int, Decimal] = {}
+        for _, account_id, amount in lines:
+            if account_id is not None:
+                deltas[account_id] = deltas.get(account_id, Decimal("0")) + amount
+
+        for account_id, delta in deltas.items():
+            result = db.execute(
+                update(Account)
+                .where(Account.id == account_id, Account.balance + delta >= 0)
+                .values(balance=Account.balance + delta),
+                execution_options={"synchronize_session": "fetch"}
+            )
+            if result.rowcount != 1:
+                raise InsufficientFundsError()
+
+        return entry
+
+    @staticmethod
+    def find_unbalanced_entries(db: Session) -> List[int]:
+        """
+        Find journal entries whose postings do not sum to zero.
+
+        Args:
+            db: Database session
+
+        Returns:
+            List[int]: Journal entry IDs
+        """
+        rows = db.query(Posting.journal_entry_id, func.sum(Posting.amount)).group_by(
+            Posting.journal_entry_id
+        ).all()
+        return [entry_id for entry_id, total in rows if to_money(total) != 0]
+
+    @staticmethod
+    def find_balance_mismatches(db: Session) -> List[Dict]:
+        """
+        Compare each cached account balance with the sum of its postings.
+
+        Args:
+            db: Database session
+
+        Returns:
+            List[Dict]: account_id, account_number, cached and ledger balance per mismatch
+        """
+        rows = (
+            db.query(Account.id, Account.account_number, Account.balance, func.sum(Posting.amount))
+            .outerjoin(Posting, Posting.account_id == Account.id)
+            .group_by(Account.id)
+            .all()
+        )
+        return [
+            {"account_id": account_id, "account_number": number,
+             "cached": to_money(cached), "ledger": to_money(ledger)}
+            for account_id, number, cached, ledger in rows
+            if to_money(cached) != to_money(ledger)
+        ]
+
+    @staticmethod
+    def rebuild_projection(db: Session, apply: bool = False) -> List[Dict]:
+        """
+        Verify the balance projection and optionally rewrite it from postings.
+
+        Args:
+            db: Database session
+            apply: Overwrite mismatched cached balances with the ledger balance
+
+        Returns:
+            List[Dict]: Mismatches found (before any fix)
+        """
+        mismatches = LedgerService.find_balance_mismatches(db)
+        if apply and mismatches:
+            db.execute(update(Account), [
+                {"id": m["account_id"], "balance": m["ledger"]} for m in mismatches
+            ])
+            DataVersionService.bump_accounts(db, [m["account_id"] for m in mismatches])
+            db.commit()
+            logger.warning("Account balances rebuilt from ledger", extra={"accounts": len(mismatches)})
+        return mismatches
+
+    @staticmethod
+    def backfill(db: Session, batch_size: int = 1000) -> int:
+        """
+        Create journal entries for transactions recorded before the ledger.
+
+        Each legacy transaction becomes its own entry against cash
+        (deposits/withdrawals) or transfer clearing (transfers). The two
+        legs of an old internal transfer were never linked, so they are
+        backfilled as separate entries that net out in transfer clearing.
+        Balances are not touched; run ``rebuild_projection`` afterwards to
+        check them. Commits per batch and can be re-run.
+
+        Args:
+            db: Database session
+            batch_size: Transactions per batch
+
+        Returns:
+            int: Number of transactions backfilled
+        """
+        backfilled = 0
+        for model in (Transaction, ArchivedTransaction):
+            while True:
+                legacy = db.query(model).filter(model.journal_id.is_(None)).order_by(model.id).limit(batch_size).all()
+                if not legacy:
+                    break
+
+                entries, lines, links = [], [], []
+                for txn in legacy:
+                    incoming = txn.transaction_type == "deposit" or (
+                        txn.transaction_type == "transfer" and (txn.description or "").startswith("Transfer from ")
+                    )
+                    counterpart = LEDGER_CASH if txn.transaction_type != "transfer" else LEDGER_TRANSFER_CLEARING
+                    signed = txn.amount if incoming else -txn.amount
+                    journal_id = str(uuid.uuid4())
+                    entries.append({
+                        "journal_id": journal_id, "entry_type": txn.transaction_type,
+                        "description": txn.description, "created_at": txn.created_at, "updated_at": datetime.utcnow()
+                    })
+                    lines.append(((LEDGER_CUSTOMER, txn.account_id, signed), (counterpart, None, -signed)))
+                    links.append({"id": txn.id, "journal_id": journal_id, "direction": "credit" if incoming else "debit"})
+
+                entry_ids = db.scalars(
+                    insert(JournalEntry).returning(JournalEntry.id, sort_by_parameter_order=True), entries
+                ).all()
+                db.execute(insert(Posting), [
+                    {"journal_entry_id": entry_id, "ledger_code": code, "account_id": account_id, "amount": amount}
+                    for entry_id, pair in zip(entry_ids, lines)
+                    for code, account_id, amount in pair
+                ])
+                db.execute(update(model), links)
+                db.commit()
+                backfilled += len(legacy)
+
+        logger.info("Ledger backfill complete", extra={"transactions": backfilled})
+        return backfilled
@@ -0,0 +1,288 @@
+"""
+Transactional outbox: post-commit side effects delivered in the background.
+
+Services call ``OutboxService.enqueue`` inside the same database transaction
+as the change that causes the side effect, so the event exists if and only
+if the change committed. The dispatcher claims pending events in batches
+(with a lease, so several workers can run), calls the handlers registered
+for each event type and records the outcome. Delivery is at-least-once:
+failed events are retried with exponential backoff until
+``settings.outbox_max_attempts``, after which they are marked 'dead'.
+
+The dispatcher runs as an asyncio task inside the API process
+(``settings.outbox_dispatcher_enabled``) or standalone via
+``scripts/outbox_worker.py``.
+"""
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import delete, or_, update
+from sqlalchemy.orm import Session, sessionmaker
+from app.config import settings
+from app.core.logging_config import logger
+from app.models.outbox_event import OutboxEvent
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    """Event as seen by handlers. ``id`` is stable across redeliveries."""
+    id: int
+    event_type: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+Handler = Callable[[OutboxMessage], None]
+
+_handlers: Dict[str, List[Handler]] = {}
+
+
+def register_handler(event_type: str) -> Callable[[Handler], Handler]:
+    """
+    Decorator registering a handler for an event type.
+
+    Handlers run outside any request, after the producing transaction has
+    committed. They must be idempotent; raising marks the event for retry.
+
+    Args:
+        event_type: Event type, e.g. 'transaction.created'
+
+    Returns:
+        Decorator that registers and returns the handler
+    """
+    def decorator(handler: Handler) -> Handler:
+        _handlers.setdefault(event_type, []).append(handler)
+        return handler
+
+    return decorator
+
+
+def get_handlers(event_type: str) -> List[Handler]:
+    """
+    Get handlers registered for an event type.
+
+    Args:
+        event_type: Event type
+
+    Returns:
+        List[Handler]: Handlers, in registration order
+    """
+    return list(_handlers.get(event_type, ()))
+
+
+class OutboxService:
+    """Outbox persistence and delivery."""
+
+    @staticmethod
+    def enqueue(db: Session, event_type: str, payload: Dict[str, Any]) -> OutboxEvent:
+        """
+        Add an event to the outbox. Does not commit.
+
+        Args:
+            db: Database session (the producing transaction)
+            event_type: Event type
+            payload: JSON-serializable body (Decimals are stored as strings)
+
+        Returns:
+            OutboxEvent: Pending event
+        """
+        event = OutboxEvent(
+            event_type=event_type,
+            payload=json.dumps(payload, default=str),
+            status="pending",
+            attempts=0,
+            available_at=datetime.utcnow()
+        )
+        db.add(event)
+        return event
+
+    @staticmethod
+    def _claim(db: Session, batch_size: int) -> List[OutboxMessage]:
+        """Lease a batch of due events to this worker and commit the claim."""
+        now = datetime.utcnow()
+        token = str(uuid.uuid4())
+        claimable = (
+            OutboxEvent.status == "pending",
+            OutboxEvent.available_at <= now,
+            or_(OutboxEvent.locked_until.is_(None), OutboxEvent.locked_until < now),
+        )
+        due = (
+            db.query(OutboxEvent.id).filter(*claimable)
+            .order_by(OutboxEvent.available_at, OutboxEvent.id)
+            .limit(batch_size)
+        )
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(due.scalar_subquery()), *claimable)
+            .values(locked_by=token, locked_until=now + timedelta(seconds=settings.outbox_lease_seconds)),
+            execution_options={"synchronize_session": False}
+        )
+        rows = db.query(
+            OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.payload, OutboxEvent.attempts
+        ).filter(OutboxEvent.locked_by == token).order_by(OutboxEvent.id).all()
+        db.commit()
+        return [OutboxMessage(row.id, row.event_type, json.loads(row.payload), row.attempts) for row in rows]
+
+    @staticmethod
+    def _retry_delay(attempts: int) -> float:
+        """Backoff before the next attempt, in seconds."""
+        return min(settings.outbox_retry_max_seconds, settings.outbox_retry_base_seconds * 2 ** (attempts - 1))
+
+    @staticmethod
+    def dispatch_batch(db: Session, batch_size: Optional[int] = None) -> int:
+        """
+        Claim and deliver one batch of due events.
+
+        Args:
+            db: Database session (not shared with request handling)
+            batch_size: Events per batch (default: ``settings.outbox_batch_size``)
+
+        Returns:
+            int: Number of events claimed
+        """
+        messages = OutboxService._claim(db, batch_size or settings.outbox_batch_size)
+        if not messages:
+            return 0
+
+        delivered, failed = [], []
+        for message in messages:
+            try:
+                for handler in get_handlers(message.event_type):
+                    handler(message)
+                delivered.append(message.id)
+            except Exception as e:
+                failed.append((message, e))
+
+        now = datetime.utcnow()
+        release = {"locked_by": None, "locked_until": None}
+        if delivered:
+            db.execute(
+                update(OutboxEvent).where(OutboxEvent.id.in_(delivered))
+                .values(status="delivered", delivered_at=now, **release),
+                execution_options={"synchronize_session": False}
+            )
+        for message, error in failed:
+            attempts = message.attempts + 1
+            dead = attempts >= settings.outbox_max_attempts
+            db.execute(
+                update(OutboxEvent).where(OutboxEvent.id == message.id).values(
+                    status="dead" if dead else "pending",
+                    attempts=attempts,
+                    available_at=now + timedelta(seconds=OutboxService._retry_delay(attempts)),
+                    last_error=f"{type(error).__name__}: {error}"[:500],
+                    **release
+                ),
+                execution_options={"synchronize_session": False}
+            )
+            log = logger.error if dead else logger.warning
+            log(
+                "Outbox delivery failed",
+                extra={"event_id": message.id, "event_type": message.event_type,
+                       "attempts": attempts, "dead": dead, "error": str(error)}
+            )
+        db.commit()
+        return len(messages)
+
+    @staticmethod
+    def purge_delivered(db: Session, older_than: datetime) -> int:
+        """
+        Delete delivered events older than a cutoff.
+
+        Args:
+            db: Database session
+            older_than: Delivery time cutoff
+
+        Returns:
+            int: Number of events deleted
+        """
+        result = db.execute(
+            delete(OutboxEvent).where(OutboxEvent.status == "delivered", OutboxEvent.delivered_at < older_than),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+        return result.rowcount
+
+
+class OutboxDispatcher:
+    """Drains the outbox in a loop, as an asyncio task or a blocking worker."""
+
+    PURGE_INTERVAL_SECONDS = 600
+
+    def __init__(self, session_factory: Optional[sessionmaker] = None):
+        self._session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._last_purge = 0.0
+
+    def _sessions(self) -> sessionmaker:
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory
+
+    def drain_once(self) -> int:
+        """
+        Deliver one batch and purge old delivered events when due.
+
+        Returns:
+            int: Number of events claimed
+        """
+        db = self._sessions()()
+        try:
+            claimed = OutboxService.dispatch_batch(db)
+            if time.monotonic() - self._last_purge >= self.PURGE_INTERVAL_SECONDS:
+                self._last_purge = time.monotonic()
+                OutboxService.purge_delivered(
+                    db, datetime.utcnow() - timedelta(hours=settings.outbox_retention_hours)
+                )
+            return claimed
+        finally:
+            db.close()
+
+    def _safe_drain(self) -> int:
+        try:
+            return self.drain_once()
+        except Exception:
+            logger.exception("Outbox dispatch failed")
+            return 0
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            # Database work runs in a thread so the event loop keeps serving requests
+            claimed = await asyncio.to_thread(self._safe_drain)
+            if claimed < settings.outbox_batch_size:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=settings.outbox_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        """Start the dispatcher as a task on the running event loop."""
+        if self._task is not None:
+            return
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Outbox dispatcher started")
+
+    async def stop(self) -> None:
+        """Stop the dispatcher task after its current batch."""
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+        logger.info("Outbox dispatcher stopped")
+
+    def run_forever(self) -> None:
+        """Blocking loop for a standalone worker process."""
+        while True:
+            if self._safe_drain() < settings.outbox_batch_size:
+                time.sleep(settings.outbox_poll_interval_seconds)
+
+
+# Global dispatcher instance (started from the app lifespan)
+outbox_dispatcher = OutboxDispatcher()
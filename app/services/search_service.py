@@ -0,0 +1,237 @@
+"""
+Admin search over account holders, accounts and transactions.
+
+Backends return (kind, id, score) matches for one page; the service then
+loads the matching rows with one query per kind, keeping the backend's
+order. ``Fts5SearchBackend`` queries the SQLite FTS5 index kept in sync by
+triggers (``app.db.search_index``): every query term is a prefix, terms
+are ANDed, and results are ranked with bm25. When a query matches more
+than ``settings.admin_search_rank_limit`` rows, ranking them all would
+cost time proportional to the match count, so such queries are ordered
+newest first (FTS rowid order) instead. ``LikeSearchBackend`` works on any
+database with plain substring LIKE queries; it scans, so it is meant for
+small deployments or as the base for a native full-text backend.
+"""
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.db.search_index import (
+    KIND_ACCOUNT, KIND_ARCHIVED_TRANSACTION, KIND_HOLDER, KIND_STRIDE, KIND_TRANSACTION, SEARCH_TABLE
+)
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.archived_transaction import ArchivedTransaction
+from app.models.transaction import Transaction
+from app.schemas.search import SearchHit, SearchResults
+
+
+# (kind code, source id, score)
+Match = Tuple[int, int, Optional[float]]
+
+# Public kind name -> index kind codes
+KIND_CODES = {
+    "holder": (KIND_HOLDER,),
+    "account": (KIND_ACCOUNT,),
+    "transaction": (KIND_TRANSACTION, KIND_ARCHIVED_TRANSACTION),
+}
+KIND_NAMES = {code: name for name, codes in KIND_CODES.items() for code in codes}
+
+# FTS columns searched per kind, and their bm25 weights (holder and account hits outrank descriptions)
+_FTS_COLUMNS = {"holder": "name email", "account": "account_number", "transaction": "description"}
+_BM25 = f"bm25({SEARCH_TABLE}, 5.0, 5.0, 5.0, 1.0)"
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    Split a search query into lowercase terms (letters and digits only).
+
+    Args:
+        query: Raw query text
+
+    Returns:
+        List[str]: Terms, possibly empty
+    """
+    return re.findall(r"\w+", query.lower())
+
+
+class SearchBackend(ABC):
+    """Finds matches for one page of admin search results."""
+
+    @abstractmethod
+    def search(self, db: Session, terms: List[str], kind: Optional[str], offset: int, limit: int) -> Tuple[List[Match], bool]:
+        """
+        Find matches in result order.
+
+        Args:
+            db: Database session
+            terms: Query terms (non-empty)
+            kind: Restrict to one kind, or None for all
+            offset: Matches to skip
+            limit: Maximum matches to return
+
+        Returns:
+            Tuple[List[Match], bool]: Matches, and whether they are ordered by relevance
+        """
+
+
+class Fts5SearchBackend(SearchBackend):
+    """SQLite FTS5 index with prefix terms and bm25 ranking."""
+
+    def search(self, db: Session, terms: List[str], kind: Optional[str], offset: int, limit: int) -> Tuple[List[Match], bool]:
+        expression = " ".join(f'"{term}"*' for term in terms)
+        if kind:
+            expression = f"{{{_FTS_COLUMNS[kind]}}} : ({expression})"
+        params = {"match": expression, "limit": limit, "offset": offset}
+
+        # Counting stops at the limit, so broad queries cost at most rank_limit index steps here
+        rank_limit = settings.admin_search_rank_limit
+        matched = db.execute(text(
+            f"SELECT count(*) FROM (SELECT 1 FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match LIMIT :cap)"
+        ), {"match": expression, "cap": rank_limit}).scalar()
+        ranked = matched < rank_limit
+
+        score, order = (_BM25, _BM25) if ranked else ("NULL", "rowid DESC")
+        rows = db.execute(text(
+            f"SELECT rowid, {score} FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH :match ORDER BY {order} LIMIT :limit OFFSET :offset"
+        ), params).all()
+        return [(rowid % KIND_STRIDE, rowid // KIND_STRIDE, score) for rowid, score in rows], ranked
+
+
+class LikeSearchBackend(SearchBackend):
+    """Substring LIKE queries, usable on any database (scans; no ranking)."""
+
+    def search(self, db: Session, terms: List[str], kind: Optional[str], offset: int, limit: int) -> Tuple[List[Match], bool]:
+        pattern = "%" + "%".join(terms) + "%"
+        sources = {
+            KIND_HOLDER: (AccountHolder.id, [AccountHolder.name, AccountHolder.email]),
+            KIND_ACCOUNT: (Account.id, [Account.account_number]),
+            KIND_TRANSACTION: (Transaction.id, [Transaction.description]),
+            KIND_ARCHIVED_TRANSACTION: (ArchivedTransaction.id, [ArchivedTransaction.description]),
+        }
+        codes = KIND_CODES[kind] if kind else tuple(sources)
+
+        # Kinds in a fixed order, newest first within each; stop once the page is covered
+        matches: List[Match] = []
+        for code in codes:
+            id_column, columns = sources[code]
+            needed = offset + limit - len(matches)
+            if needed <= 0:
+                break
+            ids = db.scalars(
+                select(id_column).where(or_(*(column.ilike(pattern) for column in columns)))
+                .order_by(id_column.desc()).limit(needed)
+            )
+            matches.extend((code, row_id, None) for row_id in ids)
+        return matches[offset:offset + limit], False
+
+
+_BACKENDS: Dict[str, SearchBackend] = {"fts5": Fts5SearchBackend(), "like": LikeSearchBackend()}
+
+
+def get_search_backend(db: Session) -> SearchBackend:
+    """
+    Get the backend selected by ``settings.admin_search_backend``.
+
+    ``auto`` uses FTS5 on SQLite and LIKE elsewhere.
+
+    Args:
+        db: Database session
+
+    Returns:
+        SearchBackend: Search backend
+    """
+    name = settings.admin_search_backend
+    if name == "auto":
+        name = "fts5" if db.get_bind().dialect.name == "sqlite" else "like"
+    if name not in _BACKENDS:
+        raise ValueError(f"Invalid admin_search_backend '{name}', expected one of {sorted(_BACKENDS)} or 'auto'")
+    return _BACKENDS[name]
+
+
+class SearchService:
+    """Admin search service."""
+
+    @staticmethod
+    def _load_hits(db: Session, matches: List[Match]) -> List[SearchHit]:
+        """Load the rows behind the matches (one query per kind), in match order."""
+        ids: Dict[int, List[int]] = {}
+        for code, row_id, _ in matches:
+            ids.setdefault(code, []).append(row_id)
+
+        loaded: Dict[Tuple[int, int], dict] = {}
+        if KIND_HOLDER in ids:
+            for row in db.execute(
+                select(AccountHolder.id, AccountHolder.name, AccountHolder.email, AccountHolder.created_at)
+                .where(AccountHolder.id.in_(ids[KIND_HOLDER]))
+            ):
+                loaded[KIND_HOLDER, row.id] = {
+                    "holder_id": row.id, "title": row.name, "detail": row.email, "created_at": row.created_at
+                }
+        if KIND_ACCOUNT in ids:
+            for row in db.execute(
+                select(Account.id, Account.account_number, Account.account_type,
+                       Account.account_holder_id, Account.created_at)
+                .where(Account.id.in_(ids[KIND_ACCOUNT]))
+            ):
+                loaded[KIND_ACCOUNT, row.id] = {
+                    "holder_id": row.account_holder_id, "title": row.account_number,
+                    "detail": f"{row.account_type} account", "created_at": row.created_at
+                }
+        for code, model in ((KIND_TRANSACTION, Transaction), (KIND_ARCHIVED_TRANSACTION, ArchivedTransaction)):
+            if code not in ids:
+                continue
+            for row in db.execute(
+                select(model.id, model.description, model.transaction_type, model.amount, model.created_at,
+                       Account.account_number, Account.account_holder_id)
+                .join(Account, Account.id == model.account_id)
+                .where(model.id.in_(ids[code]))
+            ):
+                loaded[code, row.id] = {
+                    "holder_id": row.account_holder_id, "title": row.description or "",
+                    "detail": f"{row.transaction_type} {row.amount} on account {row.account_number}",
+                    "created_at": row.created_at
+                }
+
+        # Rows deleted since the index was read are skipped
+        return [
+            SearchHit(kind=KIND_NAMES[code], id=row_id, score=score, **loaded[code, row_id])
+            for code, row_id, score in matches if (code, row_id) in loaded
+        ]
+
+    @staticmethod
+    def search(
+        db: Session,
+        query: str,
+        kind: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> SearchResults:
+        """
+        Search holders (name, email), accounts (number) and transactions (description).
+
+        Args:
+            db: Database session
+            query: Search text; every word is matched as a prefix
+            kind: Restrict to 'holder', 'account' or 'transaction'
+            page: 1-based page number
+            page_size: Results per page
+
+        Returns:
+            SearchResults: One page of results
+        """
+        terms = search_terms(query)
+        matches, ranked = [], False
+        if terms:
+            # One extra match tells whether another page exists
+            matches, ranked = get_search_backend(db).search(
+                db, terms, kind, (page - 1) * page_size, page_size + 1
+            )
+        return SearchResults(
+            query=query, kind=kind, page=page, page_size=page_size, ranked=ranked,
+            has_more=len(matches) > page_size,
+            results=SearchService._load_hits(db, matches[:page_size])
+        )
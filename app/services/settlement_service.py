@@ -0,0 +1,336 @@
+"""
+ACH settlement service for outbound external transfers.
+
+External transfers are queued as 'pending' AchTransfer rows in the same
+database transaction that debits the source account. A settlement cycle
+claims every pending transfer with one set-based UPDATE (tagging them with
+a new ``batch_id``), then streams them in keyset-paginated chunks ordered
+by destination routing number into a fixed-width NACHA file, one NACHA
+batch per routing number. Memory use is bounded by the chunk size, not by
+the number of pending transfers.
+
+File generation is deterministic for a given ``batch_id``, so a cycle that
+died after claiming is completed by the next run. Settlement and returns
+are applied when the ACH operator confirms them.
+"""
+import os
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, tuple_, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.sqlite_tuning import retry_on_busy
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.ach_transfer import AchTransfer
+from app.models.transaction import Transaction
+from app.services.data_version_service import DataVersionService
+from app.services.ledger_service import (
+    LedgerService, LEDGER_ACH_CLEARING, LEDGER_CASH, LEDGER_CUSTOMER, to_money
+)
+from app.utils import nacha
+
+
+class SettlementService:
+    """Outbound ACH settlement service."""
+
+    @staticmethod
+    def queue_transfer(db: Session, transaction: Transaction) -> AchTransfer:
+        """
+        Queue an external transfer for settlement. Does not commit.
+
+        Args:
+            db: Database session (the transfer's transaction)
+            transaction: Outgoing transfer transaction
+
+        Returns:
+            AchTransfer: Pending ACH transfer
+        """
+        ach_transfer = AchTransfer(
+            transaction_id=transaction.transaction_id,
+            account_id=transaction.account_id,
+            to_routing_number=transaction.peer_routing_number,
+            to_account_number=transaction.peer_account_number,
+            amount=transaction.amount,
+            status="pending"
+        )
+        db.add(ach_transfer)
+        return ach_transfer
+
+    @staticmethod
+    def file_path(batch_id: str, output_dir: Optional[str] = None) -> Path:
+        """
+        Path of the NACHA file for a settlement batch.
+
+        Args:
+            batch_id: Settlement batch ID
+            output_dir: Directory (default: ``settings.ach_output_dir``)
+
+        Returns:
+            Path: File path
+        """
+        return Path(output_dir or settings.ach_output_dir) / f"{batch_id}.ach"
+
+    @staticmethod
+    @retry_on_busy
+    def _claim(db: Session, batch_id: str) -> int:
+        """Move every pending transfer into a new batch."""
+        result = db.execute(
+            update(AchTransfer).where(AchTransfer.status == "pending")
+            .values(status="batched", batch_id=batch_id, updated_at=datetime.utcnow()),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def run_cycle(
+        db: Session,
+        output_dir: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Run one settlement cycle.
+
+        Finishes files for batches claimed by an interrupted cycle, then
+        claims all pending transfers into a new batch and writes its file.
+
+        Args:
+            db: Database session
+            output_dir: Directory for NACHA files (default: ``settings.ach_output_dir``)
+            chunk_size: Transfers fetched per query (default: ``settings.ach_chunk_size``)
+            now: File creation/effective time (default: now)
+
+        Returns:
+            List[Dict]: Summary per file written
+        """
+        now = now or datetime.utcnow()
+        summaries = []
+
+        unwritten = [
+            batch_id for (batch_id,) in db.query(AchTransfer.batch_id).filter(
+                AchTransfer.status == "batched"
+            ).distinct()
+            if not SettlementService.file_path(batch_id, output_dir).exists()
+        ]
+        for batch_id in unwritten:
+            logger.warning("Completing interrupted ACH batch", extra={"batch_id": batch_id})
+            summaries.append(SettlementService.write_file(db, batch_id, output_dir, chunk_size, now))
+
+        batch_id = f"{now:%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+        if SettlementService._claim(db, batch_id):
+            summaries.append(SettlementService.write_file(db, batch_id, output_dir, chunk_size, now))
+        return summaries
+
+    @staticmethod
+    def write_file(
+        db: Session,
+        batch_id: str,
+        output_dir: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Stream a claimed batch to a NACHA file and assign trace numbers.
+
+        The file is written under a temporary name and renamed when
+        complete. Trace numbers are saved chunk by chunk.
+
+        Args:
+            db: Database session
+            batch_id: Settlement batch ID
+            output_dir: Directory for NACHA files
+            chunk_size: Transfers fetched per query
+            now: File creation/effective time
+
+        Returns:
+            Dict: batch_id, path, batches, entries, total and duration_ms
+        """
+        now = now or datetime.utcnow()
+        chunk_size = chunk_size or settings.ach_chunk_size
+        path = SettlementService.file_path(batch_id, output_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+
+        odfi = settings.routing_number
+        company_id = settings.ach_company_id
+        started = time.perf_counter()
+
+        records = entries = batches = file_hash = file_cents = 0
+        batch_entries = batch_hash = batch_cents = 0
+        current_routing = None
+        last_key = ("", 0)
+
+        with open(partial, "w", newline="\n", buffering=1 << 20) as f:
+            def write(record: str) -> None:
+                nonlocal records
+                f.write(record)
+                f.write("\n")
+                records += 1
+
+            def close_batch() -> None:
+                write(nacha.batch_control(batch_entries, batch_hash, batch_cents, company_id, odfi, batches))
+
+            write(nacha.file_header(
+                settings.ach_immediate_destination or settings.routing_number, odfi,
+                settings.ach_immediate_destination_name, settings.ach_company_name, now
+            ))
+
+            while True:
+                rows = (
+                    db.query(
+                        AchTransfer.id, AchTransfer.to_routing_number, AchTransfer.to_account_number,
+                        AchTransfer.amount, AccountHolder.name
+                    )
+                    .join(Account, Account.id == AchTransfer.account_id)
+                    .join(AccountHolder, AccountHolder.id == Account.account_holder_id)
+                    .filter(
+                        AchTransfer.batch_id == batch_id,
+                        tuple_(AchTransfer.to_routing_number, AchTransfer.id) > tuple_(*last_key)
+                    )
+                    .order_by(AchTransfer.to_routing_number, AchTransfer.id)
+                    .limit(chunk_size)
+                    .all()
+                )
+                if not rows:
+                    break
+
+                traces = []
+                for row in rows:
+                    if row.to_routing_number != current_routing:
+                        if current_routing is not None:
+                            close_batch()
+                        current_routing = row.to_routing_number
+                        batches += 1
+                        batch_entries = batch_hash = batch_cents = 0
+                        write(nacha.batch_header(
+                            settings.ach_company_name, company_id, "TRANSFER", now, odfi, batches
+                        ))
+
+                    entries += 1
+                    trace_number = f"{odfi[:8]}{entries:07d}"
+                    cents = nacha.to_cents(row.amount)
+                    entry_hash = nacha.entry_hash(row.to_routing_number)
+                    write(nacha.entry_detail(
+                        row.to_routing_number, row.to_account_number, cents,
+                        str(row.id), row.name, trace_number
+                    ))
+                    batch_entries += 1
+                    batch_hash += entry_hash
+                    batch_cents += cents
+                    file_hash += entry_hash
+                    file_cents += cents
+                    traces.append({"id": row.id, "trace_number": trace_number})
+
+                db.execute(update(AchTransfer), traces)
+                db.commit()
+                last_key = (rows[-1].to_routing_number, rows[-1].id)
+
+            if current_routing is not None:
+                close_batch()
+            write(nacha.file_control(batches, records + 1, entries, file_hash, file_cents))
+            for _ in range(nacha.padding_records(records)):
+                f.write(nacha.PADDING_RECORD + "\n")
+
+        os.replace(partial, path)
+
+        summary = {
+            "batch_id": batch_id,
+            "path": str(path),
+            "batches": batches,
+            "entries": entries,
+            "total": to_money(Decimal(file_cents).scaleb(-2)),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        logger.info("ACH file written", extra=summary)
+        return summary
+
+    @staticmethod
+    @retry_on_busy
+    def settle(db: Session, batch_id: str) -> int:
+        """
+        Mark a batch settled and move its funds from ACH clearing to cash.
+
+        Args:
+            db: Database session
+            batch_id: Settlement batch ID
+
+        Returns:
+            int: Number of transfers settled
+        """
+        in_batch = (AchTransfer.batch_id == batch_id, AchTransfer.status == "batched")
+        total = to_money(db.query(func.sum(AchTransfer.amount)).filter(*in_batch).scalar())
+        result = db.execute(
+            update(AchTransfer).where(*in_batch)
+            .values(status="settled", settled_at=datetime.utcnow(), updated_at=datetime.utcnow()),
+            execution_options={"synchronize_session": False}
+        )
+        if result.rowcount:
+            LedgerService.post_entry(db, "ach_settlement", [
+                (LEDGER_ACH_CLEARING, None, -total),
+                (LEDGER_CASH, None, total),
+            ], f"ACH batch {batch_id}")
+        db.commit()
+
+        logger.info("ACH batch settled", extra={"batch_id": batch_id, "transfers": result.rowcount, "total": str(total)})
+        return result.rowcount
+
+    @staticmethod
+    @retry_on_busy
+    def process_returns(db: Session, batch_id: str, returns: Iterable[Tuple[str, str]]) -> int:
+        """
+        Apply returned entries: mark them returned and credit the source account.
+
+        Args:
+            db: Database session
+            batch_id: Settlement batch the entries belong to
+            returns: (trace_number, return_code) pairs, e.g. ("123456780000042", "R03")
+
+        Returns:
+            int: Number of transfers returned
+        """
+        returned = 0
+        credited = set()
+        now = datetime.utcnow()
+        for trace_number, return_code in returns:
+            ach_transfer = db.query(AchTransfer).filter(
+                AchTransfer.batch_id == batch_id,
+                AchTransfer.trace_number == trace_number,
+                AchTransfer.status == "settled"
+            ).first()
+            if not ach_transfer:
+                logger.warning("Unknown or unsettled ACH return", extra={"batch_id": batch_id, "trace_number": trace_number})
+                continue
+
+            ach_transfer.status = "returned"
+            ach_transfer.return_code = return_code
+            ach_transfer.returned_at = now
+
+            journal = LedgerService.post_entry(db, "ach_return", [
+                (LEDGER_CASH, None, -ach_transfer.amount),
+                (LEDGER_CUSTOMER, ach_transfer.account_id, ach_transfer.amount),
+            ], f"ACH return {return_code}")
+            db.add(Transaction(
+                transaction_id=str(uuid.uuid4()),
+                account_id=ach_transfer.account_id,
+                transaction_type="transfer",
+                amount=ach_transfer.amount,
+                peer_routing_number=ach_transfer.to_routing_number,
+                peer_account_number=ach_transfer.to_account_number,
+                description=f"ACH return {return_code} of transfer {ach_transfer.transaction_id}",
+                journal_id=journal.journal_id,
+                direction="credit"
+            ))
+            credited.add(ach_transfer.account_id)
+            returned += 1
+
+        DataVersionService.bump_accounts(db, credited)
+        db.commit()
+        logger.info("ACH returns processed", extra={"batch_id": batch_id, "returned": returned})
+        return returned
@@ -1,11 +1,28 @@
 """
 Statement service for generating account statements.
+
+Rolling statements (the last N days) and the open calendar month are
+computed live from transactions. Closed months can never change, so
+``scripts/materialize_statements.py`` renders them once into
+``monthly_statements`` as gzip-compressed JSON, and requests for a closed
+month are served from there.
 """
+import gzip
 from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
+from app.core.exceptions import ValidationError
+from app.db.sqlite_tuning import retry_on_busy
 from app.models.account import Account
+from app.models.journal_entry import JournalEntry
+from app.models.monthly_statement import MonthlyStatement
+from app.models.posting import Posting
 from app.models.transaction import Transaction
 from app.schemas.statement import Statement, AccountStatement, StatementTransaction
+from app.services.archive_service import ArchiveService
+from app.services.ledger_service import LEDGER_CUSTOMER, to_money
 
 
 class StatementService:
@@ -21,16 +38,41 @@ class StatementService:
             user_id: Account holder ID
             days: Number of days to include (default: 30)
 
+        Returns:
+            Statement: Complete statement
+        """
+        period_end = datetime.utcnow()
+        return StatementService.build_statement(db, user_id, period_end - timedelta(days=days), period_end)
+
+    @staticmethod
+    def build_statement(
+        db: Session,
+        user_id: int,
+        period_start: datetime,
+        period_end: datetime,
+        closing_balances: Optional[Dict[int, Decimal]] = None
+    ) -> Statement:
+        """
+        Generate a statement for a period from transactions.
+
+        Args:
+            db: Database session
+            user_id: Account holder ID
+            period_start: Inclusive start
+            period_end: Exclusive end
+            closing_balances: Balance per account ID at ``period_end``
+                (default: the current balances, for periods ending now)
+
         Returns:
             Statement: Complete statement
         """
         # Get all accounts for user
         accounts = db.query(Account).filter(
-            Account.account_holder_id == user_id
+            Account.account_holder_id == user_id,
+            Account.created_at < period_end
         ).all()
 
-        period_start = datetime.utcnow() - timedelta(days=days)
-        period_end = datetime.utcnow()
+        include_archive = ArchiveService.needs_archive(db, period_start)
 
         account_statements = []
         total_transactions = 0
@@ -39,8 +81,11 @@ class StatementService:
             # Get transactions for this account in the period
             transactions = db.query(Transaction).filter(
                 Transaction.account_id == account.id,
-                Transaction.created_at >= period_start
+                Transaction.created_at >= period_start,
+                Transaction.created_at < period_end
             ).order_by(Transaction.created_at.desc()).all()
+            if include_archive:
+                transactions += ArchiveService.get_archived_transactions(db, [account.id], period_start, period_end)
 
             # Convert to statement transactions
             statement_transactions = [
@@ -48,6 +93,7 @@ class StatementService:
                     transaction_id=t.transaction_id,
                     transaction_type=t.transaction_type,
                     amount=t.amount,
+                    direction=t.direction,
                     description=t.description,
                     created_at=t.created_at
                 )
@@ -58,7 +104,7 @@ class StatementService:
                 account_id=account.id,
                 account_number=account.account_number,
                 account_type=account.account_type,
-                balance=account.balance,
+                balance=account.balance if closing_balances is None else closing_balances.get(account.id, Decimal("0.00")),
                 transactions=statement_transactions
             ))
 
@@ -70,3 +116,186 @@ class StatementService:
             accounts=account_statements,
             total_transactions=total_transactions
         )
+
+    @staticmethod
+    def month_bounds(month: str) -> Tuple[datetime, datetime]:
+        """
+        Get the UTC bounds of a calendar month.
+
+        Args:
+            month: Month as ``YYYY-MM``
+
+        Returns:
+            Tuple[datetime, datetime]: Inclusive start and exclusive end
+
+        Raises:
+            ValidationError: If the month is malformed
+        """
+        try:
+            start = datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            raise ValidationError("Month must be in YYYY-MM format")
+        end = (start + timedelta(days=32)).replace(day=1)
+        return start, end
+
+    @staticmethod
+    def open_period_start(now: Optional[datetime] = None) -> datetime:
+        """
+        Get the start of the open (current) statement month.
+
+        Months ending at or before this are closed.
+
+        Args:
+            now: Reference time (default: now, UTC)
+
+        Returns:
+            datetime: First instant of the current month
+        """
+        now = now or datetime.utcnow()
+        return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def closing_balances(db: Session, account_ids: List[int], before: datetime) -> Dict[int, Decimal]:
+        """
+        Get account balances as of a point in time from the ledger.
+
+        Args:
+            db: Database session
+            account_ids: Account IDs
+            before: Exclusive cutoff on journal entry time
+
+        Returns:
+            Dict[int, Decimal]: Balance per account ID (accounts without postings are omitted)
+        """
+        if not account_ids:
+            return {}
+        rows = db.execute(
+            select(Posting.account_id, func.sum(Posting.amount))
+            .join(JournalEntry, JournalEntry.id == Posting.journal_entry_id)
+            .where(
+                Posting.ledger_code == LEDGER_CUSTOMER,
+                Posting.account_id.in_(account_ids),
+                JournalEntry.created_at < before
+            )
+            .group_by(Posting.account_id)
+        ).all()
+        return {account_id: to_money(total) for account_id, total in rows}
+
+    @staticmethod
+    def get_month_statement(db: Session, user_id: int, month: str) -> Statement:
+        """
+        Compute a calendar-month statement live.
+
+        The open month runs up to now with current balances; a closed
+        month uses balances reconstructed from the ledger at month end.
+
+        Args:
+            db: Database session
+            user_id: Account holder ID
+            month: Month as ``YYYY-MM``
+
+        Returns:
+            Statement: Complete statement
+
+        Raises:
+            ValidationError: If the month is malformed or has not started
+        """
+        period_start, period_end = StatementService.month_bounds(month)
+        now = datetime.utcnow()
+        if period_start > now:
+            raise ValidationError("Statement period has not started")
+        if period_end > StatementService.open_period_start(now):
+            return StatementService.build_statement(db, user_id, period_start, now)
+
+        account_ids = list(db.scalars(select(Account.id).where(Account.account_holder_id == user_id)))
+        balances = StatementService.closing_balances(db, account_ids, period_end)
+        return StatementService.build_statement(db, user_id, period_start, period_end, balances)
+
+    @staticmethod
+    def is_closed(month: str, now: Optional[datetime] = None) -> bool:
+        """
+        Check whether a month is closed (ended before the current month).
+
+        Args:
+            month: Month as ``YYYY-MM``
+            now: Reference time (default: now, UTC)
+
+        Returns:
+            bool: True if the month can no longer change
+        """
+        return StatementService.month_bounds(month)[1] <= StatementService.open_period_start(now)
+
+    @staticmethod
+    def get_stored_statement(db: Session, user_id: int, month: str) -> Optional[bytes]:
+        """
+        Get a materialized closed-month statement.
+
+        Args:
+            db: Database session
+            user_id: Account holder ID
+            month: Month as ``YYYY-MM``
+
+        Returns:
+            Optional[bytes]: gzip-compressed JSON statement, or None if not materialized
+        """
+        return db.execute(
+            select(MonthlyStatement.content).where(
+                MonthlyStatement.account_holder_id == user_id,
+                MonthlyStatement.month == month
+            )
+        ).scalar()
+
+    @staticmethod
+    @retry_on_busy
+    def materialize_month(db: Session, user_ids: List[int], month: str) -> int:
+        """
+        Render and store a closed month's statement for account holders.
+
+        Holders that already have the month stored, or had no account
+        during it, are skipped, so the job can be re-run. Commits once for
+        the whole batch.
+
+        Args:
+            db: Database session
+            user_ids: Account holder IDs
+            month: Closed month as ``YYYY-MM``
+
+        Returns:
+            int: Number of statements stored
+
+        Raises:
+            ValidationError: If the month is not closed
+        """
+        if not StatementService.is_closed(month):
+            raise ValidationError(f"Month {month} is still open")
+        period_start, period_end = StatementService.month_bounds(month)
+
+        stored = set(db.scalars(select(MonthlyStatement.account_holder_id).where(
+            MonthlyStatement.month == month, MonthlyStatement.account_holder_id.in_(user_ids)
+        )))
+        accounts: Dict[int, List[int]] = {}
+        for account_id, holder_id in db.execute(
+            select(Account.id, Account.account_holder_id).where(
+                Account.account_holder_id.in_([uid for uid in user_ids if uid not in stored]),
+                Account.created_at < period_end
+            )
+        ):
+            accounts.setdefault(holder_id, []).append(account_id)
+        if not accounts:
+            return 0
+
+        balances = StatementService.closing_balances(
+            db, [account_id for ids in accounts.values() for account_id in ids], period_end
+        )
+        rows = []
+        for holder_id in sorted(accounts):
+            statement = StatementService.build_statement(db, holder_id, period_start, period_end, balances)
+            rows.append({
+                "account_holder_id": holder_id,
+                "month": month,
+                "transaction_count": statement.total_transactions,
+                "content": gzip.compress(statement.model_dump_json().encode(), mtime=0),
+            })
+        db.execute(insert(MonthlyStatement), rows)
+        db.commit()
+        return len(rows)
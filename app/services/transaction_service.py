@@ -5,19 +5,44 @@ import uuid
 from decimal import Decimal
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from app.models.transaction import Transaction
 from app.models.account import Account
+from app.models.archived_transaction import ArchivedTransaction
 from app.schemas.transaction import DepositRequest, WithdrawalRequest, TransferRequest
 from app.core.exceptions import InsufficientFundsError, AccountNotFoundError, UnauthorizedError
 from app.config import settings
 from app.core.logging_config import logger
+from app.db.sqlite_tuning import retry_on_busy
+from app.services.archive_service import ArchiveService
+from app.services.data_version_service import DataVersionService
+from app.services.ledger_service import (
+    LedgerService, LEDGER_ACH_CLEARING, LEDGER_CASH, LEDGER_CUSTOMER, LEDGER_TRANSFER_CLEARING
+)
+from app.services.outbox_service import OutboxMessage, OutboxService, register_handler
+from app.services.settlement_service import SettlementService
+from app.services.velocity_service import VelocityService, payee_key
 
 
 class TransactionService:
     """Transaction processing service."""
 
     @staticmethod
+    def _enqueue_created(db: Session, transaction: Transaction, account_number: str) -> None:
+        """Record a 'transaction.created' outbox event in the current transaction."""
+        OutboxService.enqueue(db, "transaction.created", {
+            "transaction_id": transaction.transaction_id,
+            "journal_id": transaction.journal_id,
+            "transaction_type": transaction.transaction_type,
+            "account_id": transaction.account_id,
+            "account_number": account_number,
+            "amount": transaction.amount,
+            "peer_routing_number": transaction.peer_routing_number,
+            "peer_account_number": transaction.peer_account_number,
+        })
+
+    @staticmethod
+    @retry_on_busy
     def create_deposit(db: Session, user_id: int, request: DepositRequest) -> Transaction:
         """
         Create a deposit transaction.
@@ -41,26 +66,33 @@ class TransactionService:
         if account.account_holder_id != user_id:
             raise UnauthorizedError("Access denied to this account")
 
+        # Record the ledger entry (also updates the cached balance)
+        journal = LedgerService.post_entry(db, "deposit", [
+            (LEDGER_CUSTOMER, account.id, request.amount),
+            (LEDGER_CASH, None, -request.amount),
+        ], request.description)
+
         # Create transaction
         transaction = Transaction(
             transaction_id=str(uuid.uuid4()),
             account_id=request.account_id,
             transaction_type="deposit",
             amount=request.amount,
-            description=request.description
+            description=request.description,
+            journal_id=journal.journal_id,
+            direction="credit"
         )
 
-        # Update account balance
-        account.balance += request.amount
-
         db.add(transaction)
+        TransactionService._enqueue_created(db, transaction, account.account_number)
+        DataVersionService.bump(db, user_id)
         db.commit()
         db.refresh(transaction)
 
-        logger.info(f"Deposit: ${request.amount} to account {account.account_number}")
         return transaction
 
     @staticmethod
+    @retry_on_busy
     def create_withdrawal(db: Session, user_id: int, request: WithdrawalRequest) -> Transaction:
         """
         Create a withdrawal transaction.
@@ -77,6 +109,7 @@ class TransactionService:
             AccountNotFoundError: If account doesn't exist
             UnauthorizedError: If user doesn't own the account
             InsufficientFundsError: If insufficient balance
+            VelocityLimitError: If a velocity rule blocks the withdrawal
         """
         # Verify account ownership
         account = db.query(Account).filter(Account.id == request.account_id).first()
@@ -90,27 +123,39 @@ class TransactionService:
             raise InsufficientFundsError(
                 f"Insufficient funds. Balance: ${account.balance}, Requested: ${request.amount}"
             )
+        reservation = VelocityService.reserve(db, account.id, request.amount)
+        try:
+            # Record the ledger entry (also updates the cached balance)
+            journal = LedgerService.post_entry(db, "withdrawal", [
+                (LEDGER_CUSTOMER, account.id, -request.amount),
+                (LEDGER_CASH, None, request.amount),
+            ], request.description)
+
+            # Create transaction
+            transaction = Transaction(
+                transaction_id=str(uuid.uuid4()),
+                account_id=request.account_id,
+                transaction_type="withdrawal",
+                amount=request.amount,
+                description=request.description,
+                journal_id=journal.journal_id,
+                direction="debit"
+            )
 
-        # Create transaction
-        transaction = Transaction(
-            transaction_id=str(uuid.uuid4()),
-            account_id=request.account_id,
-            transaction_type="withdrawal",
-            amount=request.amount,
-            description=request.description
-        )
-
-        # Update account balance
-        account.balance -= request.amount
-
-        db.add(transaction)
-        db.commit()
+            db.add(transaction)
+            TransactionService._enqueue_created(db, transaction, account.account_number)
+            DataVersionService.bump(db, user_id)
+            db.commit()
+        except Exception:
+            VelocityService.release(reservation)  # not committed, so it must not count
+            raise
+        VelocityService.confirm(reservation)
         db.refresh(transaction)
 
-        logger.info(f"Withdrawal: ${request.amount} from account {account.account_number}")
         return transaction
 
     @staticmethod
+    @retry_on_busy
     def create_transfer(db: Session, user_id: int, request: TransferRequest) -> Transaction:
         """
         Create a transfer transaction.
@@ -122,6 +167,9 @@ class TransactionService:
 
         Returns:
             Transaction: Created transaction
+
+        Raises:
+            VelocityLimitError: If a velocity rule blocks the transfer
         """
         # Get source account
         from_account = db.query(Account).filter(Account.id == request.from_account_id).first()
@@ -133,72 +181,128 @@ class TransactionService:
         # Check sufficient funds
         if from_account.balance < request.amount:
             raise InsufficientFundsError()
+        payee = payee_key(request.to_routing_number, request.to_account_number)
+        reservation = VelocityService.reserve(db, from_account.id, request.amount, payee)
+        try:
+            # If internal transfer (same routing number), credit destination
+            to_account = None
+            if request.to_routing_number == settings.routing_number:
+                to_account = db.query(Account).filter(
+                    Account.account_number == request.to_account_number
+                ).first()
 
-        # Create outgoing transaction
-        transaction = Transaction(
-            transaction_id=str(uuid.uuid4()),
-            account_id=request.from_account_id,
-            transaction_type="transfer",
-            amount=request.amount,
-            peer_routing_number=request.to_routing_number,
-            peer_account_number=request.to_account_number,
-            description=request.description
-        )
-
-        # Deduct from source
-        from_account.balance -= request.amount
-
-        # If internal transfer (same routing number), credit destination
-        if request.to_routing_number == settings.routing_number:
-            to_account = db.query(Account).filter(
-                Account.account_number == request.to_account_number
-            ).first()
+            if to_account:
+                credit_line = (LEDGER_CUSTOMER, to_account.id, request.amount)
+            elif request.to_routing_number == settings.routing_number:
+                credit_line = (LEDGER_TRANSFER_CLEARING, None, request.amount)
+            else:
+                # External: held in ACH clearing until the settlement cycle sends it
+                credit_line = (LEDGER_ACH_CLEARING, None, request.amount)
+            journal = LedgerService.post_entry(db, "transfer", [
+                (LEDGER_CUSTOMER, from_account.id, -request.amount),
+                credit_line,
+            ], request.description)
+
+            # Create outgoing transaction
+            transaction = Transaction(
+                transaction_id=str(uuid.uuid4()),
+                account_id=request.from_account_id,
+                transaction_type="transfer",
+                amount=request.amount,
+                peer_routing_number=request.to_routing_number,
+                peer_account_number=request.to_account_number,
+                description=request.description,
+                journal_id=journal.journal_id,
+                direction="debit"
+            )
 
             if to_account:
-                # Create incoming transaction
-                incoming_transaction = Transaction(
+                # Create incoming transaction (same journal entry)
+                db.add(Transaction(
                     transaction_id=str(uuid.uuid4()),
                     account_id=to_account.id,
                     transaction_type="transfer",
                     amount=request.amount,
                     peer_routing_number=settings.routing_number,
                     peer_account_number=from_account.account_number,
-                    description=f"Transfer from {from_account.account_number}"
-                )
-                to_account.balance += request.amount
-                db.add(incoming_transaction)
-
-        db.add(transaction)
-        db.commit()
+                    description=f"Transfer from {from_account.account_number}",
+                    journal_id=journal.journal_id,
+                    direction="credit"
+                ))
+
+            db.add(transaction)
+            if request.to_routing_number != settings.routing_number:
+                SettlementService.queue_transfer(db, transaction)
+            TransactionService._enqueue_created(db, transaction, from_account.account_number)
+            DataVersionService.bump(db, user_id, *([to_account.account_holder_id] if to_account else []))
+            db.commit()
+        except Exception:
+            VelocityService.release(reservation)  # not committed, so it must not count
+            raise
+        VelocityService.confirm(reservation)
         db.refresh(transaction)
 
-        logger.info(f"Transfer: ${request.amount} from {from_account.account_number} to {request.to_account_number}")
         return transaction
 
     @staticmethod
-    def get_transactions(db: Session, user_id: int, account_id: Optional[int] = None) -> List[Transaction]:
+    def get_transactions(
+        db: Session,
+        user_id: int,
+        account_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Union[Transaction, ArchivedTransaction]]:
         """
-        Get transactions for user (optionally filtered by account).
+        Get transactions for user (optionally filtered by account and date range).
+
+        Archived transactions are included only when the range starts at or
+        before the archive watermark.
 
         Args:
             db: Database session
             user_id: Account holder ID
             account_id: Optional account ID filter
+            start: Optional inclusive lower bound on created_at
+            end: Optional exclusive upper bound on created_at
 
         Returns:
-            List[Transaction]: Transactions
+            List[Union[Transaction, ArchivedTransaction]]: Transactions, newest first
         """
         # Get user's account IDs
-        account_ids = [acc.id for acc in db.query(Account).filter(
+        account_ids = [acc.id for acc in db.query(Account.id).filter(
             Account.account_holder_id == user_id
         ).all()]
 
-        query = db.query(Transaction).filter(Transaction.account_id.in_(account_ids))
-
         if account_id:
             # Verify ownership
             if account_id not in account_ids:
                 raise UnauthorizedError("Access denied to this account")
-            query = query.filter(Transaction.account_id == account_id)
+            account_ids = [account_id]
 
-        return query.order_by(Transaction.created_at.desc()).all()
+        query = db.query(Transaction).filter(Transaction.account_id.in_(account_ids))
+        if start is not None:
+            query = query.filter(Transaction.created_at >= start)
+        if end is not None:
+            query = query.filter(Transaction.created_at < end)
+
+        transactions = query.order_by(Transaction.created_at.desc()).all()
+
+        # Every archived row is older than every hot row, so appending keeps the order
+        if ArchiveService.needs_archive(db, start):
+            transactions += ArchiveService.get_archived_transactions(db, account_ids, start, end)
+
+        return transactions
+
+
+@register_handler("transaction.created")
+def log_transaction_created(message: OutboxMessage) -> None:
+    """Write the audit log line for a committed transaction."""
+    payload = message.payload
+    if payload["transaction_type"] == "deposit":
+        logger.info(f"Deposit: ${payload['amount']} to account {payload['account_number']}")
+    elif payload["transaction_type"] == "withdrawal":
+        logger.info(f"Withdrawal: ${payload['amount']} from account {payload['account_number']}")
+    else:
+        logger.info(
+            f"Transfer: ${payload['amount']} from {payload['account_number']} to {payload['peer_account_number']}"
+        )
@@ -0,0 +1,580 @@
+"""
+Velocity rules: per-account limits on outgoing money movements.
+
+Withdrawals and outgoing transfers are checked synchronously before the
+ledger entry is posted, against limits on the count and amount per
+minute, hour and day, and against new-payee limits. A payee is new if the
+account has never transferred to it before. There are two new-payee
+limits: the amount of a first transfer, and the number of new payees per
+day.
+
+Counters live in sliding windows made of fixed-width buckets in a ring
+buffer, so a check costs the same whatever the account's history. An
+account's windows are rebuilt from ``transactions`` the first time the
+process sees the account.
+
+A check is a reservation: the outflow is added to the windows and the
+limits are compared with the totals including it, in one atomic step, so
+concurrent requests cannot all pass against the same totals. A rejected
+outflow, or one whose database transaction fails, is released again;
+``confirm`` after the commit records the payee as known.
+
+``settings.velocity_backend`` selects where the windows live: ``memory``
+(per process, bounded LRU of accounts) or ``redis`` (shared by every
+worker, for multi-worker deployments).
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.exceptions import VelocityLimitError
+from app.core.lazy import LazyProxy
+from app.core.logging_config import logger
+from app.models.archived_transaction import ArchivedTransaction
+from app.models.transaction import Transaction
+
+
+# (name, span seconds, bucket width seconds); windows may count up to one
+# extra bucket of history, never less than the span
+WINDOWS = (("minute", 60, 5), ("hour", 3600, 300), ("day", 86400, 3600))
+NEW_PAYEE_WINDOW = ("new_payees", 86400, 3600)
+
+# (timestamp, cents) of one past outflow
+Outflow = Tuple[float, int]
+
+
+@dataclass
+class AccountHistory:
+    """What is needed to rebuild an account's windows."""
+    outflows: List[Outflow]  # within the last day
+    payees: Set[str]  # every payee ever paid
+    new_payee_times: List[float]  # first payments to a payee within the last day
+
+
+@dataclass
+class VelocitySnapshot:
+    """Window totals of one account, including the outflow just reserved."""
+    windows: Dict[str, Tuple[int, int]]  # window name -> (count, cents)
+    new_payees: int
+    known_payee: bool
+
+
+@dataclass
+class VelocityReservation:
+    """An outflow counted in its account's windows, to be confirmed or released."""
+    account_id: int
+    cents: int
+    payee: Optional[str]
+    at: float  # epoch seconds; selects the buckets to release from
+    new_payee: bool  # counted in the new-payee window
+
+
+def to_cents(amount: Decimal) -> int:
+    """Convert a money amount to integer cents."""
+    return int((Decimal(amount) * 100).to_integral_value())
+
+
+def payee_key(routing_number: str, account_number: str) -> str:
+    """Identify a transfer destination."""
+    return f"{routing_number}:{account_number}"
+
+
+def _epoch(moment: datetime) -> float:
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+
+def load_history(db: Session, account_id: int, now: float) -> AccountHistory:
+    """
+    Read an account's recent outflows and known payees from the database.
+
+    Args:
+        db: Database session
+        account_id: Account ID
+        now: Current time (epoch seconds)
+
+    Returns:
+        AccountHistory: History to rebuild the windows from
+    """
+    since = datetime.utcfromtimestamp(now - max(span for _, span, _ in WINDOWS))
+    outflows = [
+        (_epoch(created_at), to_cents(amount))
+        for created_at, amount in db.execute(
+            select(Transaction.created_at, Transaction.amount)
+            .where(Transaction.account_id == account_id, Transaction.created_at >= since,
+                   Transaction.direction == "debit")
+            .order_by(Transaction.created_at)
+        )
+    ]
+
+    payees: Set[str] = set()
+    first_paid: Dict[str, datetime] = {}
+    for model in (Transaction, ArchivedTransaction):
+        for routing_number, account_number, first in db.execute(
+            select(model.peer_routing_number, model.peer_account_number, func.min(model.created_at))
+            .where(model.account_id == account_id, model.transaction_type == "transfer",
+                   model.direction == "debit")
+            .group_by(model.peer_routing_number, model.peer_account_number)
+        ):
+            key = payee_key(routing_number, account_number)
+            payees.add(key)
+            first_paid[key] = min(first, first_paid.get(key, first))
+    new_payee_times = sorted(_epoch(first) for first in first_paid.values() if first >= since)
+    return AccountHistory(outflows, payees, new_payee_times)
+
+
+class SlidingWindow:
+    """Ring buffer of per-bucket counts and cent totals covering one time window."""
+
+    __slots__ = ("width", "size", "counts", "cents", "count", "total", "slot")
+
+    def __init__(self, span: int, width: int):
+        self.width = width
+        self.size = span // width + 1
+        self.counts = array("q", [0]) * self.size
+        self.cents = array("q", [0]) * self.size
+        self.count = 0
+        self.total = 0
+        self.slot = 0
+
+    def _advance(self, slot: int) -> None:
+        """Move the head to ``slot``, clearing the buckets that fell out of the window."""
+        if slot <= self.slot:
+            return
+        for expired in range(self.slot + 1, min(slot, self.slot + self.size) + 1):
+            i = expired % self.size
+            self.count -= self.counts[i]
+            self.total -= self.cents[i]
+            self.counts[i] = 0
+            self.cents[i] = 0
+        self.slot = slot
+
+    def add(self, at: float, cents: int = 0) -> None:
+        """
+        Count an event.
+
+        Args:
+            at: Event time (epoch seconds)
+            cents: Amount to add
+        """
+        slot = int(at // self.width)
+        self._advance(slot)
+        if slot <= self.slot - self.size:
+            return  # already outside the window
+        i = slot % self.size
+        self.counts[i] += 1
+        self.cents[i] += cents
+        self.count += 1
+        self.total += cents
+
+    def remove(self, at: float, cents: int = 0) -> None:
+        """
+        Uncount an event added with ``add``, unless it already left the window.
+
+        Args:
+            at: Event time (epoch seconds)
+            cents: Amount it added
+        """
+        slot = int(at // self.width)
+        if slot <= self.slot - self.size or slot > self.slot:
+            return
+        i = slot % self.size
+        self.counts[i] -= 1
+        self.cents[i] -= cents
+        self.count -= 1
+        self.total -= cents
+
+    def totals(self, now: float) -> Tuple[int, int]:
+        """
+        Get the count and cent total of the window ending now.
+
+        Args:
+            now: Current time (epoch seconds)
+
+        Returns:
+            Tuple[int, int]: (count, cents)
+        """
+        self._advance(int(now // self.width))
+        return self.count, self.total
+
+
+class VelocityBackend(ABC):
+    """Storage for per-account velocity windows."""
+
+    @abstractmethod
+    def reserve(
+        self,
+        account_id: int,
+        cents: int,
+        payee: Optional[str],
+        now: float,
+        load: Callable[[], AccountHistory]
+    ) -> VelocitySnapshot:
+        """
+        Atomically count an outflow and get the account's totals including it.
+
+        The account's windows are rebuilt with ``load`` first if unknown. An
+        outflow to a payee not known yet also counts as a new payee.
+
+        Args:
+            account_id: Account ID
+            cents: Amount in cents
+            payee: Destination being paid, if a transfer
+            now: Current time (epoch seconds)
+            load: Reads the account's history from the database
+
+        Returns:
+            VelocitySnapshot: Totals including this outflow
+        """
+
+    @abstractmethod
+    def release(self, reservation: VelocityReservation) -> None:
+        """
+        Uncount a reserved outflow that was rejected or not committed.
+
+        Args:
+            reservation: The reserved outflow
+        """
+
+    @abstractmethod
+    def confirm(self, reservation: VelocityReservation) -> None:
+        """
+        Record the payee of a committed outflow as known.
+
+        Args:
+            reservation: The reserved outflow
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget every account (windows are rebuilt on next use)."""
+
+
+class _AccountWindows:
+    """In-memory windows of one account."""
+
+    __slots__ = ("windows", "new_payees", "payees")
+
+    def __init__(self, history: AccountHistory):
+        self.windows = {name: SlidingWindow(span, width) for name, span, width in WINDOWS}
+        self.new_payees = SlidingWindow(NEW_PAYEE_WINDOW[1], NEW_PAYEE_WINDOW[2])
+        self.payees = set(history.payees)
+        for at, cents in history.outflows:
+            for window in self.windows.values():
+                window.add(at, cents)
+        for at in history.new_payee_times:
+            self.new_payees.add(at)
+
+
+class InMemoryVelocityBackend(VelocityBackend):
+    """
+    Windows held in this process.
+
+    Each worker only sees the outflows it processed itself after rebuilding
+    an account, so use the redis backend when running several workers.
+    """
+
+    def __init__(self, max_accounts: int = 50_000):
+        self.max_accounts = max_accounts
+        self._accounts: "OrderedDict[int, _AccountWindows]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, account_id: int) -> Optional[_AccountWindows]:
+        state = self._accounts.get(account_id)
+        if state is not None:
+            self._accounts.move_to_end(account_id)
+        return state
+
+    def reserve(self, account_id, cents, payee, now, load) -> VelocitySnapshot:
+        with self._lock:
+            state = self._get(account_id)
+        if state is None:
+            loaded = _AccountWindows(load())
+            with self._lock:
+                # Another thread may have rebuilt the account meanwhile; keep the first
+                state = self._accounts.setdefault(account_id, loaded)
+                while len(self._accounts) > self.max_accounts:
+                    self._accounts.popitem(last=False)
+        with self._lock:
+            known_payee = payee is None or payee in state.payees
+            for window in state.windows.values():
+                window.add(now, cents)
+            if not known_payee:
+                state.new_payees.add(now)
+            return VelocitySnapshot(
+                windows={name: window.totals(now) for name, window in state.windows.items()},
+                new_payees=state.new_payees.totals(now)[0],
+                known_payee=known_payee,
+            )
+
+    def release(self, reservation) -> None:
+        with self._lock:
+            state = self._get(reservation.account_id)
+            if state is None:
+                return  # rebuilt from the database on next use
+            for window in state.windows.values():
+                window.remove(reservation.at, reservation.cents)
+            if reservation.new_payee:
+                state.new_payees.remove(reservation.at)
+
+    def confirm(self, reservation) -> None:
+        if reservation.payee is None:
+            return
+        with self._lock:
+            state = self._get(reservation.account_id)
+            if state is None:
+                return
+            if reservation.payee in state.payees and reservation.new_payee:
+                state.new_payees.remove(reservation.at)  # a concurrent outflow paid it first
+            state.payees.add(reservation.payee)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accounts.clear()
+
+
+class RedisVelocityBackend(VelocityBackend):
+    """
+    Windows shared by all workers in Redis.
+
+    Each bucket is a hash (``c`` count, ``a`` cents) expiring once it leaves
+    its window. A reservation is one MULTI/EXEC round trip: HINCRBYs on the
+    current buckets followed by a fixed number of HMGETs, so every request
+    sees the outflows reserved before it. A ``loaded`` marker (refreshed on
+    every reservation, expiring after the longest window plus a day) is
+    written in the same transaction as the history rebuilt from the
+    database.
+    """
+
+    def __init__(self, url: str, prefix: str = "velocity"):
+        import redis  # optional dependency
+
+        self._redis = redis.Redis.from_url(url)
+        self._watch_error = redis.WatchError
+        self.prefix = prefix
+        self.marker_ttl = max(span for _, span, _ in WINDOWS) + 86400
+
+    def _bucket(self, account_id: int, name: str, slot: int) -> str:
+        return f"{self.prefix}:{account_id}:{name}:{slot}"
+
+    def _windows(self) -> Iterable[Tuple[str, int, int]]:
+        return (*WINDOWS, NEW_PAYEE_WINDOW)
+
+    def _add(self, pipe, account_id: int, name: str, span: int, width: int, at: float, cents: int,
+             sign: int = 1) -> None:
+        key = self._bucket(account_id, name, int(at // width))
+        pipe.hincrby(key, "c", sign)
+        pipe.hincrby(key, "a", sign * cents)
+        pipe.expire(key, span + 2 * width)
+
+    def _ensure_loaded(self, account_id: int, load: Callable[[], AccountHistory]) -> None:
+        """Rebuild an unknown account's windows, writing the marker together with them."""
+        marker = f"{self.prefix}:{account_id}:loaded"
+        with self._redis.pipeline() as pipe:
+            try:
+                pipe.watch(marker)
+                if pipe.exists(marker):
+                    return
+                history = load()
+                pipe.multi()
+                for at, cents in history.outflows:
+                    for name, span, width in WINDOWS:
+                        self._add(pipe, account_id, name, span, width, at, cents)
+                for at in history.new_payee_times:
+                    self._add(pipe, account_id, *NEW_PAYEE_WINDOW, at, 0)
+                if history.payees:
+                    pipe.sadd(f"{self.prefix}:{account_id}:payees", *history.payees)
+                pipe.set(marker, 1, ex=self.marker_ttl)
+                pipe.execute()
+            except self._watch_error:
+                pass  # another worker rebuilt the account first; its history is the same
+
+    def reserve(self, account_id, cents, payee, now, load) -> VelocitySnapshot:
+        self._ensure_loaded(account_id, load)
+        payees = f"{self.prefix}:{account_id}:payees"
+        known_payee = payee is None or bool(self._redis.sismember(payees, payee))
+
+        pipe = self._redis.pipeline(transaction=True)
+        for name, span, width in WINDOWS:
+            self._add(pipe, account_id, name, span, width, now, cents)
+        if not known_payee:
+            self._add(pipe, account_id, *NEW_PAYEE_WINDOW, now, 0)
+        pipe.expire(f"{self.prefix}:{account_id}:loaded", self.marker_ttl)
+        writes = len(pipe)
+        layout = []
+        for name, span, width in self._windows():
+            head = int(now // width)
+            slots = range(head - span // width, head + 1)
+            layout.append((name, len(slots)))
+            for slot in slots:
+                pipe.hmget(self._bucket(account_id, name, slot), "c", "a")
+        results = pipe.execute()[writes:]
+
+        totals, offset = {}, 0
+        for name, length in layout:
+            buckets = results[offset:offset + length]
+            offset += length
+            totals[name] = (sum(int(c or 0) for c, _ in buckets), sum(int(a or 0) for _, a in buckets))
+        new_payees = totals.pop(NEW_PAYEE_WINDOW[0])[0]
+        return VelocitySnapshot(windows=totals, new_payees=new_payees, known_payee=known_payee)
+
+    def release(self, reservation) -> None:
+        pipe = self._redis.pipeline(transaction=True)
+        for name, span, width in WINDOWS:
+            self._add(pipe, reservation.account_id, name, span, width, reservation.at, reservation.cents, -1)
+        if reservation.new_payee:
+            self._add(pipe, reservation.account_id, *NEW_PAYEE_WINDOW, reservation.at, 0, -1)
+        pipe.execute()
+
+    def confirm(self, reservation) -> None:
+        if reservation.payee is None:
+            return
+        added = self._redis.sadd(f"{self.prefix}:{reservation.account_id}:payees", reservation.payee)
+        if reservation.new_payee and not added:
+            # A concurrent outflow paid it first and already counts as the new payee
+            pipe = self._redis.pipeline(transaction=True)
+            self._add(pipe, reservation.account_id, *NEW_PAYEE_WINDOW, reservation.at, 0, -1)
+            pipe.execute()
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(f"{self.prefix}:*"):
+            self._redis.delete(key)
+
+
+def create_velocity_backend() -> VelocityBackend:
+    """
+    Create the backend selected by ``settings.velocity_backend``.
+
+    Returns:
+        VelocityBackend: Configured backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if settings.velocity_backend == "memory":
+        return InMemoryVelocityBackend(settings.velocity_max_accounts)
+    if settings.velocity_backend == "redis":
+        return RedisVelocityBackend(settings.velocity_redis_url)
+    raise ValueError(f"Invalid velocity_backend '{settings.velocity_backend}', expected 'memory' or 'redis'")
+
+
+# Global backend instance (created on first use)
+velocity_backend: VelocityBackend = LazyProxy(create_velocity_backend)
+
+
+class VelocityService:
+    """Velocity rule checks for outgoing money movements."""
+
+    @staticmethod
+    def limits() -> Dict[str, Tuple[int, int]]:
+        """
+        Configured limits per window.
+
+        Returns:
+            Dict[str, Tuple[int, int]]: Window name -> (max count, max cents); 0 means unlimited
+        """
+        return {
+            "minute": (settings.velocity_max_count_per_minute, to_cents(settings.velocity_max_amount_per_minute)),
+            "hour": (settings.velocity_max_count_per_hour, to_cents(settings.velocity_max_amount_per_hour)),
+            "day": (settings.velocity_max_count_per_day, to_cents(settings.velocity_max_amount_per_day)),
+        }
+
+    @staticmethod
+    def reserve(
+        db: Session,
+        account_id: int,
+        amount: Decimal,
+        payee: Optional[str] = None
+    ) -> Optional[VelocityReservation]:
+        """
+        Count an outflow against the velocity rules, rejecting it if it breaks one.
+
+        Call before posting the outflow; then ``confirm`` the reservation
+        after committing, or ``release`` it if the outflow is not committed.
+
+        Args:
+            db: Database session (used to rebuild an account's windows)
+            account_id: Source account ID
+            amount: Outflow amount
+            payee: ``payee_key`` of the destination, for transfers
+
+        Returns:
+            Optional[VelocityReservation]: The reservation (None when velocity rules are disabled)
+
+        Raises:
+            VelocityLimitError: If the outflow would break a rule (nothing stays reserved)
+        """
+        if not settings.velocity_enabled:
+            return None
+        now = time.time()
+        cents = to_cents(amount)
+        snapshot = velocity_backend.reserve(
+            account_id, cents, payee, now, lambda: load_history(db, account_id, now)
+        )
+        reservation = VelocityReservation(account_id, cents, payee, now, not snapshot.known_payee)
+        try:
+            VelocityService._check(account_id, cents, snapshot)
+        except VelocityLimitError:
+            velocity_backend.release(reservation)
+            raise
+        return reservation
+
+    @staticmethod
+    def _check(account_id: int, cents: int, snapshot: VelocitySnapshot) -> None:
+        """Compare totals that include the outflow with the limits."""
+        widths = {name: width for name, _, width in WINDOWS}
+        for name, (max_count, max_cents) in VelocityService.limits().items():
+            count, total = snapshot.windows[name]
+            if max_count and count > max_count:
+                VelocityService._reject(account_id, f"More than {max_count} outgoing transactions per {name}",
+                                        f"count_per_{name}", widths[name])
+            if max_cents and total > max_cents:
+                VelocityService._reject(account_id, f"Outgoing amount limit per {name} exceeded",
+                                        f"amount_per_{name}", widths[name])
+
+        if not snapshot.known_payee:
+            max_new_payee = to_cents(settings.velocity_new_payee_max_amount)
+            if max_new_payee and cents > max_new_payee:
+                VelocityService._reject(
+                    account_id,
+                    f"First transfer to a new payee is limited to ${settings.velocity_new_payee_max_amount}",
+                    "new_payee_amount"
+                )
+            max_new_payees = settings.velocity_new_payees_per_day
+            if max_new_payees and snapshot.new_payees > max_new_payees:
+                VelocityService._reject(account_id, f"More than {max_new_payees} new payees per day",
+                                        "new_payees_per_day", NEW_PAYEE_WINDOW[2])
+
+    @staticmethod
+    def _reject(account_id: int, message: str, rule: str, retry_after: Optional[int] = None) -> None:
+        logger.warning("Velocity limit exceeded", extra={"account_id": account_id, "rule": rule})
+        raise VelocityLimitError(message, retry_after)
+
+    @staticmethod
+    def release(reservation: Optional[VelocityReservation]) -> None:
+        """
+        Give back a reservation whose outflow was not committed.
+
+        Args:
+            reservation: Result of ``reserve``
+        """
+        if reservation is not None:
+            velocity_backend.release(reservation)
+
+    @staticmethod
+    def confirm(reservation: Optional[VelocityReservation]) -> None:
+        """
+        Finish a reservation whose outflow was committed.
+
+        Args:
+            reservation: Result of ``reserve``
+        """
+        if reservation is not None:
+            velocity_backend.confirm(reservation)
@@ -2,7 +2,9 @@
 Request context management for trace IDs and correlation.
 """
 from contextvars import ContextVar
+from dataclasses import dataclass, field
 import uuid
+from collections import Counter
 from typing import Optional
 
 
@@ -10,6 +12,51 @@ from typing import Optional
 request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
 
+@dataclass
+class QueryStats:
+    """SQL statistics collected for one request."""
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        """
+        Record one executed statement.
+
+        Args:
+            statement: Normalized SQL
+            duration_ms: Execution time in milliseconds
+        """
+        self.count += 1
+        self.total_ms += duration_ms
+        self.statements[statement] += 1
+        if duration_ms >= self.slowest_ms:
+            self.slowest_ms = duration_ms
+            self.slowest_statement = statement
+
+    def as_log_fields(self) -> dict:
+        """
+        Render as structured log fields.
+
+        Returns:
+            dict: Fields for the "Request completed" log line
+        """
+        most_repeated = self.statements.most_common(1)
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_ms, 2),
+            "db_slowest_ms": round(self.slowest_ms, 2),
+            "db_slowest_statement": self.slowest_statement,
+            "db_max_statement_repeats": most_repeated[0][1] if most_repeated else 0,
+        }
+
+
+# Context variable for per-request SQL statistics (None outside requests)
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
 def get_request_id() -> str:
     """
     Get the current request ID from context, or generate a new one.
@@ -39,3 +86,25 @@ def clear_request_id() -> None:
     Clear the request ID from the current context.
     """
     request_id_var.set(None)
+
+
+def start_query_stats() -> QueryStats:
+    """
+    Start collecting SQL statistics for the current context.
+
+    Returns:
+        QueryStats: Statistics object that engine hooks will update
+    """
+    stats = QueryStats()
+    query_stats_var.set(stats)
+    return stats
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """
+    Get SQL statistics for the current context.
+
+    Returns:
+        Optional[QueryStats]: Statistics, or None outside a request
+    """
+    return query_stats_var.get()
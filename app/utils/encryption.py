@@ -1,24 +1,122 @@
 """
 Encryption utilities for sensitive data (SSN, card numbers).
-Uses Fernet (AES-128 CBC) for symmetric encryption.
+
+Two ciphertext formats are supported, selected for new data by
+``settings.encryption_format``:
+
+- ``fernet`` (v1): ``<key id>$<Fernet token>``. Fernet is AES-128-CBC with
+  HMAC-SHA256, base64 encoded.
+- ``aes-gcm`` (v2): ``0x02 | len(key id) | key id | 12-byte nonce |
+  ciphertext+tag``. AES-256-GCM with a key derived from the Fernet key by
+  HKDF. The caller's associated data (the row identity, see ``row_aad``) is
+  authenticated, so a ciphertext copied to another row fails to decrypt.
+
+Several keys can be active at once: new data is always encrypted with the
+primary key, while data under any configured key and in either format stays
+readable. Blobs written before key ids existed (a bare Fernet token) are
+decrypted by trying every configured key. Stored data moves to the primary
+key and current format lazily: card numbers when the API lists them
+(``KeyRotationService.reseal``), and everything, including SSNs, which the
+API never reads back, by the rotation job in
+app/services/key_rotation_service.py.
 """
-from cryptography.fernet import Fernet
+import base64
+import os
+from typing import Dict, Optional
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from app.config import settings
+from app.core.lazy import LazyProxy
+
+
+KEY_ID_SEPARATOR = b"$"
+DEFAULT_KEY_ID = "k0"
+
+FORMAT_FERNET = "fernet"
+FORMAT_AES_GCM = "aes-gcm"
+FORMATS = (FORMAT_FERNET, FORMAT_AES_GCM)
+
+AES_GCM_VERSION = 0x02
+AES_GCM_NONCE_SIZE = 12
+_HKDF_INFO = b"invisible-bank field encryption v2"
+
+
+def load_keyring() -> Dict[str, str]:
+    """
+    Build the keyring from settings.
+
+    ``settings.encryption_keys`` lists ``id=key`` pairs, primary first.
+    ``settings.encryption_key`` is always included (as ``k0``) unless the
+    same key is already listed, so data written under it stays readable.
+
+    Returns:
+        Dict[str, str]: Key id to Fernet key, primary first
+    """
+    keyring: Dict[str, str] = {}
+    for item in filter(None, (part.strip() for part in settings.encryption_keys.split(","))):
+        key_id, sep, key = item.partition("=")
+        if not sep or not key_id or KEY_ID_SEPARATOR.decode() in key_id:
+            raise ValueError(f"Invalid ENCRYPTION_KEYS entry '{key_id}', expected id=key")
+        keyring[key_id.strip()] = key.strip()
+    if settings.encryption_key not in keyring.values():
+        keyring.setdefault(DEFAULT_KEY_ID, settings.encryption_key)
+    return keyring
+
+
+def row_aad(table: str, row_id: int) -> bytes:
+    """
+    Associated data binding a ciphertext to one database row.
+
+    Args:
+        table: Table name
+        row_id: Primary key of the row
+
+    Returns:
+        bytes: Associated data
+    """
+    return f"{table}:{row_id}".encode()
+
+
+def _derive_aes_key(fernet_key: str) -> AESGCM:
+    """Derive an AES-256-GCM key from a Fernet key with HKDF-SHA256."""
+    material = base64.urlsafe_b64decode(fernet_key.encode())
+    key = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=_HKDF_INFO).derive(material)
+    return AESGCM(key)
 
 
 class EncryptionService:
     """Service for encrypting and decrypting sensitive data."""
 
-    def __init__(self):
-        """Initialize encryption cipher with key from settings."""
-        self.cipher_suite = Fernet(settings.encryption_key.encode())
+    def __init__(self, keys: Optional[Dict[str, str]] = None, ciphertext_format: Optional[str] = None):
+        """
+        Initialize ciphers for every key.
+
+        Args:
+            keys: Key id to Fernet key, primary first (default: from settings)
+            ciphertext_format: Format for new ciphertexts (default: ``settings.encryption_format``)
+        """
+        keys = keys or load_keyring()
+        self.format = ciphertext_format or settings.encryption_format
+        if self.format not in FORMATS:
+            raise ValueError(f"Invalid encryption format '{self.format}', expected one of {FORMATS}")
+
+        self.ciphers = {key_id: Fernet(key.encode()) for key_id, key in keys.items()}
+        self.aead_ciphers = {key_id: _derive_aes_key(key) for key_id, key in keys.items()}
+        self.primary_key_id = next(iter(self.ciphers))
+        self.cipher_suite = self.ciphers[self.primary_key_id]
+        self._any_key = MultiFernet(list(self.ciphers.values()))
 
-    def encrypt(self, plaintext: str) -> bytes:
+    def encrypt(self, plaintext: str, associated_data: bytes = b"") -> bytes:
         """
-        Encrypt plaintext string to bytes.
+        Encrypt plaintext string to bytes with the primary key.
 
         Args:
             plaintext: String to encrypt
+            associated_data: Context bound to the ciphertext, e.g. ``row_aad(...)``
+                (authenticated by the aes-gcm format, ignored by fernet)
 
         Returns:
             bytes: Encrypted data
@@ -29,20 +127,28 @@ class EncryptionService:
             >>> type(encrypted)
             <class 'bytes'>
         """
-        return self.cipher_suite.encrypt(plaintext.encode())
+        key_id = self.primary_key_id.encode()
+        if self.format == FORMAT_AES_GCM:
+            nonce = os.urandom(AES_GCM_NONCE_SIZE)
+            sealed = self.aead_ciphers[self.primary_key_id].encrypt(nonce, plaintext.encode(), associated_data)
+            return bytes([AES_GCM_VERSION, len(key_id)]) + key_id + nonce + sealed
 
-    def decrypt(self, encrypted: bytes) -> str:
+        token = self.cipher_suite.encrypt(plaintext.encode())
+        return key_id + KEY_ID_SEPARATOR + token
+
+    def decrypt(self, encrypted: bytes, associated_data: bytes = b"") -> str:
         """
         Decrypt bytes to plaintext string.
 
         Args:
-            encrypted: Encrypted bytes
+            encrypted: Encrypted bytes in any supported format
+            associated_data: Same value that was passed to ``encrypt``
 
         Returns:
             str: Decrypted plaintext
 
         Raises:
-            InvalidToken: If decryption fails (corrupted data or wrong key)
+            InvalidToken: If decryption fails (corrupted data, wrong key or associated data)
 
         Example:
             >>> service = EncryptionService()
@@ -50,8 +156,83 @@ class EncryptionService:
             >>> service.decrypt(encrypted)
             '123-45-6789'
         """
-        return self.cipher_suite.decrypt(encrypted).decode()
+        encrypted = bytes(encrypted)
+        key_id = self.key_id(encrypted)
+
+        if encrypted[:1] == bytes([AES_GCM_VERSION]):
+            cipher = self.aead_ciphers.get(key_id)
+            if cipher is None:
+                raise InvalidToken
+            body = encrypted[2 + len(key_id):]
+            try:
+                return cipher.decrypt(body[:AES_GCM_NONCE_SIZE], body[AES_GCM_NONCE_SIZE:], associated_data).decode()
+            except InvalidTag:
+                raise InvalidToken
+
+        if key_id is None:
+            return self._any_key.decrypt(encrypted).decode()
+
+        cipher = self.ciphers.get(key_id)
+        if cipher is None:
+            raise InvalidToken
+        return cipher.decrypt(encrypted[len(key_id) + 1:]).decode()
+
+    @staticmethod
+    def key_id(encrypted: bytes) -> Optional[str]:
+        """
+        Get the id of the key a ciphertext was written with.
+
+        Args:
+            encrypted: Encrypted bytes
+
+        Returns:
+            Optional[str]: Key id, or None for a legacy bare Fernet token
+        """
+        encrypted = bytes(encrypted)
+        if encrypted[:1] == bytes([AES_GCM_VERSION]):
+            return encrypted[2:2 + encrypted[1]].decode()
+        # Fernet tokens are URL-safe base64, which never contains the separator
+        key_id, sep, _ = encrypted.partition(KEY_ID_SEPARATOR)
+        return key_id.decode() if sep else None
+
+    @staticmethod
+    def ciphertext_format(encrypted: bytes) -> str:
+        """
+        Get the format of a ciphertext.
+
+        Args:
+            encrypted: Encrypted bytes
+
+        Returns:
+            str: 'aes-gcm' or 'fernet'
+        """
+        return FORMAT_AES_GCM if bytes(encrypted[:1]) == bytes([AES_GCM_VERSION]) else FORMAT_FERNET
+
+    def needs_rotation(self, encrypted: bytes) -> bool:
+        """
+        Check whether a ciphertext is not under the primary key and current format.
+
+        Args:
+            encrypted: Encrypted bytes
+
+        Returns:
+            bool: True if ``rotate`` would change it
+        """
+        return self.key_id(encrypted) != self.primary_key_id or self.ciphertext_format(encrypted) != self.format
+
+    def rotate(self, encrypted: bytes, associated_data: bytes = b"") -> bytes:
+        """
+        Re-encrypt a ciphertext under the primary key and current format.
+
+        Args:
+            encrypted: Encrypted bytes under any configured key
+            associated_data: The row's associated data
+
+        Returns:
+            bytes: Re-encrypted data
+        """
+        return self.encrypt(self.decrypt(encrypted, associated_data), associated_data)
 
 
-# Global encryption service instance
-encryption_service = EncryptionService()
+# Global encryption service instance, built from the keyring on first use
+encryption_service: EncryptionService = LazyProxy(EncryptionService)
@@ -0,0 +1,52 @@
+"""
+ETag helpers for conditional GETs.
+"""
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+
+def make_etag(version: int, *parts: object) -> str:
+    """
+    Build a weak ETag from a data version and the representation's inputs.
+
+    Args:
+        version: Data version of the underlying resource
+        parts: Anything else the representation depends on (user, path, query)
+
+    Returns:
+        str: Weak ETag, e.g. ``W/"42-1f2e3d4c5b6a7980"``
+    """
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def canonical_query(items: Iterable[Tuple[str, str]]) -> str:
+    """
+    Order-independent form of query parameters.
+
+    Args:
+        items: (name, value) pairs
+
+    Returns:
+        str: Sorted, ``&``-joined parameters
+    """
+    return "&".join(f"{name}={value}" for name, value in sorted(items))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate ``If-None-Match`` against an ETag (weak comparison, RFC 9110).
+
+    Args:
+        if_none_match: Header value, possibly a comma-separated list or ``*``
+        etag: Current ETag
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
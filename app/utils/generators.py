@@ -2,6 +2,8 @@
 Generators for account numbers, card numbers, etc.
 """
 import random
+from typing import List
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.account import Account
 
@@ -24,15 +26,38 @@ def generate_account_number(db: Session) -> str:
             return number
 
 
-def generate_card_number() -> str:
+def generate_account_numbers(db: Session, count: int) -> List[str]:
+    """
+    Generate several unique 10-digit account numbers with one lookup per round.
+
+    Args:
+        db: Database session for checking uniqueness
+        count: Number of account numbers to generate
+
+    Returns:
+        List[str]: Distinct account numbers not yet in use
+    """
+    numbers: set = set()
+    while len(numbers) < count:
+        candidates = {''.join(random.choices("0123456789", k=10)) for _ in range(count - len(numbers))}
+        candidates -= numbers
+        taken = set(db.scalars(select(Account.account_number).where(Account.account_number.in_(candidates))))
+        numbers |= candidates - taken
+    return list(numbers)
+
+
+def generate_card_number(rng: random.Random = random) -> str:
     """
     Generate a 16-digit card number compliant with Luhn algorithm.
 
+    Args:
+        rng: Random source (e.g. a seeded ``random.Random`` for reproducible data)
+
     Returns:
         str: 16-digit card number
     """
     # Generate first 15 digits randomly
-    digits = [random.randint(0, 9) for _ in range(15)]
+    digits = [rng.randint(0, 9) for _ in range(15)]
 
     # Calculate Luhn checksum for the 16th digit
     checksum = 0
@@ -0,0 +1,188 @@
+"""
+Fixed-width NACHA record formatting for outbound ACH files.
+
+Every record is exactly 94 characters. Files are blocked in groups of 10
+records, padded with all-'9' records. Only the fields needed for credit
+(PPD) entries without addenda are produced.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+RECORD_SIZE = 94
+BLOCKING_FACTOR = 10
+SERVICE_CLASS_CREDITS = "220"
+TRANSACTION_CODE_CHECKING_CREDIT = "22"
+PADDING_RECORD = "9" * RECORD_SIZE
+
+
+def _alpha(value: str, width: int) -> str:
+    """Left-justified, space-padded, upper-case alphanumeric field."""
+    return str(value or "").upper()[:width].ljust(width)
+
+
+def _numeric(value: int, width: int) -> str:
+    """Right-justified, zero-padded numeric field."""
+    text = str(int(value))
+    if len(text) > width:
+        raise ValueError(f"Value {value} does not fit in {width} digits")
+    return text.zfill(width)
+
+
+def _record(*fields: str) -> str:
+    record = "".join(fields)
+    if len(record) != RECORD_SIZE:
+        raise ValueError(f"NACHA record must be {RECORD_SIZE} characters, got {len(record)}")
+    return record
+
+
+def to_cents(amount: Decimal) -> int:
+    """
+    Convert a dollar amount to integer cents.
+
+    Args:
+        amount: Dollar amount
+
+    Returns:
+        int: Amount in cents
+    """
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+def entry_hash(routing_number: str) -> int:
+    """
+    Hash contribution of one receiving DFI (first 8 routing digits).
+
+    Args:
+        routing_number: 9-digit routing number
+
+    Returns:
+        int: Value to add to the batch/file entry hash
+    """
+    return int(routing_number[:8])
+
+
+def file_header(destination: str, origin: str, destination_name: str, origin_name: str,
+                created: datetime, file_id_modifier: str = "A") -> str:
+    """
+    File header record (type 1).
+
+    Args:
+        destination: Immediate destination routing number
+        origin: Immediate origin routing number
+        destination_name: Immediate destination name
+        origin_name: Immediate origin name
+        created: File creation time
+        file_id_modifier: A-Z, distinguishes files created the same day
+
+    Returns:
+        str: 94-character record
+    """
+    return _record(
+        "1", "01", " " + _numeric(destination, 9), " " + _numeric(origin, 9),
+        created.strftime("%y%m%d"), created.strftime("%H%M"), file_id_modifier,
+        "094", "10", "1", _alpha(destination_name, 23), _alpha(origin_name, 23), _alpha("", 8)
+    )
+
+
+def batch_header(company_name: str, company_id: str, entry_description: str,
+                 effective_date: datetime, odfi: str, batch_number: int) -> str:
+    """
+    Batch header record (type 5) for a credits-only PPD batch.
+
+    Args:
+        company_name: Originator name
+        company_id: Originator identification (10 characters)
+        entry_description: Shown on the receiver's statement
+        effective_date: Requested settlement date
+        odfi: Originating DFI routing number
+        batch_number: Sequence number of the batch in the file
+
+    Returns:
+        str: 94-character record
+    """
+    return _record(
+        "5", SERVICE_CLASS_CREDITS, _alpha(company_name, 16), _alpha("", 20), _alpha(company_id, 10),
+        "PPD", _alpha(entry_description, 10), effective_date.strftime("%y%m%d"),
+        effective_date.strftime("%y%m%d"), _alpha("", 3), "1", odfi[:8], _numeric(batch_number, 7)
+    )
+
+
+def entry_detail(routing_number: str, account_number: str, amount_cents: int,
+                 individual_id: str, individual_name: str, trace_number: str) -> str:
+    """
+    Entry detail record (type 6) for a checking credit without addenda.
+
+    Args:
+        routing_number: Receiving DFI routing number (9 digits)
+        account_number: Receiver's account number
+        amount_cents: Amount in cents
+        individual_id: Originator's reference for the entry
+        individual_name: Name shown to the receiver
+        trace_number: 15-digit trace number
+
+    Returns:
+        str: 94-character record
+    """
+    return _record(
+        "6", TRANSACTION_CODE_CHECKING_CREDIT, routing_number[:8], routing_number[8],
+        _alpha(account_number, 17), _numeric(amount_cents, 10), _alpha(individual_id, 15),
+        _alpha(individual_name, 22), _alpha("", 2), "0", trace_number
+    )
+
+
+def batch_control(entry_count: int, hash_total: int, credit_cents: int,
+                  company_id: str, odfi: str, batch_number: int) -> str:
+    """
+    Batch control record (type 8).
+
+    Args:
+        entry_count: Entries in the batch
+        hash_total: Sum of entry hashes (truncated to 10 digits)
+        credit_cents: Total credits in cents
+        company_id: Originator identification
+        odfi: Originating DFI routing number
+        batch_number: Same as in the batch header
+
+    Returns:
+        str: 94-character record
+    """
+    return _record(
+        "8", SERVICE_CLASS_CREDITS, _numeric(entry_count, 6), _numeric(hash_total % 10 ** 10, 10),
+        _numeric(0, 12), _numeric(credit_cents, 12), _alpha(company_id, 10),
+        _alpha("", 19), _alpha("", 6), odfi[:8], _numeric(batch_number, 7)
+    )
+
+
+def file_control(batch_count: int, record_count: int, entry_count: int,
+                 hash_total: int, credit_cents: int) -> str:
+    """
+    File control record (type 9).
+
+    Args:
+        batch_count: Batches in the file
+        record_count: Records in the file including this one, excluding padding
+        entry_count: Entries in the file
+        hash_total: Sum of all entry hashes (truncated to 10 digits)
+        credit_cents: Total credits in cents
+
+    Returns:
+        str: 94-character record
+    """
+    block_count = -(-record_count // BLOCKING_FACTOR)
+    return _record(
+        "9", _numeric(batch_count, 6), _numeric(block_count, 6), _numeric(entry_count, 8),
+        _numeric(hash_total % 10 ** 10, 10), _numeric(0, 12), _numeric(credit_cents, 12), _alpha("", 39)
+    )
+
+
+def padding_records(record_count: int) -> int:
+    """
+    Number of all-'9' records needed to fill the last block.
+
+    Args:
+        record_count: Records written so far
+
+    Returns:
+        int: Padding record count
+    """
+    return -record_count % BLOCKING_FACTOR
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Throughput benchmark for the ACH settlement cycle.
+
+Seeds a fresh database with N pending external transfers spread over a
+number of destination routing numbers, runs one settlement cycle and
+reports transfers per second and file size. With --trace-memory it also
+reports the peak Python heap during the cycle (measured with tracemalloc,
+which slows the run); it should stay flat as N grows because it is bounded
+by the chunk size. Process RSS is not used: it includes SQLite's page
+cache and memory-mapped database pages.
+
+Usage:
+    python -m benchmarks.ach_settlement --transfers 100000 --routing-numbers 500 --chunk-size 5000
+"""
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.base import Base  # noqa: E402
+from app.db.sqlite_tuning import install_sqlite_profile  # noqa: E402
+from app.models.account import Account  # noqa: E402
+from app.models.account_holder import AccountHolder  # noqa: E402
+from app.models.ach_transfer import AchTransfer  # noqa: E402
+from app.services.settlement_service import SettlementService  # noqa: E402
+
+ACCOUNTS = 1000
+INSERT_CHUNK = 20_000
+
+
+def _seed(engine, transfers: int, routing_numbers: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(transfers)
+    now = datetime.utcnow()
+    routings = [f"{rng.randrange(10 ** 8):08d}{rng.randrange(10)}" for _ in range(routing_numbers)]
+    with engine.begin() as conn:
+        conn.execute(insert(AccountHolder), [{
+            "name": f"Sender {i}", "email": f"sender{i}@example.com", "password_hash": "x",
+            "ssn_encrypted": b"x", "date_of_birth": date(1990, 1, 1), "mailing_address": "1 Bench St",
+            "is_active": True,
+        } for i in range(ACCOUNTS)])
+        conn.execute(insert(Account), [{
+            "account_holder_id": i + 1, "account_number": f"{5000000000 + i}", "routing_number": "123456789",
+            "account_type": "checking", "balance": Decimal("0.00"), "is_active": True,
+        } for i in range(ACCOUNTS)])
+        for start in range(0, transfers, INSERT_CHUNK):
+            conn.execute(insert(AchTransfer), [{
+                "transaction_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "account_id": rng.randint(1, ACCOUNTS),
+                "to_routing_number": rng.choice(routings),
+                "to_account_number": f"{rng.randrange(10 ** 12):012d}",
+                "amount": Decimal(rng.randint(100, 500000)) / 100,
+                "status": "pending", "created_at": now, "updated_at": now,
+            } for _ in range(min(INSERT_CHUNK, transfers - start))])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ACH settlement cycle throughput benchmark")
+    parser.add_argument("--transfers", type=int, default=100_000)
+    parser.add_argument("--routing-numbers", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--trace-memory", action="store_true", help="report peak Python heap (slower)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+
+    workdir = Path(tempfile.mkdtemp(prefix="ach-bench-"))
+    engine = create_engine(f"sqlite:///{workdir / 'bench.db'}")
+    install_sqlite_profile(engine)
+    _seed(engine, args.transfers, args.routing_numbers)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    if args.trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    [summary] = SettlementService.run_cycle(db, str(workdir), args.chunk_size)
+    elapsed = time.perf_counter() - start
+    db.close()
+    engine.dispose()
+
+    size_mib = Path(summary["path"]).stat().st_size / 2 ** 20
+    print(f"transfers       {summary['entries']}")
+    print(f"nacha batches   {summary['batches']}")
+    print(f"elapsed s       {elapsed:.2f}")
+    print(f"transfers/s     {summary['entries'] / elapsed:,.0f}")
+    print(f"file MiB        {size_mib:.1f}")
+    if args.trace_memory:
+        print(f"peak heap MiB   {tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+CPU cost versus bytes saved for response compression.
+
+Builds a transaction-list JSON payload shaped like ``GET /api/v1/transactions``
+and compresses it with every installed encoding over a range of levels,
+both in one call (complete responses) and in 16 KiB flushed chunks (streamed
+responses). Reports compression ratio, CPU milliseconds per MB of JSON and
+output throughput, so the configured levels can be chosen from data.
+
+Usage:
+    python -m benchmarks.compression --rows 2000 --repeat 5
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.compression import ENCODERS  # noqa: E402
+
+LEVELS = {
+    "gzip": (1, 4, 6, 9),
+    "br": (1, 4, 5, 8, 11),
+    "zstd": (1, 3, 6, 12, 19),
+}
+STREAM_CHUNK = 16 * 1024
+
+
+def build_payload(rows: int) -> bytes:
+    """
+    Build a transaction-list response body.
+
+    Args:
+        rows: Number of transactions
+
+    Returns:
+        bytes: JSON body
+    """
+    rng = random.Random(rows)
+    now = datetime(2026, 1, 1)
+    types = ("deposit", "withdrawal", "transfer")
+    transactions = []
+    for i in range(rows):
+        kind = rng.choice(types)
+        created = (now - timedelta(minutes=rng.randrange(500_000))).isoformat()
+        transactions.append({
+            "id": rows - i,
+            "transaction_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "account_id": rng.randrange(1, 4),
+            "transaction_type": kind,
+            "amount": f"{rng.randrange(100, 500_000) / 100:.2f}",
+            "peer_routing_number": "123456789" if kind == "transfer" else None,
+            "peer_account_number": f"{rng.randrange(10 ** 9, 10 ** 10)}" if kind == "transfer" else None,
+            "description": rng.choice(("Payroll", "Groceries", "Rent", "Transfer to savings", None)),
+            "journal_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "direction": "debit" if kind == "withdrawal" else "credit",
+            "created_at": created,
+            "updated_at": created,
+        })
+    return json.dumps(transactions).encode()
+
+
+def measure(payload: bytes, encoding: str, level: int, streamed: bool, repeat: int) -> dict:
+    """
+    Compress a payload and time it.
+
+    Args:
+        payload: Body to compress
+        encoding: Encoding name
+        level: Compression level
+        streamed: Compress in flushed chunks instead of one call
+        repeat: Runs to average over
+
+    Returns:
+        dict: Size and CPU summary
+    """
+    stream_factory, compress = ENCODERS[encoding]
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.process_time()
+        if streamed:
+            stream = stream_factory(level)
+            size = sum(
+                len(stream.compress(payload[offset:offset + STREAM_CHUNK]))
+                for offset in range(0, len(payload), STREAM_CHUNK)
+            ) + len(stream.finish())
+        else:
+            size = len(compress(payload, level))
+        best = min(best, time.process_time() - start)
+
+    megabytes = len(payload) / 1e6
+    return {
+        "encoding": encoding,
+        "level": level,
+        "mode": "stream" if streamed else "whole",
+        "ratio": round(len(payload) / size, 2),
+        "saved_kb": round((len(payload) - size) / 1024, 1),
+        "cpu_ms_per_mb": round(best * 1000 / megabytes, 2),
+        "mb_per_s": round(megabytes / best, 1) if best else float("inf"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Response compression CPU/size benchmark")
+    parser.add_argument("--rows", type=int, default=2000, help="transactions in the payload")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = build_payload(args.rows)
+    print(f"payload: {len(payload) / 1024:.1f} KiB JSON ({args.rows} transactions)")
+    print(f"{'encoding':<10}{'level':>6}{'mode':>8}{'ratio':>8}{'saved KiB':>11}{'CPU ms/MB':>11}{'MB/s':>9}")
+    for encoding in ENCODERS:
+        for level in LEVELS[encoding]:
+            for streamed in (False, True):
+                r = measure(payload, encoding, level, streamed, args.repeat)
+                print(f"{r['encoding']:<10}{r['level']:>6}{r['mode']:>8}{r['ratio']:>8}{r['saved_kb']:>11}"
+                      f"{r['cpu_ms_per_mb']:>11}{r['mb_per_s']:>9}")
+
+
+if __name__ == "__main__":
+    main()
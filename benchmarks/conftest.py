@@ -0,0 +1,195 @@
+"""
+Fixtures for service-level microbenchmarks.
+
+Databases are seeded once per scale with bulk Core inserts and cached under
+``runtime/bench/`` (keyed by a fingerprint of the schema, so model changes
+reseed); each benchmark session works on a copy so write benchmarks never
+change the cached seed.
+
+Every seeded database contains the same "probe" account holder (two
+accounts, PROBE_TRANSACTIONS transactions) plus background holders carrying
+the rest of the transactions. Benchmarks that look up the probe holder
+should stay flat as the scale grows; anything that scans whole tables
+will not.
+"""
+import hashlib
+import logging
+import random
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.db.base import Base
+from app.db.search_index import search_index_ddl
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.transaction import Transaction
+from app.core.security import hash_password
+from app.utils.encryption import encryption_service
+
+
+BENCH_DIR = Path(__file__).parent.parent / "runtime" / "bench"
+PROBE_EMAIL = "probe@bench.example.com"
+PROBE_TRANSACTIONS = 200
+TRANSACTIONS_PER_ACCOUNT = 100
+INSERT_CHUNK = 10_000
+VELOCITY_LIMITS = (
+    "velocity_max_count_per_minute", "velocity_max_count_per_hour", "velocity_max_count_per_day",
+    "velocity_max_amount_per_minute", "velocity_max_amount_per_hour", "velocity_max_amount_per_day",
+    "velocity_new_payee_max_amount", "velocity_new_payees_per_day",
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-scales",
+        default="1000",
+        help="Comma-separated transaction counts to seed, e.g. 1000,100000,1000000 (default: 1000)"
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "bench_scale" in metafunc.fixturenames:
+        scales = [int(s) for s in metafunc.config.getoption("--bench-scales").split(",")]
+        metafunc.parametrize("bench_scale", scales, ids=[f"{s}txn" for s in scales], scope="session")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def quiet_logging():
+    """Keep per-call INFO logging out of the measurements."""
+    root = logging.getLogger()
+    previous = root.level
+    root.setLevel(logging.WARNING)
+    yield
+    root.setLevel(previous)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def unlimited_velocity():
+    """Keep velocity checks on the write paths but let the benchmark bursts through."""
+    previous = {name: getattr(settings, name) for name in VELOCITY_LIMITS}
+    for name in VELOCITY_LIMITS:
+        setattr(settings, name, 0)  # 0 = unlimited
+    yield
+    for name, value in previous.items():
+        setattr(settings, name, value)
+
+
+def _schema_fingerprint() -> str:
+    """Short hash of the DDL for the current models."""
+    dialect = sqlite.dialect()
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl.extend(str(CreateIndex(index).compile(dialect=dialect)) for index in sorted(table.indexes, key=lambda i: i.name))
+    ddl.extend(search_index_ddl())
+    return hashlib.sha1("\n".join(ddl).encode()).hexdigest()[:10]
+
+
+def _seed(path: Path, total_transactions: int) -> None:
+    """Create and populate a benchmark database."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    rng = random.Random(total_transactions)
+    now = datetime.utcnow()
+    password_hash = hash_password("benchmark-password")
+    ssn_encrypted = encryption_service.encrypt("123-45-6789")
+
+    background = max(total_transactions - PROBE_TRANSACTIONS, 0)
+    background_accounts = max(background // TRANSACTIONS_PER_ACCOUNT, 1)
+
+    with engine.begin() as conn:
+        holders = [{
+            "name": "Probe Holder", "email": PROBE_EMAIL, "password_hash": password_hash,
+            "ssn_encrypted": ssn_encrypted, "date_of_birth": datetime(1990, 1, 1).date(),
+            "mailing_address": "1 Probe Way", "is_active": True, "created_at": now, "updated_at": now,
+        }]
+        holders += [{
+            "name": f"Holder {i}", "email": f"holder{i}@bench.example.com", "password_hash": password_hash,
+            "ssn_encrypted": ssn_encrypted, "date_of_birth": datetime(1980, 1, 1).date(),
+            "mailing_address": f"{i} Bench St", "is_active": True, "created_at": now, "updated_at": now,
+        } for i in range(background_accounts)]
+        conn.execute(insert(AccountHolder), holders)
+
+        # Probe holder is id 1 with accounts 1 (checking) and 2 (savings)
+        accounts = [
+            {"account_holder_id": 1, "account_number": "9000000001", "routing_number": "123456789",
+             "account_type": "checking", "balance": Decimal("100000000.00"), "is_active": True,
+             "created_at": now, "updated_at": now},
+            {"account_holder_id": 1, "account_number": "9000000002", "routing_number": "123456789",
+             "account_type": "savings", "balance": Decimal("100000000.00"), "is_active": True,
+             "created_at": now, "updated_at": now},
+        ]
+        accounts += [{
+            "account_holder_id": i + 2, "account_number": f"{1000000000 + i}", "routing_number": "123456789",
+            "account_type": "checking", "balance": Decimal("1000.00"), "is_active": True,
+            "created_at": now, "updated_at": now,
+        } for i in range(background_accounts)]
+        conn.execute(insert(Account), accounts)
+
+        def transaction(account_id: int) -> dict:
+            created_at = now - timedelta(seconds=rng.randint(0, 90 * 86400))
+            return {
+                "transaction_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "account_id": account_id,
+                "transaction_type": rng.choice(("deposit", "withdrawal", "transfer")),
+                "amount": Decimal(rng.randint(100, 50000)) / 100,
+                "description": "Benchmark transaction",
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+        conn.execute(insert(Transaction), [transaction(1 + i % 2) for i in range(PROBE_TRANSACTIONS)])
+
+        for start in range(0, background, INSERT_CHUNK):
+            count = min(INSERT_CHUNK, background - start)
+            conn.execute(insert(Transaction), [
+                transaction(3 + rng.randrange(background_accounts)) for _ in range(count)
+            ])
+
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def bench_engine(bench_scale, tmp_path_factory):
+    """Engine bound to a private copy of the seeded database for this scale."""
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    cached = BENCH_DIR / f"bench-{bench_scale}-{_schema_fingerprint()}.db"
+    if not cached.exists():
+        partial = cached.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+        _seed(partial, bench_scale)
+        partial.rename(cached)
+
+    copy = tmp_path_factory.mktemp("bench") / cached.name
+    shutil.copyfile(cached, copy)
+
+    engine = create_engine(f"sqlite:///{copy}", connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def bench_db(bench_engine):
+    """Session on the seeded benchmark database."""
+    db = sessionmaker(autocommit=False, autoflush=False, bind=bench_engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def probe_user_id() -> int:
+    """ID of the probe account holder (see module docstring)."""
+    return 1
@@ -0,0 +1,446 @@
+#!/usr/bin/env python
+"""
+HTTP load-test harness with latency regression baselines.
+
+Runs each scenario at a fixed concurrency, reports throughput and
+p50/p95/p99 latency, and compares the results against a committed JSON
+baseline. Any scenario that regresses beyond the tolerance makes the run
+exit with status 1.
+
+Usage:
+    # In-process against the ASGI app (uses DATABASE_URL; run with DEBUG=false
+    # so SQL echo does not dominate the timings)
+    python -m benchmarks.load_test
+
+    # Against a running server
+    python -m benchmarks.load_test --base-url https://localhost:8443
+
+    # Pick scenarios, concurrency and request count
+    python -m benchmarks.load_test --scenarios deposit,withdraw -c 32 -n 2000
+
+    # Refresh the committed baseline after an intentional change
+    python -m benchmarks.load_test --write-baseline
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+DEFAULT_BASELINE = project_root / "benchmarks" / "baselines" / "load_asgi.json"
+ADMIN_AUTH = ("admin", "admin")
+PASSWORD = "loadtest-password"
+
+
+@dataclass
+class VirtualUser:
+    """A signed-up user with two funded accounts, owned by one worker."""
+    email: str
+    token: str
+    checking_id: int
+    savings_id: int
+    savings_number: str
+    routing_number: str
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass
+class ScenarioResult:
+    """Latency and throughput for one scenario."""
+    name: str
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    error_samples: List[str] = field(default_factory=list)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values: Values in ascending order
+        pct: Percentile (0 - 100)
+
+    Returns:
+        float: Percentile value (0.0 for an empty list)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _signup_payload(email: str) -> Dict[str, str]:
+    return {
+        "name": "Load Test",
+        "email": email,
+        "password": PASSWORD,
+        "ssn": "123-45-6789",
+        "date_of_birth": "1990-01-01",
+        "mailing_address": "1 Benchmark Way"
+    }
+
+
+def _check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url.path} -> "
+                           f"{response.status_code}: {response.text[:200]}")
+    return response
+
+
+async def create_virtual_user(client: httpx.AsyncClient, run_id: str, index: int) -> VirtualUser:
+    """
+    Sign up a user, open checking and savings accounts and fund them.
+
+    Args:
+        client: HTTP client
+        run_id: Unique run identifier (keeps emails unique across runs)
+        index: Worker index
+
+    Returns:
+        VirtualUser: Ready-to-use user
+    """
+    email = f"load-{run_id}-{index}@example.com"
+    token = _check(await client.post("/api/v1/auth/signup", json=_signup_payload(email))).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    checking = _check(await client.post(
+        "/api/v1/accounts", json={"account_type": "checking"}, headers=headers
+    )).json()
+    savings = _check(await client.post(
+        "/api/v1/accounts", json={"account_type": "savings"}, headers=headers
+    )).json()
+
+    for account in (checking, savings):
+        _check(await client.post(
+            "/api/v1/transactions/deposit",
+            json={"account_id": account["id"], "amount": "1000000.00", "description": "Load test funding"},
+            headers=headers
+        ))
+
+    return VirtualUser(
+        email=email,
+        token=token,
+        checking_id=checking["id"],
+        savings_id=savings["id"],
+        savings_number=savings["account_number"],
+        routing_number=savings["routing_number"]
+    )
+
+
+# Scenario: (client, user, run_id, worker, iteration) -> response
+ScenarioFn = Callable[[httpx.AsyncClient, VirtualUser, str, int, int], Awaitable[httpx.Response]]
+
+
+async def _signup(client, user, run_id, worker, i):
+    return await client.post(
+        "/api/v1/auth/signup", json=_signup_payload(f"signup-{run_id}-{worker}-{i}@example.com")
+    )
+
+
+async def _login(client, user, run_id, worker, i):
+    return await client.post("/api/v1/auth/login", json={"email": user.email, "password": PASSWORD})
+
+
+async def _deposit(client, user, run_id, worker, i):
+    return await client.post(
+        "/api/v1/transactions/deposit",
+        json={"account_id": user.checking_id, "amount": "10.00", "description": "Load test deposit"},
+        headers=user.headers
+    )
+
+
+async def _withdraw(client, user, run_id, worker, i):
+    return await client.post(
+        "/api/v1/transactions/withdraw",
+        json={"account_id": user.checking_id, "amount": "10.00", "description": "Load test withdrawal"},
+        headers=user.headers
+    )
+
+
+async def _transfer(client, user, run_id, worker, i):
+    return await client.post(
+        "/api/v1/transactions/transfer",
+        json={
+            "from_account_id": user.checking_id,
+            "to_routing_number": user.routing_number,
+            "to_account_number": user.savings_number,
+            "amount": "1.00",
+            "description": "Load test transfer"
+        },
+        headers=user.headers
+    )
+
+
+async def _transactions(client, user, run_id, worker, i):
+    return await client.get("/api/v1/transactions", headers=user.headers)
+
+
+async def _statements(client, user, run_id, worker, i):
+    return await client.get("/api/v1/statements", headers=user.headers)
+
+
+async def _admin_dashboard(client, user, run_id, worker, i):
+    return await client.get("/admin", auth=ADMIN_AUTH)
+
+
+SCENARIOS: Dict[str, ScenarioFn] = {
+    "signup": _signup,
+    "login": _login,
+    "deposit": _deposit,
+    "withdraw": _withdraw,
+    "transfer": _transfer,
+    "transactions": _transactions,
+    "statements": _statements,
+    "admin_dashboard": _admin_dashboard,
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    users: List[VirtualUser],
+    total_requests: int,
+    run_id: str
+) -> ScenarioResult:
+    """
+    Run one scenario with one worker per virtual user.
+
+    Args:
+        client: HTTP client
+        name: Scenario name (key of SCENARIOS)
+        users: Virtual users; their count is the concurrency
+        total_requests: Requests to issue across all workers
+        run_id: Unique run identifier
+
+    Returns:
+        ScenarioResult: Measured latency and throughput
+    """
+    scenario = SCENARIOS[name]
+    concurrency = len(users)
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    async def worker(index: int, count: int) -> None:
+        user = users[index]
+        for i in range(count):
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, user, run_id, index, i)
+                failed = response.status_code >= 400
+                detail = f"{response.status_code}: {response.text[:120]}"
+            except httpx.HTTPError as e:
+                failed, detail = True, repr(e)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if failed:
+                errors.append(detail)
+
+    per_worker = [total_requests // concurrency + (1 if i < total_requests % concurrency else 0)
+                  for i in range(concurrency)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i, n) for i, n in enumerate(per_worker) if n))
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    return ScenarioResult(
+        name=name,
+        requests=len(latencies),
+        errors=len(errors),
+        duration_s=round(duration, 3),
+        throughput_rps=round(len(latencies) / duration, 2) if duration else 0.0,
+        p50_ms=round(percentile(latencies, 50), 2),
+        p95_ms=round(percentile(latencies, 95), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+        error_samples=errors[:5]
+    )
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    scenarios: List[str],
+    concurrency: int,
+    requests_per_scenario: int
+) -> List[ScenarioResult]:
+    """
+    Create virtual users and run the given scenarios one after another.
+
+    Args:
+        client: HTTP client
+        scenarios: Scenario names
+        concurrency: Number of concurrent workers
+        requests_per_scenario: Requests to issue per scenario
+
+    Returns:
+        List[ScenarioResult]: One result per scenario
+    """
+    run_id = uuid.uuid4().hex[:8]
+    users = await asyncio.gather(*(create_virtual_user(client, run_id, i) for i in range(concurrency)))
+
+    results = []
+    for name in scenarios:
+        results.append(await run_scenario(client, name, list(users), requests_per_scenario, run_id))
+    return results
+
+
+def compare_to_baseline(
+    results: List[ScenarioResult],
+    baseline: Dict,
+    tolerance: float
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    A scenario regresses when its p95 latency exceeds the baseline by more
+    than ``tolerance``, its throughput drops by more than ``tolerance``, or
+    it produced errors.
+
+    Args:
+        results: Measured results
+        baseline: Baseline document (see ``baseline_document``)
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        List[str]: Human-readable regressions (empty if none)
+    """
+    regressions = []
+    expected = baseline.get("scenarios", {})
+
+    for result in results:
+        if result.errors:
+            regressions.append(f"{result.name}: {result.errors} failed requests "
+                               f"(e.g. {result.error_samples[0]})")
+
+        reference = expected.get(result.name)
+        if reference is None:
+            continue
+
+        max_p95 = reference["p95_ms"] * (1 + tolerance)
+        if result.p95_ms > max_p95:
+            regressions.append(f"{result.name}: p95 {result.p95_ms}ms > {max_p95:.2f}ms "
+                               f"(baseline {reference['p95_ms']}ms)")
+
+        min_rps = reference["throughput_rps"] * (1 - tolerance)
+        if result.throughput_rps < min_rps:
+            regressions.append(f"{result.name}: throughput {result.throughput_rps} req/s < {min_rps:.2f} req/s "
+                               f"(baseline {reference['throughput_rps']} req/s)")
+
+    return regressions
+
+
+def baseline_document(results: List[ScenarioResult], concurrency: int, requests: int) -> Dict:
+    """Build the JSON document stored as a baseline."""
+    return {
+        "concurrency": concurrency,
+        "requests_per_scenario": requests,
+        "scenarios": {
+            r.name: {"throughput_rps": r.throughput_rps, "p50_ms": r.p50_ms, "p95_ms": r.p95_ms, "p99_ms": r.p99_ms}
+            for r in results
+        }
+    }
+
+
+def print_report(results: List[ScenarioResult]) -> None:
+    """Print a results table."""
+    print(f"{'scenario':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r.name:<16}{r.requests:>10}{r.errors:>8}{r.throughput_rps:>10}"
+              f"{r.p50_ms:>10}{r.p95_ms:>10}{r.p99_ms:>10}")
+
+
+def _make_client(base_url: Optional[str]) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, verify=False, timeout=30.0)
+
+    from app.config import settings
+    from app.main import app
+    from app.db.base import Base
+    from app.db.session import engine
+
+    # Each virtual user's sustained burst is exactly what the velocity rules
+    # stop; run a remote target with VELOCITY_ENABLED=false for the same reason
+    settings.velocity_enabled = False
+    Base.metadata.create_all(bind=engine)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=30.0)
+
+
+async def _main(args: argparse.Namespace) -> int:
+    scenarios = [s.strip() for s in args.scenarios.split(",")] if args.scenarios else list(SCENARIOS)
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+        return 2
+
+    async with _make_client(args.base_url) as client:
+        results = await run_load_test(client, scenarios, args.concurrency, args.requests)
+
+    print_report(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps([asdict(r) for r in results], indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.write_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        document = baseline_document(results, args.concurrency, args.requests)
+        baseline_path.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; skipping comparison")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    if (baseline.get("concurrency"), baseline.get("requests_per_scenario")) != (args.concurrency, args.requests):
+        print(f"Baseline was recorded with -c {baseline.get('concurrency')} -n {baseline.get('requests_per_scenario')}; "
+              f"rerun with the same settings to compare")
+        return 2
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("\nPERFORMANCE REGRESSION against " + str(baseline_path))
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+
+    print(f"\nNo regressions against {baseline_path} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP load test with latency baselines")
+    parser.add_argument("--base-url", help="Target a running server instead of the in-process ASGI app")
+    parser.add_argument("--scenarios", help=f"Comma-separated scenarios (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Concurrent workers (default: 8)")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="Requests per scenario (default: 200)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed relative slowdown before failing (default: 0.5)")
+    parser.add_argument("--write-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--output", help="Write full results as JSON")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
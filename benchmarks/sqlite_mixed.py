@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+Mixed read/write throughput benchmark for the SQLite profiles.
+
+Runs the same workload twice - once with SQLite defaults (rollback journal,
+no busy timeout, no retries) and once with the tuned profile from
+app/db/sqlite_tuning.py - and reports operations per second, p95 latency
+and failed operations for each.
+
+Each worker thread owns one account holder and loops over
+TransactionService.create_deposit (writes) and
+TransactionService.get_transactions (reads) in the configured ratio.
+
+Usage:
+    python -m benchmarks.sqlite_mixed --threads 8 --seconds 10 --write-ratio 0.2
+"""
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config import settings  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.sqlite_tuning import install_sqlite_profile  # noqa: E402
+from app.models.account import Account  # noqa: E402
+from app.models.account_holder import AccountHolder  # noqa: E402
+from app.schemas.transaction import DepositRequest  # noqa: E402
+from app.services.transaction_service import TransactionService  # noqa: E402
+
+
+def _seed(engine, users: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(AccountHolder), [{
+            "name": f"Bench {i}", "email": f"bench{i}@example.com", "password_hash": "x",
+            "ssn_encrypted": b"x", "date_of_birth": date(1990, 1, 1), "mailing_address": "1 Bench St",
+            "is_active": True,
+        } for i in range(users)])
+        conn.execute(insert(Account), [{
+            "account_holder_id": i + 1, "account_number": f"{5000000000 + i}", "routing_number": "123456789",
+            "account_type": "checking", "balance": Decimal("0.00"), "is_active": True,
+        } for i in range(users)])
+
+
+def run_profile(tuned: bool, threads: int, seconds: float, write_ratio: float) -> dict:
+    """
+    Run the mixed workload against a fresh database.
+
+    Args:
+        tuned: Apply the tuned SQLite profile and busy retries
+        threads: Concurrent worker threads
+        seconds: Duration of the measured run
+        write_ratio: Fraction of operations that are writes
+
+    Returns:
+        dict: Throughput and latency summary
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="sqlite-bench-"))
+    engine = create_engine(
+        f"sqlite:///{workdir / 'bench.db'}",
+        connect_args={"check_same_thread": False, "timeout": 0 if not tuned else 5},
+        pool_size=threads,
+    )
+    if tuned:
+        install_sqlite_profile(engine)
+    _seed(engine, threads)
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    original_retries = settings.db_busy_retries
+    settings.db_busy_retries = original_retries if tuned else 0
+
+    stop = threading.Event()
+    results = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+    lock = threading.Lock()
+
+    def worker(user_id: int) -> None:
+        rng = random.Random(user_id)
+        db = SessionFactory()
+        deposit = DepositRequest(account_id=user_id, amount=Decimal("1.00"), description="bench")
+        reads = writes = errors = 0
+        latencies = []
+        try:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    if rng.random() < write_ratio:
+                        TransactionService.create_deposit(db, user_id, deposit)
+                        writes += 1
+                    else:
+                        TransactionService.get_transactions(db, user_id)
+                        db.rollback()  # end the read transaction
+                        reads += 1
+                except OperationalError:
+                    db.rollback()
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+        finally:
+            db.close()
+            with lock:
+                results["reads"] += reads
+                results["writes"] += writes
+                results["errors"] += errors
+                results["latencies"].extend(latencies)
+
+    workers = [threading.Thread(target=worker, args=(i + 1,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in workers:
+        t.join()
+
+    settings.db_busy_retries = original_retries
+    engine.dispose()
+
+    latencies = sorted(results["latencies"])
+    ops = results["reads"] + results["writes"]
+    return {
+        "profile": "tuned" if tuned else "default",
+        "ops_per_s": round(ops / seconds, 1),
+        "reads_per_s": round(results["reads"] / seconds, 1),
+        "writes_per_s": round(results["writes"] / seconds, 1),
+        "errors": results["errors"],
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite mixed read/write throughput benchmark")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print(f"{'profile':<10}{'ops/s':>10}{'reads/s':>10}{'writes/s':>10}{'errors':>8}{'p95 ms':>10}")
+    for tuned in (False, True):
+        r = run_profile(tuned, args.threads, args.seconds, args.write_ratio)
+        print(f"{r['profile']:<10}{r['ops_per_s']:>10}{r['reads_per_s']:>10}{r['writes_per_s']:>10}"
+              f"{r['errors']:>8}{r['p95_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Service-level microbenchmarks.
+
+Run with:
+    pytest benchmarks --no-cov --bench-scales=1000,100000,1000000 --benchmark-autosave
+
+Database-backed benchmarks are parametrized by seeded transaction count so
+each group shows how a call scales with table size. Autosaved runs are
+stored in .benchmarks/ keyed by commit; compare them with
+``pytest-benchmark compare`` or ``--benchmark-compare``.
+"""
+from decimal import Decimal
+
+import pytest
+
+from app.config import settings
+from app.core.security import create_access_token, decode_token, hash_password
+from app.schemas.transaction import DepositRequest, WithdrawalRequest, TransferRequest
+from app.services.admin_service import AdminService
+from app.services.analytics_service import AnalyticsService, analytics_cache
+from app.services.search_service import SearchService
+from app.services.statement_service import StatementService
+from app.services.transaction_service import TransactionService
+from app.services.velocity_service import VelocityService, payee_key
+from app.utils.encryption import FORMATS, EncryptionService, row_aad
+from app.utils.generators import generate_account_number, generate_card_number
+
+
+WRITE_ROUNDS = 200
+
+
+@pytest.mark.benchmark(group="get_transactions")
+def test_get_transactions(benchmark, bench_db, probe_user_id):
+    result = benchmark(TransactionService.get_transactions, bench_db, probe_user_id)
+    assert result
+
+
+@pytest.mark.benchmark(group="get_user_statement")
+def test_get_user_statement(benchmark, bench_db, probe_user_id):
+    result = benchmark(StatementService.get_user_statement, bench_db, probe_user_id)
+    assert result.accounts
+
+
+@pytest.mark.benchmark(group="get_analytics")
+@pytest.mark.parametrize("bucket", ["day", "month"])
+def test_get_analytics(benchmark, bench_db, probe_user_id, bucket):
+    def uncached():
+        analytics_cache.clear()
+        return AnalyticsService.get_analytics(bench_db, probe_user_id, bucket)
+
+    assert benchmark(uncached).by_account
+
+
+@pytest.mark.benchmark(group="get_dashboard_stats")
+def test_get_dashboard_stats(benchmark, bench_db):
+    result = benchmark(AdminService.get_dashboard_stats, bench_db)
+    assert result["total_transactions"] > 0
+
+
+@pytest.mark.benchmark(group="admin_search")
+@pytest.mark.parametrize("query", ["probe hold", "benchmark"])
+def test_admin_search(benchmark, bench_db, query):
+    # "probe hold" matches one holder (ranked); "benchmark" matches every transaction (newest first)
+    assert benchmark(SearchService.search, bench_db, query).results
+
+
+@pytest.mark.benchmark(group="generate_account_number")
+def test_generate_account_number(benchmark, bench_db):
+    benchmark(generate_account_number, bench_db)
+
+
+@pytest.mark.benchmark(group="generate_card_number")
+def test_generate_card_number(benchmark):
+    assert len(benchmark(generate_card_number)) == 16
+
+
+@pytest.mark.benchmark(group="encryption")
+@pytest.mark.parametrize("ciphertext_format", FORMATS)
+def test_encrypt(benchmark, ciphertext_format):
+    service = EncryptionService(ciphertext_format=ciphertext_format)
+    benchmark(service.encrypt, "123-45-6789", row_aad("account_holders", 1))
+
+
+@pytest.mark.benchmark(group="encryption")
+@pytest.mark.parametrize("ciphertext_format", FORMATS)
+def test_decrypt(benchmark, ciphertext_format):
+    service = EncryptionService(ciphertext_format=ciphertext_format)
+    aad = row_aad("account_holders", 1)
+    encrypted = service.encrypt("123-45-6789", aad)
+    assert benchmark(service.decrypt, encrypted, aad) == "123-45-6789"
+
+
+@pytest.mark.benchmark(group="velocity_check")
+def test_velocity_check(benchmark, bench_db):
+    payee = payee_key(settings.routing_number, "9000000002")
+    # Rebuild the account's windows once
+    VelocityService.release(VelocityService.reserve(bench_db, 1, Decimal("10.00"), payee))
+    benchmark(lambda: VelocityService.release(VelocityService.reserve(bench_db, 1, Decimal("10.00"), payee)))
+
+
+@pytest.mark.benchmark(group="decode_token")
+def test_decode_token(benchmark):
+    token = create_access_token({"user_id": 1, "email": "probe@bench.example.com"})
+    assert benchmark(decode_token, token)["user_id"] == 1
+
+
+@pytest.mark.benchmark(group="hash_password")
+def test_hash_password(benchmark):
+    benchmark.pedantic(hash_password, args=("benchmark-password",), rounds=20, warmup_rounds=1)
+
+
+# Write benchmarks run last so they do not grow the probe holder's history
+# before the read benchmarks are measured.
+
+@pytest.mark.benchmark(group="create_deposit")
+def test_create_deposit(benchmark, bench_db, probe_user_id):
+    request = DepositRequest(account_id=1, amount=Decimal("10.00"), description="bench")
+    benchmark.pedantic(
+        TransactionService.create_deposit, args=(bench_db, probe_user_id, request),
+        rounds=WRITE_ROUNDS, warmup_rounds=5
+    )
+
+
+@pytest.mark.benchmark(group="create_withdrawal")
+def test_create_withdrawal(benchmark, bench_db, probe_user_id):
+    request = WithdrawalRequest(account_id=1, amount=Decimal("10.00"), description="bench")
+    benchmark.pedantic(
+        TransactionService.create_withdrawal, args=(bench_db, probe_user_id, request),
+        rounds=WRITE_ROUNDS, warmup_rounds=5
+    )
+
+
+@pytest.mark.benchmark(group="create_transfer")
+def test_create_internal_transfer(benchmark, bench_db, probe_user_id):
+    request = TransferRequest(
+        from_account_id=1, to_routing_number=settings.routing_number,
+        to_account_number="9000000002", amount=Decimal("1.00"), description="bench"
+    )
+    benchmark.pedantic(
+        TransactionService.create_transfer, args=(bench_db, probe_user_id, request),
+        rounds=WRITE_ROUNDS, warmup_rounds=5
+    )
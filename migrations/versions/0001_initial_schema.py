@@ -0,0 +1,95 @@
+"""
+Initial schema: account holders, accounts, transactions and cards.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-12-06
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "account_holders",
+        *_timestamps(),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("ssn_encrypted", sa.LargeBinary(), nullable=False),
+        sa.Column("date_of_birth", sa.Date(), nullable=False),
+        sa.Column("mailing_address", sa.String(500), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_account_holders_id", "account_holders", ["id"])
+    op.create_index("ix_account_holders_email", "account_holders", ["email"], unique=True)
+
+    op.create_table(
+        "accounts",
+        *_timestamps(),
+        sa.Column("account_holder_id", sa.Integer(),
+                  sa.ForeignKey("account_holders.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("account_number", sa.String(20), nullable=False),
+        sa.Column("routing_number", sa.String(9), nullable=False),
+        sa.Column("account_type", sa.String(10), nullable=False),
+        sa.Column("balance", sa.Numeric(15, 2), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.CheckConstraint("account_type IN ('checking', 'savings')", name="check_account_type"),
+        sa.CheckConstraint("balance >= 0", name="check_positive_balance"),
+    )
+    op.create_index("ix_accounts_id", "accounts", ["id"])
+    op.create_index("ix_accounts_account_holder_id", "accounts", ["account_holder_id"])
+    op.create_index("ix_accounts_account_number", "accounts", ["account_number"], unique=True)
+
+    op.create_table(
+        "transactions",
+        *_timestamps(),
+        sa.Column("transaction_id", sa.String(36), nullable=False),
+        sa.Column("account_id", sa.Integer(),
+                  sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("transaction_type", sa.String(20), nullable=False),
+        sa.Column("amount", sa.Numeric(15, 2), nullable=False),
+        sa.Column("peer_routing_number", sa.String(9), nullable=True),
+        sa.Column("peer_account_number", sa.String(20), nullable=True),
+        sa.Column("description", sa.String(500), nullable=True),
+        sa.CheckConstraint("transaction_type IN ('deposit', 'withdrawal', 'transfer')",
+                           name="check_transaction_type"),
+        sa.CheckConstraint("amount > 0", name="check_positive_amount"),
+    )
+    op.create_index("ix_transactions_id", "transactions", ["id"])
+    op.create_index("ix_transactions_transaction_id", "transactions", ["transaction_id"], unique=True)
+    op.create_index("ix_transactions_account_id", "transactions", ["account_id"])
+
+    op.create_table(
+        "cards",
+        *_timestamps(),
+        sa.Column("account_id", sa.Integer(),
+                  sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("card_number_encrypted", sa.LargeBinary(), nullable=False),
+        sa.Column("card_type", sa.String(10), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.CheckConstraint("card_type IN ('credit', 'debit')", name="check_card_type"),
+    )
+    op.create_index("ix_cards_id", "cards", ["id"])
+    op.create_index("ix_cards_account_id", "cards", ["account_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("cards")
+    op.drop_table("transactions")
+    op.drop_table("accounts")
+    op.drop_table("account_holders")
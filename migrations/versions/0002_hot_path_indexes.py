@@ -0,0 +1,60 @@
+"""
+Composite indexes for the hot read paths.
+
+- transactions(account_id, created_at DESC, id): per-account listing and
+  statement range scans return rows in order without a sort.
+- accounts(account_holder_id, id): the per-user account id lookup done by
+  every listing endpoint is answered from the index alone.
+- transactions(created_at), accounts(created_at): "most recent" queries of
+  the admin dashboard.
+
+The single-column indexes on transactions.account_id and
+accounts.account_holder_id are prefixes of the new ones and are dropped.
+On PostgreSQL the indexes are built with CREATE INDEX CONCURRENTLY so
+writes are not blocked.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _online(operation) -> None:
+    """Run an index operation outside a transaction where the backend supports it."""
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            operation(postgresql_concurrently=True)
+    else:
+        operation()
+
+
+def upgrade() -> None:
+    _online(lambda **kw: op.create_index(
+        "ix_transactions_account_id_created_at", "transactions",
+        ["account_id", sa.text("created_at DESC"), "id"], **kw
+    ))
+    _online(lambda **kw: op.create_index(
+        "ix_accounts_account_holder_id_id", "accounts", ["account_holder_id", "id"], **kw
+    ))
+    _online(lambda **kw: op.create_index("ix_transactions_created_at", "transactions", ["created_at"], **kw))
+    _online(lambda **kw: op.create_index("ix_accounts_created_at", "accounts", ["created_at"], **kw))
+
+    _online(lambda **kw: op.drop_index("ix_transactions_account_id", table_name="transactions", **kw))
+    _online(lambda **kw: op.drop_index("ix_accounts_account_holder_id", table_name="accounts", **kw))
+
+
+def downgrade() -> None:
+    op.create_index("ix_accounts_account_holder_id", "accounts", ["account_holder_id"])
+    op.create_index("ix_transactions_account_id", "transactions", ["account_id"])
+    op.drop_index("ix_accounts_created_at", table_name="accounts")
+    op.drop_index("ix_transactions_created_at", table_name="transactions")
+    op.drop_index("ix_accounts_account_holder_id_id", table_name="accounts")
+    op.drop_index("ix_transactions_account_id_created_at", table_name="transactions")
@@ -0,0 +1,45 @@
+"""
+Cold-tier table for archived transactions.
+
+Same columns as ``transactions`` plus ``archived_at``; ids are copied from
+the hot table rather than generated.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transactions_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.Column("transaction_id", sa.String(36), nullable=False, unique=True),
+        sa.Column("account_id", sa.Integer(),
+                  sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("transaction_type", sa.String(20), nullable=False),
+        sa.Column("amount", sa.Numeric(15, 2), nullable=False),
+        sa.Column("peer_routing_number", sa.String(9), nullable=True),
+        sa.Column("peer_account_number", sa.String(20), nullable=True),
+        sa.Column("description", sa.String(500), nullable=True),
+    )
+    op.create_index(
+        "ix_transactions_archive_account_id_created_at", "transactions_archive",
+        ["account_id", sa.text("created_at DESC"), "id"]
+    )
+    op.create_index("ix_transactions_archive_created_at", "transactions_archive", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("transactions_archive")
@@ -0,0 +1,67 @@
+"""
+Double-entry ledger: journal entries, postings and transaction links.
+
+Existing transactions get ``journal_id``/``direction`` when
+``scripts/rebuild_balances.py --backfill`` is run.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "journal_entries",
+        *_timestamps(),
+        sa.Column("journal_id", sa.String(36), nullable=False),
+        sa.Column("entry_type", sa.String(20), nullable=False),
+        sa.Column("description", sa.String(500), nullable=True),
+    )
+    op.create_index("ix_journal_entries_id", "journal_entries", ["id"])
+    op.create_index("ix_journal_entries_journal_id", "journal_entries", ["journal_id"], unique=True)
+
+    op.create_table(
+        "postings",
+        *_timestamps(),
+        sa.Column("journal_entry_id", sa.Integer(),
+                  sa.ForeignKey("journal_entries.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("ledger_code", sa.String(32), nullable=False),
+        sa.Column("account_id", sa.Integer(),
+                  sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("amount", sa.Numeric(15, 2), nullable=False),
+    )
+    op.create_index("ix_postings_id", "postings", ["id"])
+    op.create_index("ix_postings_journal_entry_id", "postings", ["journal_entry_id"])
+    op.create_index("ix_postings_account_id_id", "postings", ["account_id", "id"])
+
+    for table in ("transactions", "transactions_archive"):
+        op.add_column(table, sa.Column("journal_id", sa.String(36), nullable=True))
+        op.add_column(table, sa.Column("direction", sa.String(6), nullable=True))
+    op.create_index("ix_transactions_journal_id", "transactions", ["journal_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_journal_id", table_name="transactions")
+    for table in ("transactions_archive", "transactions"):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("direction")
+            batch.drop_column("journal_id")
+    op.drop_table("postings")
+    op.drop_table("journal_entries")
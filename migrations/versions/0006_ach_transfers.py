@@ -0,0 +1,48 @@
+"""
+Outbound ACH transfers awaiting settlement.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ach_transfers",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("transaction_id", sa.String(36), nullable=False, unique=True),
+        sa.Column("account_id", sa.Integer(),
+                  sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("to_routing_number", sa.String(9), nullable=False),
+        sa.Column("to_account_number", sa.String(20), nullable=False),
+        sa.Column("amount", sa.Numeric(15, 2), nullable=False),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("batch_id", sa.String(36), nullable=True),
+        sa.Column("trace_number", sa.String(15), nullable=True),
+        sa.Column("settled_at", sa.DateTime(), nullable=True),
+        sa.Column("return_code", sa.String(3), nullable=True),
+        sa.Column("returned_at", sa.DateTime(), nullable=True),
+        sa.CheckConstraint("status IN ('pending', 'batched', 'settled', 'returned')", name="check_ach_status"),
+        sa.CheckConstraint("amount > 0", name="check_ach_positive_amount"),
+    )
+    op.create_index("ix_ach_transfers_id", "ach_transfers", ["id"])
+    op.create_index("ix_ach_transfers_status", "ach_transfers", ["status"])
+    op.create_index(
+        "ix_ach_transfers_batch_id_routing", "ach_transfers", ["batch_id", "to_routing_number", "id"]
+    )
+    op.create_index("ix_ach_transfers_batch_id_trace", "ach_transfers", ["batch_id", "trace_number"])
+
+
+def downgrade() -> None:
+    op.drop_table("ach_transfers")
@@ -0,0 +1,37 @@
+"""
+Materialized monthly statements for closed periods.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_statements",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "account_holder_id", sa.Integer(),
+            sa.ForeignKey("account_holders.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("month", sa.String(7), nullable=False),
+        sa.Column("transaction_count", sa.Integer(), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.UniqueConstraint("account_holder_id", "month", name="uq_monthly_statements_holder_month"),
+    )
+    op.create_index("ix_monthly_statements_id", "monthly_statements", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_statements")
@@ -0,0 +1,31 @@
+"""
+Full-text search index for the admin portal (SQLite FTS5 table and sync triggers).
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+from app.db.search_index import backfill_statements, drop_search_index_ddl, search_index_ddl
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Other databases have no FTS5; the search service falls back to LIKE there
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in search_index_ddl() + backfill_statements():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in drop_search_index_ddl():
+        op.execute(statement)
@@ -0,0 +1,47 @@
+"""
+Balance reconciliation state: per-account reconciled totals and run watermarks.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reconciled_balances",
+        sa.Column(
+            "account_id", sa.Integer(),
+            sa.ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True, autoincrement=False
+        ),
+        sa.Column("transaction_total", sa.Numeric(15, 2), nullable=False),
+        sa.Column("through_transaction_id", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_table(
+        "reconciliation_runs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("full", sa.Boolean(), nullable=False),
+        sa.Column("since_transaction_id", sa.Integer(), nullable=False),
+        sa.Column("watermark", sa.Integer(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("accounts_checked", sa.Integer(), nullable=True),
+        sa.Column("discrepancies", sa.Integer(), nullable=True),
+        sa.Column("report_path", sa.String(500), nullable=True),
+    )
+    op.create_index("ix_reconciliation_runs_id", "reconciliation_runs", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("reconciliation_runs")
+    op.drop_table("reconciled_balances")
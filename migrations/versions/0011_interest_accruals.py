@@ -0,0 +1,39 @@
+"""
+Daily interest accruals on savings accounts.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "interest_accruals",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("business_date", sa.Date(), nullable=False),
+        sa.Column(
+            "account_id", sa.Integer(),
+            sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("balance", sa.Numeric(15, 2), nullable=False),
+        sa.Column("rate", sa.Numeric(9, 6), nullable=False),
+        sa.Column("amount", sa.Numeric(15, 2), nullable=False),
+        sa.Column("journal_id", sa.String(36), nullable=True),
+        sa.UniqueConstraint("business_date", "account_id", name="uq_interest_accruals_date_account"),
+    )
+    op.create_index("ix_interest_accruals_id", "interest_accruals", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("interest_accruals")
@@ -0,0 +1,57 @@
+"""
+Never reuse transaction ids on SQLite (AUTOINCREMENT).
+
+Without AUTOINCREMENT SQLite hands out max(id) + 1, so once the newest
+transactions are archived their ids come back, and archiving the new rows
+fails on the archive's primary key. The table is rebuilt with
+AUTOINCREMENT and its sequence starts after the highest id in either tier.
+Other databases use sequences, which never go back.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.search_index import search_index_ddl
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def _rebuild_transactions(autoincrement: bool) -> None:
+    with op.batch_alter_table(
+        "transactions", recreate="always", table_kwargs={"sqlite_autoincrement": autoincrement}
+    ):
+        pass
+    # Reflection loses the DESC of the listing index (see migration 0002)
+    op.drop_index("ix_transactions_account_id_created_at", table_name="transactions")
+    op.create_index(
+        "ix_transactions_account_id_created_at", "transactions",
+        ["account_id", sa.text("created_at DESC"), "id"]
+    )
+    # Dropping the old table dropped its search index triggers
+    for statement in search_index_ddl():
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _rebuild_transactions(autoincrement=True)
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'transactions'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'transactions', max("
+        "coalesce((SELECT max(id) FROM transactions), 0), "
+        "coalesce((SELECT max(id) FROM transactions_archive), 0))"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _rebuild_transactions(autoincrement=False)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Accrue one business date's interest on all savings accounts.
+
+Safe to re-run: accounts already accrued for the date are skipped, so an
+interrupted run resumes where it stopped (e.g. from cron shortly after
+midnight UTC).
+
+Usage:
+    python scripts/accrue_interest.py                      # yesterday
+    python scripts/accrue_interest.py --date 2026-10-18
+        [--rate 0.04] [--chunk-size N]
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.session import SessionLocal
+from app.services.interest_service import InterestService
+
+
+def main():
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+
+    parser = argparse.ArgumentParser(description="Accrue daily interest on savings accounts")
+    parser.add_argument("--date", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date(), default=yesterday,
+                        help=f"business date YYYY-MM-DD (default: {yesterday})")
+    parser.add_argument("--rate", type=Decimal, default=settings.savings_interest_rate, help="annual rate")
+    parser.add_argument("--chunk-size", type=int, default=settings.interest_chunk_size)
+    args = parser.parse_args()
+
+    def report(status):
+        print(f"\r{status['accrued']} accounts accrued, {status['credited']} credited "
+              f"({status['accounts_per_second']} accounts/s)", end="", flush=True)
+
+    db = SessionLocal()
+    try:
+        status = InterestService.accrue(db, args.date, args.chunk_size, args.rate, progress=report)
+        print()
+        print(f"Accrued {args.date}: {status['accrued']} accounts, credited {status['interest']} "
+              f"to {status['credited']} in {status['elapsed_s']}s ({status['accounts_per_second']} accounts/s)")
+    except Exception as e:
+        logger.error(f"Interest accrual failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
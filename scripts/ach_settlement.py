@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Outbound ACH settlement.
+
+Usage:
+    python scripts/ach_settlement.py sweep                  # write NACHA file(s) for pending transfers
+    python scripts/ach_settlement.py settle BATCH_ID        # operator confirmed the file
+    python scripts/ach_settlement.py returns BATCH_ID FILE  # apply returns (CSV: trace_number,return_code)
+"""
+import argparse
+import csv
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.logging_config import logger
+from app.db.session import SessionLocal
+from app.services.settlement_service import SettlementService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Outbound ACH settlement")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sweep = commands.add_parser("sweep", help="batch pending transfers into NACHA files")
+    sweep.add_argument("--output-dir", default=None)
+    sweep.add_argument("--chunk-size", type=int, default=None)
+
+    settle = commands.add_parser("settle", help="mark a batch settled")
+    settle.add_argument("batch_id")
+
+    returns = commands.add_parser("returns", help="apply returned entries")
+    returns.add_argument("batch_id")
+    returns.add_argument("file", type=Path)
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "sweep":
+            summaries = SettlementService.run_cycle(db, args.output_dir, args.chunk_size)
+            for s in summaries:
+                print(f"{s['batch_id']}: {s['entries']} entries in {s['batches']} batches, "
+                      f"total {s['total']} -> {s['path']}")
+            if not summaries:
+                print("No pending transfers")
+        elif args.command == "settle":
+            print(f"Settled {SettlementService.settle(db, args.batch_id)} transfers")
+        else:
+            with open(args.file, newline="") as f:
+                rows = [(row[0].strip(), row[1].strip()) for row in csv.reader(f) if row]
+            print(f"Returned {SettlementService.process_returns(db, args.batch_id, rows)} transfers")
+    except Exception as e:
+        logger.error(f"ACH settlement failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Move old transactions from the hot table into transactions_archive.
+
+Safe to run repeatedly (e.g. nightly from cron); each batch commits on its
+own, so an interrupted run resumes where it stopped.
+
+Usage:
+    python scripts/archive_transactions.py [--horizon-days 365] [--batch-size 1000] [--max-batches N]
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.session import SessionLocal
+from app.services.archive_service import ArchiveService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive transactions older than the horizon")
+    parser.add_argument("--horizon-days", type=int, default=settings.archive_horizon_days)
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    before = datetime.utcnow() - timedelta(days=args.horizon_days)
+    db = SessionLocal()
+    try:
+        archived = ArchiveService.archive_transactions(db, before, args.batch_size, args.max_batches)
+        print(f"Archived {archived} transactions created before {before.isoformat()}")
+    except Exception as e:
+        logger.error(f"Archiving failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Bulk-import account holders and their accounts from a CSV file.
+
+Rows are streamed in chunks; passwords are hashed across a process pool
+and each chunk is committed and checkpointed, so an interrupted import can
+be re-run with the same arguments and resumes where it stopped. Rows that
+cannot be imported (invalid data, duplicate or already registered email)
+are skipped and can be written to a rejects file.
+
+CSV header: name,email,password,ssn,date_of_birth,mailing_address[,accounts]
+
+Usage:
+    python scripts/import_holders.py partner_customers.csv
+        [--chunk-size N] [--workers N] [--rejects rejects.csv] [--reset]
+"""
+import argparse
+import csv
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.session import SessionLocal, dispose_engines
+from app.server import available_cpus
+from app.services.import_service import ImportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-import account holders from CSV")
+    parser.add_argument("csv", help="CSV file with a header row")
+    parser.add_argument("--chunk-size", type=int, default=settings.import_chunk_size)
+    parser.add_argument("--workers", type=int, default=settings.import_workers,
+                        help="password-hashing processes (0 = available CPUs)")
+    parser.add_argument("--checkpoint", default=settings.import_checkpoint_file)
+    parser.add_argument("--rejects", default=None, help="write skipped rows with the reason to this CSV")
+    parser.add_argument("--reset", action="store_true", help="ignore the checkpoint and start from the first row")
+    args = parser.parse_args()
+
+    if args.reset:
+        Path(args.checkpoint).unlink(missing_ok=True)
+    workers = args.workers or available_cpus()
+
+    def report(status):
+        print(f"\r{status['rows']} rows: imported {status['imported']}, rejected {status['rejected']} "
+              f"({status['rows_per_second']} rows/s)", end="", flush=True)
+
+    db = SessionLocal()
+    try:
+        with ExitStack() as stack:
+            reject = None
+            if args.rejects:
+                rejects_file = stack.enter_context(open(args.rejects, "a", newline=""))
+                writer = csv.writer(rejects_file)
+
+                def reject(line, row, reason):
+                    writer.writerow([line, row.get("email", ""), reason])
+
+            pool = None
+            if workers > 1:
+                # Forked workers must not share the parent's pooled connections
+                dispose_engines()
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+
+            status = ImportService.import_csv(
+                db, args.csv, args.chunk_size, args.checkpoint, pool=pool, reject=reject, progress=report
+            )
+        print()
+        print(f"Read {status['rows']} rows (resumed at row {status['resumed_at']}): "
+              f"imported {status['imported']} holders with {status['accounts']} accounts, "
+              f"rejected {status['rejected']} in {status['elapsed_s']}s "
+              f"({status['rows_per_second']} rows/s, {workers} workers)")
+    except Exception as e:
+        logger.error(f"Holder import failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
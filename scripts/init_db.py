@@ -1,6 +1,10 @@
 #!/usr/bin/env python
 """
-Initialize the database by creating all tables from SQLAlchemy models.
+Initialize or upgrade the database by running Alembic migrations.
+
+Databases created before migrations were introduced (tables present but no
+alembic_version table) are stamped at the initial revision first, then
+upgraded.
 """
 import sys
 from pathlib import Path
@@ -9,25 +13,41 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
 from app.db.session import engine
-from app.db.base import Base
 from app.core.logging_config import logger
 
 
+INITIAL_REVISION = "0001"
+
+
 def init_db():
     """
-    Create all database tables based on SQLAlchemy models.
+    Upgrade the database schema to the latest migration.
     """
     logger.info("Initializing database...")
 
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
+        config = Config(str(project_root / "alembic.ini"))
+        config.set_main_option("script_location", str(project_root / "migrations"))
+
+        with engine.begin() as connection:
+            config.attributes["connection"] = connection
+
+            tables = inspect(connection).get_table_names()
+            if "accounts" in tables and "alembic_version" not in tables:
+                logger.info(f"Existing schema without migration history; stamping {INITIAL_REVISION}")
+                command.stamp(config, INITIAL_REVISION)
+
+            command.upgrade(config, "head")
+
+            tables = inspect(connection).get_table_names()
 
-        # List created tables
-        tables = Base.metadata.tables.keys()
-        logger.info(f"Created tables: {', '.join(tables)}")
+        logger.info("Database migrated to head")
+        logger.info(f"Tables: {', '.join(sorted(tables))}")
 
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}", exc_info=True)
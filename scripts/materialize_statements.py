@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Materialize closed monthly statements into monthly_statements.
+
+Account holders are split into chunks rendered in parallel by a process
+pool; each chunk commits on its own. Statements already stored are skipped,
+so the job is safe to re-run (e.g. from cron on the 1st of each month) and
+an interrupted run resumes where it stopped.
+
+Usage:
+    python scripts/materialize_statements.py                    # last closed month
+    python scripts/materialize_statements.py --month 2026-09
+    python scripts/materialize_statements.py --since 2025-01    # every closed month since
+        [--workers N] [--chunk-size N]
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.session import SessionLocal, dispose_engines
+from app.models.account_holder import AccountHolder
+from app.server import available_cpus
+from app.services.statement_service import StatementService
+
+
+def closed_months(since: str) -> List[str]:
+    """List closed months from ``since`` up to the last closed month."""
+    start, _ = StatementService.month_bounds(since)
+    open_start = StatementService.open_period_start()
+    months = []
+    while start < open_start:
+        months.append(start.strftime("%Y-%m"))
+        start = (start + timedelta(days=32)).replace(day=1)
+    return months
+
+
+def materialize_chunk(month: str, user_ids: List[int]) -> int:
+    """Worker: store one month's statements for a chunk of account holders."""
+    db = SessionLocal()
+    try:
+        return StatementService.materialize_month(db, user_ids, month)
+    finally:
+        db.close()
+
+
+def main():
+    last_closed = (StatementService.open_period_start() - timedelta(days=1)).strftime("%Y-%m")
+
+    parser = argparse.ArgumentParser(description="Materialize closed monthly statements")
+    months = parser.add_mutually_exclusive_group()
+    months.add_argument("--month", default=None, help=f"closed month YYYY-MM (default: {last_closed})")
+    months.add_argument("--since", default=None, help="materialize every closed month since YYYY-MM")
+    parser.add_argument("--workers", type=int, default=settings.statement_workers, help="0 = available CPUs")
+    parser.add_argument("--chunk-size", type=int, default=settings.statement_chunk_size)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        targets = closed_months(args.since) if args.since else [args.month or last_closed]
+        for month in targets:
+            if not StatementService.is_closed(month):
+                raise ValueError(f"Month {month} is still open")
+
+        db = SessionLocal()
+        try:
+            user_ids = list(db.scalars(select(AccountHolder.id).order_by(AccountHolder.id)))
+        finally:
+            db.close()
+        chunks = [user_ids[i:i + args.chunk_size] for i in range(0, len(user_ids), args.chunk_size)]
+        workers = args.workers or available_cpus()
+
+        stored = 0
+        if workers == 1:
+            for month in targets:
+                for chunk in chunks:
+                    stored += materialize_chunk(month, chunk)
+        else:
+            # Forked workers must not share the parent's pooled connections
+            dispose_engines()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(materialize_chunk, month, chunk) for month in targets for chunk in chunks]
+                for future in as_completed(futures):
+                    stored += future.result()
+    except Exception as e:
+        logger.error(f"Statement materialization failed: {e}", exc_info=True)
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - started
+    logger.info("Monthly statements materialized", extra={
+        "months": targets, "stored": stored, "workers": workers, "elapsed_s": round(elapsed, 2)
+    })
+    print(f"Stored {stored} statements for {', '.join(targets)} "
+          f"({len(user_ids)} account holders, {workers} workers, {elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+Standalone outbox dispatcher.
+
+Use this instead of (or alongside) the in-process dispatcher, e.g. with
+OUTBOX_DISPATCHER_ENABLED=false on the API servers so slow handlers never
+share a process with request handling. Several workers can run at once;
+events are leased, not double-delivered while the lease holds.
+
+Usage:
+    python scripts/outbox_worker.py [--once]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.logging_config import logger
+from app.services import transaction_service  # noqa: F401 (registers outbox handlers)
+from app.services.outbox_service import OutboxDispatcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver pending outbox events")
+    parser.add_argument("--once", action="store_true", help="deliver one batch and exit")
+    args = parser.parse_args()
+
+    dispatcher = OutboxDispatcher()
+    if args.once:
+        print(f"Claimed {dispatcher.drain_once()} events")
+        return
+
+    logger.info("Outbox worker started")
+    try:
+        dispatcher.run_forever()
+    except KeyboardInterrupt:
+        logger.info("Outbox worker stopped")
+
+
+if __name__ == "__main__":
+    main()
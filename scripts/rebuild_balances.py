@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Verify (and optionally rebuild) account balances from the ledger.
+
+Checks that every journal entry balances and that each cached
+``accounts.balance`` equals the sum of the account's postings.
+
+Usage:
+    python scripts/rebuild_balances.py             # verify only; exit 1 on discrepancies
+    python scripts/rebuild_balances.py --apply     # rewrite mismatched balances from postings
+    python scripts/rebuild_balances.py --backfill  # journal pre-ledger transactions first
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.session import SessionLocal
+from app.services.ledger_service import LedgerService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify or rebuild account balances from the ledger")
+    parser.add_argument("--apply", action="store_true", help="rewrite mismatched cached balances")
+    parser.add_argument("--backfill", action="store_true", help="create entries for pre-ledger transactions")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.backfill:
+            count = LedgerService.backfill(db, args.batch_size)
+            print(f"Backfilled {count} transactions")
+
+        unbalanced = LedgerService.find_unbalanced_entries(db)
+        for entry_id in unbalanced:
+            print(f"UNBALANCED journal entry {entry_id}")
+
+        mismatches = LedgerService.rebuild_projection(db, apply=args.apply)
+        for m in mismatches:
+            print(f"MISMATCH account {m['account_number']} (id {m['account_id']}): "
+                  f"cached {m['cached']} ledger {m['ledger']}")
+
+        action = "rebuilt" if args.apply else "found"
+        print(f"{len(unbalanced)} unbalanced entries, {len(mismatches)} balance mismatches {action}")
+    finally:
+        db.close()
+
+    if unbalanced or (mismatches and not args.apply):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Re-encrypt stored SSNs and card numbers under the primary encryption key
+and ciphertext format.
+
+Rotation procedure:
+    1. Generate a new key and set ENCRYPTION_KEYS="new=<key>,old=<key>" (primary first),
+       keeping ENCRYPTION_KEY; restart the API so new data uses the new key.
+    2. Run this script (online; rate limited; resumable).
+    3. Once it reports nothing left to rotate, retire the old key.
+
+The same run converts stored ciphertexts to ENCRYPTION_FORMAT (e.g. after
+switching from fernet to aes-gcm); old-format values stay readable meanwhile.
+
+Usage:
+    python scripts/rotate_keys.py [--batch-size 500] [--rate 2000] [--reset]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config import settings
+from app.core.logging_config import logger
+from app.db.session import SessionLocal
+from app.services.key_rotation_service import KeyRotationService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-encrypt stored secrets under the primary key")
+    parser.add_argument("--batch-size", type=int, default=settings.key_rotation_batch_size)
+    parser.add_argument("--rate", type=float, default=settings.key_rotation_rows_per_second,
+                        help="rows scanned per second (0 = unlimited)")
+    parser.add_argument("--checkpoint", default=settings.key_rotation_checkpoint_file)
+    parser.add_argument("--reset", action="store_true", help="ignore the checkpoint and rescan everything")
+    args = parser.parse_args()
+
+    if args.reset:
+        Path(args.checkpoint).unlink(missing_ok=True)
+
+    def report(status):
+        print(f"\r{status['column']}: {status['scanned']}/{status['total']} ({status['percent']}%) "
+              f"rotated {status['rotated']}", end="", flush=True)
+
+    db = SessionLocal()
+    try:
+        results = KeyRotationService.rotate_all(db, args.batch_size, args.rate, args.checkpoint, progress=report)
+        print()
+        for r in results:
+            print(f"{r['column']}: scanned {r['scanned']}, rotated {r['rotated']}, conflicts {r['conflicts']}")
+    except Exception as e:
+        logger.error(f"Key rotation failed: {e}", exc_info=True)
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
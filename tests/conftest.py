@@ -5,11 +5,17 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from app.config import settings
 from app.main import app
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.instrumentation import install_query_instrumentation
+from app.services.velocity_service import velocity_backend
 
 
+# The dispatcher would poll the configured database, not the test one
+settings.outbox_dispatcher_enabled = False
+
 # Test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -17,6 +23,7 @@ engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False}
 )
+install_query_instrumentation(engine)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -25,6 +32,7 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 def db_session():
     """Create a fresh database for each test."""
     Base.metadata.create_all(bind=engine)
+    velocity_backend.clear()  # windows of the previous test's accounts
     db = TestingSessionLocal()
     try:
         yield db
@@ -43,6 +51,7 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     with TestClient(app) as test_client:
         yield test_client
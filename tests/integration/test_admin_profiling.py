@@ -0,0 +1,107 @@
+"""
+Integration tests for the admin request profiler.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.core.profiling import profiler
+
+
+ADMIN_AUTH = ("admin", "admin")
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    """Store profiles in a temporary directory and reset profiler state."""
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+    yield tmp_path
+    profiler.configure(enabled=False, sample_rate=0.0, allow_header=True)
+
+
+def test_profiling_requires_admin(client: TestClient, profile_dir):
+    """Test profiler configuration is admin-only."""
+    response = client.put("/admin/profiling", json={"enabled": True})
+    assert response.status_code == 401
+
+
+def test_disabled_profiler_ignores_debug_header(client: TestClient, profile_dir):
+    """Test the debug header has no effect while profiling is disabled."""
+    response = client.get("/health", headers={settings.profiling_header: "1"})
+
+    assert response.status_code == 200
+    assert "X-Profile-ID" not in response.headers
+    assert list(profile_dir.iterdir()) == []
+
+
+def test_debug_header_profiles_request(client: TestClient, profile_dir):
+    """Test a request carrying the debug header is profiled and downloadable."""
+    response = client.put(
+        "/admin/profiling",
+        json={"enabled": True, "sample_rate": 0.0, "allow_header": True},
+        auth=ADMIN_AUTH
+    )
+    assert response.status_code == 200
+    assert response.json()["enabled"] is True
+    token = response.json()["header_token"]
+
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={
+            "name": "John Doe",
+            "email": "john@example.com",
+            "password": "securepassword123",
+            "ssn": "123-45-6789",
+            "date_of_birth": "1990-01-01",
+            "mailing_address": "123 Main St"
+        },
+        headers={"X-Request-ID": "profile-trace-1", settings.profiling_header: token}
+    )
+    assert response.status_code == 201
+    profile_id = response.headers["X-Profile-ID"]
+    assert profile_id != "profile-trace-1"  # never named after client input
+
+    response = client.get("/admin/profiling/profiles", auth=ADMIN_AUTH)
+    assert [(p["profile_id"], p["trace_id"], p["label"]) for p in response.json()] == [
+        (profile_id, "profile-trace-1", "POST /api/v1/auth/signup")
+    ]
+    response = client.get("/admin/profiling/profiles", params={"trace_id": "profile-trace-1"}, auth=ADMIN_AUTH)
+    assert [p["profile_id"] for p in response.json()] == [profile_id]
+    response = client.get("/admin/profiling/profiles", params={"trace_id": "other"}, auth=ADMIN_AUTH)
+    assert response.json() == []
+
+    response = client.get(f"/admin/profiling/profiles/{profile_id}", auth=ADMIN_AUTH)
+    assert response.status_code == 200
+    for line in response.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("POST /api/v1/auth/signup;")
+        assert int(count) > 0
+    # The signup runs in the threadpool, whose thread is sampled with the request
+    assert "signup (auth_service.py:" in response.text
+
+
+def test_debug_header_requires_admin_token(client: TestClient, profile_dir):
+    """Test clients without the admin token cannot force profiling."""
+    profiler.configure(enabled=True, sample_rate=0.0, allow_header=True)
+
+    response = client.get("/health", headers={settings.profiling_header: "1"})
+    assert "X-Profile-ID" not in response.headers
+    response = client.get("/health", headers={settings.profiling_header: profiler.header_token})
+    assert "X-Profile-ID" in response.headers
+
+
+def test_one_request_profiled_at_a_time(profile_dir):
+    """Test a second request is not profiled while another one is."""
+    sampler = profiler.start()
+    try:
+        assert profiler.start() is None
+    finally:
+        profiler.stop(sampler)
+    profiler.stop(profiler.start())
+    assert list(profile_dir.iterdir()) == []
+
+
+def test_unknown_profile_returns_404(client: TestClient, profile_dir):
+    """Test downloading a missing profile fails."""
+    response = client.get("/admin/profiling/profiles/missing", auth=ADMIN_AUTH)
+    assert response.status_code == 404
@@ -0,0 +1,112 @@
+"""
+Integration tests for admin full-text search.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.transaction import Transaction
+from app.services.archive_service import ArchiveService
+
+
+ADMIN_AUTH = ("admin", "admin")
+
+
+@pytest.fixture
+def search_data(db_session):
+    """Two holders with accounts and transactions, indexed by the triggers."""
+    holders = [
+        AccountHolder(name="Margaret Hamilton", email="margaret@apollo.example.com", password_hash="x",
+                      ssn_encrypted=b"x", date_of_birth=date(1980, 1, 1), mailing_address="1 Main St"),
+        AccountHolder(name="Grace Hopper", email="grace@cobol.example.com", password_hash="x",
+                      ssn_encrypted=b"x", date_of_birth=date(1980, 1, 1), mailing_address="2 Main St"),
+    ]
+    db_session.add_all(holders)
+    db_session.flush()
+    accounts = [
+        Account(account_holder_id=holders[0].id, account_number="4455667788", account_type="checking",
+                balance=Decimal("0.00")),
+        Account(account_holder_id=holders[1].id, account_number="9988776655", account_type="savings",
+                balance=Decimal("0.00")),
+    ]
+    db_session.add_all(accounts)
+    db_session.flush()
+    old = datetime.utcnow() - timedelta(days=400)
+    db_session.add_all([
+        Transaction(transaction_id="t-1", account_id=accounts[0].id, transaction_type="withdrawal",
+                    amount=Decimal("12.50"), description="Margaritas at the harbour"),
+        Transaction(transaction_id="t-2", account_id=accounts[1].id, transaction_type="deposit",
+                    amount=Decimal("900.00"), description="Payroll Navy", created_at=old, updated_at=old),
+    ])
+    db_session.commit()
+    return holders, accounts
+
+
+def search(client, q, **params):
+    response = client.get("/admin/search", params={"q": q, **params}, auth=ADMIN_AUTH)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_requires_admin(client: TestClient, search_data):
+    """Test search is admin-only."""
+    assert client.get("/admin/search", params={"q": "grace"}).status_code == 401
+
+
+def test_prefix_search_ranks_holders_above_descriptions(client: TestClient, search_data):
+    """Test every word is a prefix and name matches outrank description matches."""
+    body = search(client, "marga")
+
+    assert body["ranked"] is True
+    assert [(hit["kind"], hit["title"]) for hit in body["results"]] == [
+        ("holder", "Margaret Hamilton"), ("transaction", "Margaritas at the harbour")
+    ]
+    assert search(client, "grace cob")["results"][0]["detail"] == "grace@cobol.example.com"
+    assert search(client, "grace apollo")["results"] == []
+
+    account = search(client, "445566", kind="account")["results"]
+    assert [(hit["title"], hit["holder_id"]) for hit in account] == [("4455667788", search_data[0][0].id)]
+
+
+def test_index_follows_updates_deletes_and_archiving(client: TestClient, db_session, search_data):
+    """Test triggers keep the index in sync with the source tables."""
+    holders, accounts = search_data
+    holders[1].name = "Grace Brewster Hopper"
+    db_session.commit()
+    assert search(client, "brewster")["results"][0]["id"] == holders[1].id
+
+    assert ArchiveService.archive_transactions(db_session) == 1
+    payroll = search(client, "payroll")["results"]
+    assert [(hit["kind"], hit["detail"]) for hit in payroll] == [("transaction", "deposit 900.00 on account 9988776655")]
+
+    db_session.delete(accounts[0])
+    db_session.commit()
+    assert search(client, "4455")["results"] == []
+    assert search(client, "margaritas")["results"] == []
+
+
+def test_pagination_and_unranked_fallback(client: TestClient, db_session, search_data, monkeypatch):
+    """Test has_more paging, and newest-first order for queries over the rank limit."""
+    first = search(client, "example", page_size=1)
+    second = search(client, "example", page_size=1, page=2)
+    assert first["has_more"] is True and second["has_more"] is False
+    assert {first["results"][0]["id"], second["results"][0]["id"]} == {h.id for h in search_data[0]}
+
+    monkeypatch.setattr(settings, "admin_search_rank_limit", 2)
+    body = search(client, "example")
+    assert body["ranked"] is False
+    assert [hit["title"] for hit in body["results"]] == ["Grace Hopper", "Margaret Hamilton"]
+    assert body["results"][0]["score"] is None
+
+
+def test_like_backend(client: TestClient, search_data, monkeypatch):
+    """Test the portable LIKE backend finds substrings across kinds."""
+    monkeypatch.setattr(settings, "admin_search_backend", "like")
+
+    body = search(client, "marga")
+    assert body["ranked"] is False
+    assert {hit["kind"] for hit in body["results"]} == {"holder", "transaction"}
+    assert search(client, "6677", kind="account")["results"][0]["title"] == "4455667788"
@@ -0,0 +1,73 @@
+"""
+Integration tests for ETag / If-None-Match on polled read endpoints.
+"""
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from tests.conftest import engine
+
+
+def _signup(client: TestClient, email: str) -> dict:
+    response = client.post("/api/v1/auth/signup", json={
+        "name": "Poll User", "email": email, "password": "securepassword123", "ssn": "123-45-6789",
+        "date_of_birth": "1990-01-01", "mailing_address": "1 Main St"
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_unchanged_poll_returns_304_without_querying_transactions(client: TestClient):
+    """Test a repeated poll is answered from the data version alone."""
+    headers = _signup(client, "poll@example.com")
+    account = client.post("/api/v1/accounts", json={"account_type": "checking"}, headers=headers).json()
+    client.post("/api/v1/transactions/deposit", json={"account_id": account["id"], "amount": "25.00"}, headers=headers)
+
+    first = client.get("/api/v1/transactions", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and len(first.json()) == 1
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        again = client.get("/api/v1/transactions", headers={**headers, "If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+    assert not any("FROM transactions" in statement for statement in statements)
+
+    # Different query parameters are a different representation
+    filtered = client.get(f"/api/v1/transactions?account_id={account['id']}", headers={**headers, "If-None-Match": etag})
+    assert filtered.status_code == 200
+
+
+def test_writes_change_the_etag(client: TestClient):
+    """Test deposits, transfers and new cards invalidate the affected holders' ETags."""
+    alice = _signup(client, "alice@example.com")
+    bob = _signup(client, "bob@example.com")
+    alice_account = client.post("/api/v1/accounts", json={"account_type": "checking"}, headers=alice).json()
+    bob_account = client.post("/api/v1/accounts", json={"account_type": "checking"}, headers=bob).json()
+
+    def etag(headers, path="/api/v1/accounts"):
+        return client.get(path, headers=headers).headers["ETag"]
+
+    alice_tag, bob_tag = etag(alice), etag(bob)
+    client.post("/api/v1/transactions/deposit", json={"account_id": alice_account["id"], "amount": "50.00"},
+                headers=alice)
+    assert etag(alice) != alice_tag
+    assert etag(bob) == bob_tag
+
+    alice_tag = etag(alice)
+    client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": alice_account["id"], "to_routing_number": alice_account["routing_number"],
+        "to_account_number": bob_account["account_number"], "amount": "10.00"
+    }, headers=alice)
+    assert etag(alice) != alice_tag
+    assert etag(bob) != bob_tag
+
+    statement_tag = etag(bob, "/api/v1/statements")
+    response = client.get("/api/v1/statements", headers={**bob, "If-None-Match": statement_tag})
+    assert response.status_code == 304
+    client.post("/api/v1/cards", json={"account_id": bob_account["id"], "card_type": "debit"}, headers=bob)
+    assert etag(bob, "/api/v1/statements") != statement_tag
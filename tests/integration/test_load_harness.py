@@ -0,0 +1,64 @@
+"""
+Tests for the HTTP load-test harness.
+"""
+import asyncio
+import httpx
+from fastapi.testclient import TestClient
+from app.main import app
+from benchmarks.load_test import (
+    ScenarioResult, percentile, compare_to_baseline, baseline_document, run_load_test
+)
+
+
+def _result(name: str, p95_ms: float, throughput_rps: float, errors: int = 0) -> ScenarioResult:
+    return ScenarioResult(
+        name=name, requests=100, errors=errors, duration_s=1.0, throughput_rps=throughput_rps,
+        p50_ms=p95_ms / 2, p95_ms=p95_ms, p99_ms=p95_ms * 1.2,
+        error_samples=["500: boom"] if errors else []
+    )
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_to_baseline_flags_regressions():
+    """Test slower p95, lower throughput and errors are all regressions."""
+    baseline = baseline_document([_result("deposit", 100.0, 50.0), _result("login", 100.0, 50.0)], 8, 200)
+
+    assert compare_to_baseline([_result("deposit", 120.0, 45.0)], baseline, tolerance=0.25) == []
+
+    regressions = compare_to_baseline(
+        [_result("deposit", 200.0, 50.0), _result("login", 100.0, 20.0), _result("signup", 1.0, 1.0, errors=3)],
+        baseline,
+        tolerance=0.25
+    )
+    assert len(regressions) == 3
+    assert regressions[0].startswith("deposit: p95")
+    assert regressions[1].startswith("login: throughput")
+    assert regressions[2].startswith("signup: 3 failed requests")
+
+
+def test_scenarios_run_in_process(client: TestClient):
+    """Smoke-test the money-movement and read scenarios via ASGI transport."""
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as http:
+            return await run_load_test(
+                http, ["deposit", "withdraw", "transfer", "transactions", "statements", "admin_dashboard"],
+                concurrency=1, requests_per_scenario=3
+            )
+
+    results = asyncio.run(run())
+
+    assert [r.name for r in results] == [
+        "deposit", "withdraw", "transfer", "transactions", "statements", "admin_dashboard"
+    ]
+    for result in results:
+        assert result.requests == 3
+        assert result.errors == 0, result.error_samples
@@ -0,0 +1,100 @@
+"""
+Integration tests for calendar-month statements and their materialization.
+"""
+import gzip
+import json
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.exceptions import ValidationError
+from app.models.account import Account
+from app.models.journal_entry import JournalEntry
+from app.models.transaction import Transaction
+from app.services.statement_service import StatementService
+
+
+def _signup(client: TestClient, email: str) -> dict:
+    response = client.post("/api/v1/auth/signup", json={
+        "name": "Statement User", "email": email, "password": "securepassword123", "ssn": "123-45-6789",
+        "date_of_birth": "1990-01-01", "mailing_address": "1 Main St"
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _backdate(db_session, when) -> None:
+    """Move every transaction, journal entry and account created so far to ``when``."""
+    for model in (Transaction, JournalEntry, Account):
+        db_session.execute(update(model).values(created_at=when))
+    db_session.commit()
+
+
+@pytest.fixture
+def last_month(client: TestClient, db_session):
+    """Holder with 100.00 deposited last month and 30.00 this month."""
+    headers = _signup(client, "months@example.com")
+    account = client.post("/api/v1/accounts", json={"account_type": "checking"}, headers=headers).json()
+    client.post("/api/v1/transactions/deposit", json={"account_id": account["id"], "amount": "100.00"},
+                headers=headers)
+
+    open_start = StatementService.open_period_start()
+    month_start = (open_start - timedelta(days=1)).replace(day=1)
+    _backdate(db_session, month_start + timedelta(days=4))
+    client.post("/api/v1/transactions/deposit", json={"account_id": account["id"], "amount": "30.00"},
+                headers=headers)
+    return {"headers": headers, "month": month_start.strftime("%Y-%m"), "open": open_start.strftime("%Y-%m")}
+
+
+def test_closed_month_uses_balance_at_month_end(client: TestClient, last_month):
+    """Test a closed month holds only its transactions and its closing balance."""
+    response = client.get(f"/api/v1/statements?month={last_month['month']}", headers=last_month["headers"])
+
+    assert response.status_code == 200
+    statement = response.json()
+    assert statement["total_transactions"] == 1
+    assert statement["accounts"][0]["balance"] == "100.00"
+
+    current = client.get(f"/api/v1/statements?month={last_month['open']}", headers=last_month["headers"]).json()
+    assert current["total_transactions"] == 1
+    assert current["accounts"][0]["balance"] == "130.00"
+
+
+def test_materialized_month_is_served_from_storage(client: TestClient, db_session, last_month):
+    """Test stored statements match the live ones and are sent pre-compressed."""
+    user_id = db_session.query(Account.account_holder_id).scalar()
+    live = client.get(f"/api/v1/statements?month={last_month['month']}", headers=last_month["headers"]).json()
+
+    assert StatementService.materialize_month(db_session, [user_id], last_month["month"]) == 1
+    assert StatementService.materialize_month(db_session, [user_id], last_month["month"]) == 0
+    stored = StatementService.get_stored_statement(db_session, user_id, last_month["month"])
+    assert json.loads(gzip.decompress(stored)) == live
+
+    # Stored statements are served as rendered, without re-reading transactions
+    db_session.execute(update(Transaction).values(description="changed"))
+    db_session.commit()
+    response = client.get(
+        f"/api/v1/statements?month={last_month['month']}",
+        headers={**last_month["headers"], "Accept-Encoding": "gzip"}
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "ETag" in response.headers
+    assert response.json() == live
+
+    plain = client.get(
+        f"/api/v1/statements?month={last_month['month']}",
+        headers={**last_month["headers"], "Accept-Encoding": "identity"}
+    )
+    assert "Content-Encoding" not in plain.headers
+    assert plain.json() == live
+
+
+def test_open_and_future_months_are_not_materialized(db_session, last_month):
+    """Test only closed months can be stored or requested."""
+    with pytest.raises(ValidationError):
+        StatementService.materialize_month(db_session, [1], last_month["open"])
+    with pytest.raises(ValidationError):
+        StatementService.get_month_statement(db_session, 1, "2999-01")
+    with pytest.raises(ValidationError):
+        StatementService.month_bounds("2026-13")
@@ -0,0 +1,156 @@
+"""
+Unit tests for spending analytics.
+"""
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.config import settings
+from app.core.exceptions import UnauthorizedError, ValidationError
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.transaction import Transaction
+from app.schemas.transaction import DepositRequest
+from app.services.analytics_service import (
+    AnalyticsService, _rollup_numpy, _rollup_python, analytics_cache, bucket_start, count_buckets,
+)
+from app.services.transaction_service import TransactionService
+
+
+# Tuesday 2026-03-03 .. Thursday 2026-04-02
+HISTORY = [
+    (datetime(2026, 3, 3, 9), "deposit", "credit", "100.00"),
+    (datetime(2026, 3, 3, 18), "withdrawal", "debit", "20.10"),
+    (datetime(2026, 3, 8, 23), "withdrawal", "debit", "9.90"),  # Sunday, same week
+    (datetime(2026, 3, 9, 0), "transfer", "credit", "50.00"),   # Monday, next week
+    (datetime(2026, 4, 2, 12), "transfer", "debit", "0.01"),
+]
+
+
+@pytest.fixture
+def history(db_session):
+    """Holder with two accounts and a few transactions on known dates."""
+    analytics_cache.clear()
+    holder = AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db_session.add(holder)
+    db_session.flush()
+    accounts = [
+        Account(account_holder_id=holder.id, account_number=f"100000000{i}", account_type="checking",
+                balance=Decimal("1000.00"))
+        for i in range(2)
+    ]
+    db_session.add_all(accounts)
+    db_session.flush()
+    for i, (created, kind, direction, amount) in enumerate(HISTORY):
+        db_session.add(Transaction(
+            transaction_id=f"txn-{i}", account_id=accounts[i % 2].id, transaction_type=kind,
+            direction=direction, amount=Decimal(amount), created_at=created, updated_at=created
+        ))
+    db_session.commit()
+    return holder
+
+
+def test_buckets_group_by_day_week_and_month(db_session, history):
+    """Test SQL period keys line up with calendar days, Monday weeks and months."""
+    start, end = datetime(2026, 3, 1), datetime(2026, 5, 1)
+
+    weeks = AnalyticsService.get_analytics(db_session, history.id, "week", start, end)
+    assert [(b.period, b.transaction_type) for b in weeks.buckets] == [
+        ("2026-03-02", "deposit"), ("2026-03-02", "withdrawal"), ("2026-03-09", "transfer"),
+        ("2026-03-30", "transfer"),
+    ]
+    withdrawals = weeks.buckets[1]
+    assert withdrawals.outflow == Decimal("30.00")
+    assert withdrawals.outflow_count == 2
+    assert withdrawals.average_outflow == Decimal("15.00")
+
+    months = AnalyticsService.get_analytics(db_session, history.id, "month", start, end)
+    assert {b.period for b in months.buckets} == {"2026-03", "2026-04"}
+    assert months.totals.inflow == Decimal("150.00")
+    assert months.totals.outflow == Decimal("30.01")
+    assert months.totals.net == Decimal("119.99")
+    assert sum(a.inflow_count + a.outflow_count for a in months.by_account) == len(HISTORY)
+
+    days = AnalyticsService.get_analytics(db_session, history.id, "day", start, end)
+    assert len({b.period for b in days.buckets}) == 4
+    assert days.totals == months.totals
+
+
+def test_cache_is_invalidated_by_writes(db_session, history):
+    """Test cached results are reused until the user's data version changes."""
+    account_id = db_session.query(Account.id).first().id
+    first = AnalyticsService.get_analytics(db_session, history.id, "month")
+    assert AnalyticsService.get_analytics(db_session, history.id, "month") is first
+
+    TransactionService.create_deposit(db_session, history.id, DepositRequest(account_id=account_id, amount="5.00"))
+    after = AnalyticsService.get_analytics(db_session, history.id, "month")
+    assert after.totals.inflow_count == first.totals.inflow_count + 1
+
+
+def test_range_is_bounded(db_session, history):
+    """Test defaults align to periods and oversized ranges are rejected."""
+    now = datetime(2026, 3, 4, 15, 30)
+    assert AnalyticsService.resolve_range("week", now=now) == (datetime(2025, 9, 8), datetime(2026, 3, 9))
+    assert AnalyticsService.resolve_range("month", now=now) == (datetime(2025, 4, 1), datetime(2026, 4, 1))
+    assert count_buckets("day", *AnalyticsService.resolve_range("day", now=now)) == 30
+
+    with pytest.raises(ValidationError):
+        AnalyticsService.resolve_range("day", datetime(2020, 1, 1), datetime(2026, 1, 1))
+    with pytest.raises(ValidationError):
+        AnalyticsService.resolve_range("day", datetime(2026, 1, 2), datetime(2026, 1, 1))
+    with pytest.raises(UnauthorizedError):
+        AnalyticsService.get_analytics(db_session, history.id, account_id=999)
+
+
+def test_aware_bounds_are_converted_to_utc():
+    """Test timezone-aware bounds are compared as naive UTC."""
+    now = datetime(2026, 10, 19, 12)
+    start = datetime(2026, 10, 1, 2, tzinfo=timezone(timedelta(hours=2)))
+    assert AnalyticsService.resolve_range("day", start, now=now) == (datetime(2026, 10, 1), datetime(2026, 10, 20))
+    assert AnalyticsService.resolve_range("day", end=datetime(2026, 10, 20, tzinfo=timezone.utc), now=now) == (
+        datetime(2026, 9, 20), datetime(2026, 10, 20)
+    )
+
+
+def test_numpy_rollup_matches_python():
+    """Test the vectorized rollup gives the same totals as the plain one."""
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    start = datetime(2026, 1, 1)
+    rows = [
+        (rng.randrange(1, 40), bucket_start("week", start + timedelta(days=rng.randrange(365))).strftime("%Y-%m-%d"),
+         rng.choice(("deposit", "withdrawal", "transfer")), rng.randrange(2), rng.randrange(1, 9),
+         rng.randrange(1, 10 ** 7))
+        for _ in range(settings.analytics_numpy_min_rows)
+    ]
+    assert _rollup_numpy(rows) == _rollup_python(rows)
+
+
+def test_endpoint(client):
+    """Test the endpoint aggregates the caller's deposits and validates the bucket."""
+    analytics_cache.clear()
+    response = client.post("/api/v1/auth/signup", json={
+        "name": "Analytics User", "email": "analytics@example.com", "password": "securepassword123",
+        "ssn": "123-45-6789", "date_of_birth": "1990-01-01", "mailing_address": "1 Main St"
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    account = client.post("/api/v1/accounts", json={"account_type": "checking"}, headers=headers).json()
+    for amount in ("10.00", "15.00"):
+        client.post("/api/v1/transactions/deposit", json={"account_id": account["id"], "amount": amount},
+                    headers=headers)
+
+    body = client.get("/api/v1/analytics?bucket=week", headers=headers).json()
+    assert body["totals"]["inflow"] == "25.00"
+    assert body["totals"]["average_inflow"] == "12.50"
+    assert len(body["buckets"]) == 1
+
+    assert client.get("/api/v1/analytics?bucket=year", headers=headers).status_code == 422
+    start = (datetime.utcnow() - timedelta(days=3)).strftime("%Y-%m-%dT00:00:00Z")
+    aware = client.get("/api/v1/analytics", params={"start": start}, headers=headers)
+    assert aware.status_code == 200
+    assert aware.json()["totals"]["inflow"] == "25.00"
@@ -0,0 +1,128 @@
+"""
+Unit tests for transaction archiving.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import pytest
+from sqlalchemy import event
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.archived_transaction import ArchivedTransaction
+from app.models.transaction import Transaction
+from app.services.admin_service import AdminService
+from app.services.archive_service import ArchiveService
+from app.services.statement_service import StatementService
+from app.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def history(db_session):
+    """Holder with one account, three old and two recent transactions."""
+    holder = AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db_session.add(holder)
+    db_session.flush()
+    account = Account(account_holder_id=holder.id, account_number="1000000001",
+                      account_type="checking", balance=Decimal("5.00"))
+    db_session.add(account)
+    db_session.flush()
+
+    now = datetime.utcnow()
+    for i, age_days in enumerate((800, 600, 400, 10, 1)):
+        created = now - timedelta(days=age_days)
+        db_session.add(Transaction(
+            transaction_id=f"txn-{i}", account_id=account.id, transaction_type="deposit",
+            amount=Decimal("1.00"), created_at=created, updated_at=created
+        ))
+    db_session.commit()
+    return holder
+
+
+def _archive_queries(db_session, call) -> int:
+    """Run ``call`` and count statements that read the archive table rows."""
+    count = 0
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        nonlocal count
+        if "FROM transactions_archive" in statement and "max(" not in statement:
+            count += 1
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return count
+
+
+def test_archive_moves_old_rows_in_batches(db_session, history):
+    """Test rows older than the cutoff move to the archive with their ids."""
+    hot_ids = {t.id for t in db_session.query(Transaction).all()}
+
+    archived = ArchiveService.archive_transactions(
+        db_session, datetime.utcnow() - timedelta(days=365), batch_size=2
+    )
+
+    assert archived == 3
+    assert db_session.query(Transaction).count() == 2
+    archived_ids = {t.id for t in db_session.query(ArchivedTransaction).all()}
+    assert archived_ids | {t.id for t in db_session.query(Transaction).all()} == hot_ids
+    assert ArchiveService.archive_transactions(db_session, datetime.utcnow() - timedelta(days=365)) == 0
+
+
+def test_archive_respects_max_batches(db_session, history):
+    """Test a run can be limited to a number of batches and resumed."""
+    cutoff = datetime.utcnow() - timedelta(days=365)
+    assert ArchiveService.archive_transactions(db_session, cutoff, batch_size=1, max_batches=1) == 1
+    assert ArchiveService.archive_transactions(db_session, cutoff, batch_size=1) == 2
+
+
+def test_listing_spans_tiers_only_when_needed(db_session, history):
+    """Test full history includes archived rows and recent ranges skip the archive."""
+    ArchiveService.archive_transactions(db_session, datetime.utcnow() - timedelta(days=365))
+
+    transactions = TransactionService.get_transactions(db_session, history.id)
+    assert [t.transaction_id for t in transactions] == ["txn-4", "txn-3", "txn-2", "txn-1", "txn-0"]
+
+    recent_start = datetime.utcnow() - timedelta(days=30)
+    assert _archive_queries(
+        db_session, lambda: TransactionService.get_transactions(db_session, history.id, start=recent_start)
+    ) == 0
+    assert len(TransactionService.get_transactions(db_session, history.id, start=recent_start)) == 2
+
+    old_range = TransactionService.get_transactions(
+        db_session, history.id,
+        start=datetime.utcnow() - timedelta(days=700), end=datetime.utcnow() - timedelta(days=5)
+    )
+    assert [t.transaction_id for t in old_range] == ["txn-3", "txn-2", "txn-1"]
+
+
+def test_statement_and_dashboard_span_tiers(db_session, history):
+    """Test statements read the archive only for long periods and totals count both tiers."""
+    ArchiveService.archive_transactions(db_session, datetime.utcnow() - timedelta(days=365))
+
+    assert _archive_queries(db_session, lambda: StatementService.get_user_statement(db_session, history.id)) == 0
+    assert StatementService.get_user_statement(db_session, history.id).total_transactions == 2
+    assert StatementService.get_user_statement(db_session, history.id, days=500).total_transactions == 3
+    assert AdminService.get_dashboard_stats(db_session)["total_transactions"] == 5
+
+
+def test_archived_ids_are_not_reused(db_session, history):
+    """Test a transaction created after the newest rows were archived gets a fresh id and archives too."""
+    ArchiveService.archive_transactions(db_session, datetime.utcnow())
+    assert db_session.query(Transaction).count() == 0
+
+    account = db_session.query(Account).one()
+    newest = db_session.query(ArchivedTransaction.id).order_by(ArchivedTransaction.id.desc()).first()[0]
+    created = datetime.utcnow() - timedelta(seconds=1)
+    transaction = Transaction(transaction_id="txn-5", account_id=account.id, transaction_type="deposit",
+                              amount=Decimal("1.00"), created_at=created, updated_at=created)
+    db_session.add(transaction)
+    db_session.commit()
+    assert transaction.id > newest
+
+    assert ArchiveService.archive_transactions(db_session, datetime.utcnow()) == 1
+    assert db_session.query(ArchivedTransaction).count() == 6
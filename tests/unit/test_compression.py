@@ -0,0 +1,128 @@
+"""
+Unit tests for Accept-Encoding negotiation and the compression middleware.
+"""
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from app.core.compression import ENCODERS, CompressionMiddleware, negotiate_encoding
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+PAYLOAD = [{"id": i, "transaction_type": "deposit", "amount": "10.00", "description": "Payroll"} for i in range(500)]
+
+DECODERS = {
+    "gzip": gzip.decompress,
+    "br": lambda data: brotli.decompress(data),
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+def _call(response, accept_encoding: str = "", minimum_size: int = 1024):
+    """Run a response through the middleware and collect what it sends."""
+    messages = []
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": headers}
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.sleep(3600)  # StreamingResponse listens for a disconnect until it is done
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(CompressionMiddleware(response, minimum_size=minimum_size)(scope, receive, send))
+    start = messages[0]
+    body_messages = [m for m in messages[1:] if m["type"] == "http.response.body"]
+    return {k.decode().lower(): v.decode() for k, v in start["headers"]}, body_messages
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0.8, zstd;q=0.8, gzip;q=0.8", "zstd"),
+    ("identity", None),
+    ("*", "zstd"),
+    ("*, zstd;q=0", "br"),
+    ("gzip;q=0", None),
+    ("GZIP", "gzip"),
+])
+def test_negotiate_encoding(header, expected):
+    """Test the client's q-values win and ties follow server preference."""
+    assert negotiate_encoding(header, ["zstd", "br", "gzip"]) == expected
+
+
+@pytest.mark.parametrize("encoding", sorted(ENCODERS))
+def test_large_json_is_compressed(encoding):
+    """Test a complete JSON body round-trips through each installed encoding."""
+    headers, bodies = _call(JSONResponse(PAYLOAD), accept_encoding=encoding)
+
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert len(bodies) == 1
+    assert int(headers["content-length"]) == len(bodies[0]["body"])
+    assert json.loads(DECODERS[encoding](bodies[0]["body"])) == PAYLOAD
+
+
+def test_small_and_non_text_bodies_pass_through():
+    """Test the size threshold and content-type filter."""
+    headers, bodies = _call(JSONResponse({"status": "ok"}), accept_encoding="gzip")
+    assert "content-encoding" not in headers
+    assert bodies[0]["body"] == b'{"status":"ok"}'
+
+    png = Response(b"\x89PNG" + bytes(4096), media_type="image/png")
+    headers, _ = _call(png, accept_encoding="gzip")
+    assert "content-encoding" not in headers
+
+
+def test_no_accept_encoding_passes_through():
+    """Test clients that do not ask for compression get identity."""
+    headers, bodies = _call(JSONResponse(PAYLOAD))
+    assert "content-encoding" not in headers
+    assert json.loads(bodies[0]["body"]) == PAYLOAD
+
+
+def test_already_encoded_and_not_modified_pass_through():
+    """Test encoded bodies and 304s are never re-encoded."""
+    encoded = Response(gzip.compress(b"x" * 4096), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+    headers, bodies = _call(encoded, accept_encoding="br, gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(bodies[0]["body"]) == b"x" * 4096
+
+    headers, _ = _call(Response(status_code=304, headers={"ETag": 'W/"1"'}), accept_encoding="gzip")
+    assert "content-encoding" not in headers
+
+
+def test_streaming_response_is_compressed_incrementally():
+    """Test each streamed chunk is flushed as a decodable gzip fragment."""
+    rows = [json.dumps(row).encode() + b"\n" for row in PAYLOAD]
+
+    async def export():
+        for row in rows:
+            yield row
+
+    headers, bodies = _call(StreamingResponse(export(), media_type="application/x-ndjson"), accept_encoding="gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert len(bodies) > 2
+
+    # The first chunk decodes on its own: data is not held until the stream ends
+    assert zlib.decompressobj(31).decompress(bodies[0]["body"]) == rows[0]
+    assert gzip.decompress(b"".join(m["body"] for m in bodies)) == b"".join(rows)
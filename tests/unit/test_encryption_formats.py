@@ -0,0 +1,126 @@
+"""
+Unit tests for the AES-GCM ciphertext format.
+"""
+from datetime import date
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+from app.models.account_holder import AccountHolder
+from app.models.card import Card
+from app.services.key_rotation_service import KeyRotationService
+from app.utils.encryption import EncryptionService, row_aad
+
+
+KEY = Fernet.generate_key().decode()
+
+
+def test_aes_gcm_round_trip_binds_associated_data():
+    """Test sealed fields decrypt only with the row they were written for."""
+    service = EncryptionService({"k1": KEY}, "aes-gcm")
+    encrypted = service.encrypt("123-45-6789", row_aad("account_holders", 7))
+
+    assert encrypted[0] == 0x02
+    assert service.key_id(encrypted) == "k1"
+    assert service.ciphertext_format(encrypted) == "aes-gcm"
+    assert len(encrypted) < len(EncryptionService({"k1": KEY}, "fernet").encrypt("123-45-6789"))
+    assert service.decrypt(encrypted, row_aad("account_holders", 7)) == "123-45-6789"
+    with pytest.raises(InvalidToken):
+        service.decrypt(encrypted, row_aad("account_holders", 8))
+    with pytest.raises(InvalidToken):
+        service.decrypt(encrypted[:-1] + bytes([encrypted[-1] ^ 1]), row_aad("account_holders", 7))
+
+
+def test_aes_gcm_reads_fernet_blobs_and_marks_them_for_rotation():
+    """Test old Fernet and bare legacy tokens stay readable under the aes-gcm format."""
+    fernet = EncryptionService({"k1": KEY}, "fernet")
+    service = EncryptionService({"k1": KEY}, "aes-gcm")
+    aad = row_aad("cards", 1)
+
+    for old in (fernet.encrypt("4111111111111111"), Fernet(KEY.encode()).encrypt(b"4111111111111111")):
+        assert service.decrypt(old, aad) == "4111111111111111"
+        assert service.needs_rotation(old)
+        rotated = service.rotate(old, aad)
+        assert service.ciphertext_format(rotated) == "aes-gcm"
+        assert not service.needs_rotation(rotated)
+        assert service.decrypt(rotated, aad) == "4111111111111111"
+
+    # Switching back to fernet reads and converts aes-gcm blobs the same way
+    sealed = service.encrypt("4111111111111111", aad)
+    assert fernet.needs_rotation(sealed)
+    assert fernet.decrypt(fernet.rotate(sealed, aad)) == "4111111111111111"
+
+
+def test_rotation_converts_stored_format(db_session, tmp_path):
+    """Test the rotation job moves rows to aes-gcm bound to their own id."""
+    fernet = EncryptionService({"k1": KEY}, "fernet")
+    db_session.add_all([AccountHolder(
+        name=f"Holder {i}", email=f"holder{i}@example.com", password_hash="x",
+        ssn_encrypted=fernet.encrypt(f"000-00-000{i}"), date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    ) for i in range(3)])
+    db_session.commit()
+
+    service = EncryptionService({"k1": KEY}, "aes-gcm")
+    results = KeyRotationService.rotate_all(
+        db_session, rows_per_second=0, checkpoint_path=str(tmp_path / "rotation.json"), service=service
+    )
+
+    assert results[0]["rotated"] == 3
+    db_session.expire_all()
+    for holder in db_session.query(AccountHolder).order_by(AccountHolder.id):
+        assert service.ciphertext_format(holder.ssn_encrypted) == "aes-gcm"
+        assert service.decrypt(holder.ssn_encrypted, row_aad("account_holders", holder.id)).startswith("000-00-000")
+
+
+def test_invalid_format_is_rejected():
+    """Test an unknown format name fails fast."""
+    with pytest.raises(ValueError):
+        EncryptionService({"k1": KEY}, "rot13")
+
+
+def test_reseal_rewrites_only_stale_rows(db_session):
+    """Test rows read under an old format are re-sealed, and concurrently changed rows are left alone."""
+    fernet = EncryptionService({"k1": KEY}, "fernet")
+    holders = [AccountHolder(
+        name=f"Holder {i}", email=f"holder{i}@example.com", password_hash="x",
+        ssn_encrypted=fernet.encrypt(f"000-00-000{i}"), date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    ) for i in range(3)]
+    db_session.add_all(holders)
+    db_session.commit()
+    rows = [(holder.id, holder.ssn_encrypted) for holder in holders]
+
+    service = EncryptionService({"k1": KEY}, "aes-gcm")
+    current = service.encrypt("000-00-0009", row_aad("account_holders", holders[2].id))
+    holders[2].ssn_encrypted = current  # changed after the read
+    db_session.commit()
+
+    assert KeyRotationService.reseal(db_session, AccountHolder, "ssn_encrypted", rows, service=service) == 2
+    db_session.expire_all()
+    sealed = [holder.ssn_encrypted for holder in db_session.query(AccountHolder).order_by(AccountHolder.id)]
+    assert all(service.ciphertext_format(value) == "aes-gcm" for value in sealed)
+    assert sealed[2] == current
+    assert service.decrypt(sealed[0], row_aad("account_holders", holders[0].id)) == "000-00-0000"
+
+    fresh = [(holder.id, holder.ssn_encrypted) for holder in holders]
+    assert KeyRotationService.reseal(db_session, AccountHolder, "ssn_encrypted", fresh, service=service) == 0
+
+
+def test_listing_cards_reseals_card_numbers(client, db_session, monkeypatch):
+    """Test GET /cards migrates card numbers to the configured format."""
+    headers = {"Authorization": "Bearer " + client.post("/api/v1/auth/signup", json={
+        "name": "Card User", "email": "cards@example.com", "password": "securepassword123",
+        "ssn": "123-45-6789", "date_of_birth": "1990-01-01", "mailing_address": "1 Main St"
+    }).json()["access_token"]}
+    account = client.post("/api/v1/accounts", json={"account_type": "checking"}, headers=headers).json()
+    created = client.post("/api/v1/cards", json={"account_id": account["id"], "card_type": "debit"},
+                          headers=headers).json()
+
+    service = EncryptionService(ciphertext_format="aes-gcm")
+    monkeypatch.setattr("app.services.card_service.encryption_service", service)
+    monkeypatch.setattr("app.services.key_rotation_service.encryption_service", service)
+
+    listed = client.get("/api/v1/cards", headers=headers).json()
+
+    assert listed[0]["card_number_last4"] == created["card_number_last4"]
+    card = db_session.get(Card, created["id"])
+    db_session.refresh(card)
+    assert service.ciphertext_format(card.card_number_encrypted) == "aes-gcm"
+    assert client.get("/api/v1/cards", headers=headers).json() == listed
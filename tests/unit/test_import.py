@@ -0,0 +1,89 @@
+"""
+Unit tests for the bulk holder import.
+"""
+import csv
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.core.security import verify_password
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.services.import_service import ImportService
+from app.utils.encryption import encryption_service, row_aad
+
+
+HEADER = ["name", "email", "password", "ssn", "date_of_birth", "mailing_address", "accounts"]
+
+
+def holder_row(i, **overrides):
+    row = {
+        "name": f"Holder {i}", "email": f"holder{i}@example.com", "password": f"password-{i:04d}",
+        "ssn": f"123-45-{i:04d}", "date_of_birth": "1980-05-17", "mailing_address": f"{i} Main St",
+        "accounts": "checking;savings" if i % 2 else "checking",
+    }
+    row.update(overrides)
+    return row
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_import_creates_holders_and_accounts(db_session, tmp_path):
+    """Test imported holders can log in, SSNs decrypt with their row ids and accounts are opened."""
+    source = write_csv(tmp_path / "holders.csv", [holder_row(i) for i in range(5)])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        status = ImportService.import_csv(db_session, source, chunk_size=2,
+                                          checkpoint_path=str(tmp_path / "cp.json"), pool=pool)
+
+    assert (status["rows"], status["imported"], status["accounts"], status["rejected"]) == (5, 5, 7, 0)
+    assert status["rows_per_second"] > 0
+    holder = db_session.query(AccountHolder).filter(AccountHolder.email == "holder3@example.com").one()
+    assert verify_password("password-0003", holder.password_hash)
+    assert encryption_service.decrypt(holder.ssn_encrypted, row_aad("account_holders", holder.id)) == "123-45-0003"
+    assert sorted(a.account_type for a in holder.accounts) == ["checking", "savings"]
+    numbers = [number for (number,) in db_session.query(Account.account_number)]
+    assert len(set(numbers)) == len(numbers) == 7
+
+
+def test_invalid_and_duplicate_rows_are_rejected(db_session, tmp_path):
+    """Test bad rows are reported with a reason and the rest of the chunk is imported."""
+    ImportService.import_csv(db_session, write_csv(tmp_path / "first.csv", [holder_row(0)]),
+                             checkpoint_path=str(tmp_path / "cp.json"))
+    rows = [
+        holder_row(0),                                  # already registered
+        holder_row(1, ssn="123456789"),                 # bad SSN format
+        holder_row(2, accounts="brokerage"),            # unknown account type
+        holder_row(3),
+        holder_row(3, name="Someone Else"),             # duplicate within the file
+    ]
+    rejects = []
+    status = ImportService.import_csv(
+        db_session, write_csv(tmp_path / "second.csv", rows), checkpoint_path=str(tmp_path / "cp.json"),
+        reject=lambda line, row, reason: rejects.append((line, reason.split(":")[0]))
+    )
+
+    assert (status["imported"], status["rejected"]) == (1, 4)
+    assert sorted(rejects) == [(2, "email"), (3, "ssn"), (4, "accounts"), (6, "email")]
+    assert db_session.query(AccountHolder).count() == 2
+
+
+def test_interrupted_import_resumes_from_checkpoint(db_session, tmp_path):
+    """Test a re-run skips committed chunks and imports the rest."""
+    source = write_csv(tmp_path / "holders.csv", [holder_row(i) for i in range(5)])
+    checkpoint = str(tmp_path / "cp.json")
+
+    def crash(status):
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        ImportService.import_csv(db_session, source, chunk_size=2, checkpoint_path=checkpoint, progress=crash)
+    assert db_session.query(AccountHolder).count() == 2
+
+    status = ImportService.import_csv(db_session, source, chunk_size=2, checkpoint_path=checkpoint)
+    assert (status["resumed_at"], status["rows"], status["imported"], status["rejected"]) == (2, 3, 3, 0)
+    assert db_session.query(AccountHolder).count() == 5
@@ -0,0 +1,45 @@
+"""
+Import-time budget: importing the application must be cheap and side-effect free.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Self time of the application's own modules (third-party imports excluded)
+APP_IMPORT_BUDGET_MS = 500
+
+
+def _import_times(module: str, cwd: Path) -> dict:
+    """Import a module in a clean interpreter and parse ``-X importtime`` output."""
+    env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": str(PROJECT_ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_import_has_no_side_effects_and_fits_budget(tmp_path):
+    """Test importing app.main needs no configuration, writes nothing and stays within budget."""
+    # No SECRET_KEY/ENCRYPTION_KEY in the environment: settings must not be built on import
+    times = _import_times("app.main", tmp_path)
+
+    assert "app.main" in times
+    assert list(tmp_path.iterdir()) == []  # no log directories or files created
+
+    own = {name: self_us for name, (self_us, _) in times.items() if name.split(".")[0] == "app"}
+    total_ms = sum(own.values()) / 1000
+    slowest = sorted(own.items(), key=lambda item: -item[1])[:5]
+    assert total_ms < APP_IMPORT_BUDGET_MS, f"app modules took {total_ms:.0f} ms to import; slowest: {slowest}"
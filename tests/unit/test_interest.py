@@ -0,0 +1,94 @@
+"""
+Unit tests for daily savings interest accrual.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+import pytest
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.interest_accrual import InterestAccrual
+from app.models.transaction import Transaction
+from app.schemas.transaction import DepositRequest
+from app.services.interest_service import InterestService
+from app.services.ledger_service import LedgerService
+from app.services.reconciliation_service import ReconciliationService
+from app.services.transaction_service import TransactionService
+
+BUSINESS_DATE = date(2026, 3, 31)
+
+
+@pytest.fixture
+def accounts(db_session):
+    """Holder with a checking, a funded savings and a nearly empty savings account."""
+    holder = AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db_session.add(holder)
+    db_session.flush()
+    checking = Account(account_holder_id=holder.id, account_number="1000000001",
+                       account_type="checking", balance=Decimal("0.00"))
+    savings = Account(account_holder_id=holder.id, account_number="1000000002",
+                      account_type="savings", balance=Decimal("0.00"))
+    small = Account(account_holder_id=holder.id, account_number="1000000003",
+                    account_type="savings", balance=Decimal("0.00"))
+    db_session.add_all([checking, savings, small])
+    db_session.flush()
+    db_session.commit()
+    for account, amount in ((checking, "10000.00"), (savings, "36500.00"), (small, "10.00")):
+        TransactionService.create_deposit(db_session, holder.id, DepositRequest(account_id=account.id, amount=Decimal(amount)))
+    db_session.refresh(holder)
+    return holder, checking, savings, small
+
+
+def test_accrue_credits_savings_interest(db_session, accounts):
+    """Test interest is credited to savings accounts only, with a transaction and balanced postings."""
+    holder, checking, savings, small = accounts
+    version = holder.data_version
+
+    status = InterestService.accrue(db_session, BUSINESS_DATE, rate=Decimal("0.05"), chunk_size=2)
+    assert (status["accrued"], status["credited"], status["interest"]) == (2, 1, Decimal("5.00"))
+
+    db_session.expire_all()
+    assert savings.balance == Decimal("36505.00")
+    assert (checking.balance, small.balance) == (Decimal("10000.00"), Decimal("10.00"))
+    assert holder.data_version == version + 1
+
+    credit = db_session.query(Transaction).filter(
+        Transaction.account_id == savings.id, Transaction.description.like("Savings interest%")
+    ).one()
+    assert (credit.transaction_type, credit.direction, credit.amount) == ("deposit", "credit", Decimal("5.00"))
+    assert credit.journal_id == credit.transaction_id == f"interest-2026-03-31-{savings.id}"
+    # Zero-cent accruals are recorded but not posted
+    assert db_session.query(InterestAccrual).filter(InterestAccrual.account_id == small.id).one().journal_id is None
+    assert LedgerService.find_unbalanced_entries(db_session) == []
+    assert LedgerService.find_balance_mismatches(db_session) == []
+
+
+def test_accrue_is_idempotent_per_business_date(db_session, accounts):
+    """Test re-running a date credits nothing, a new date accrues again, and open dates are refused."""
+    _, _, savings, _ = accounts
+    InterestService.accrue(db_session, BUSINESS_DATE, rate=Decimal("0.05"))
+    again = InterestService.accrue(db_session, BUSINESS_DATE, rate=Decimal("0.05"))
+    assert (again["accrued"], again["credited"]) == (0, 0)
+
+    next_day = InterestService.accrue(db_session, BUSINESS_DATE + timedelta(days=1), rate=Decimal("0.05"))
+    assert next_day["credited"] == 1
+    db_session.expire_all()
+    assert savings.balance == Decimal("36510.00")
+    assert db_session.query(Transaction).filter(Transaction.account_id == savings.id).count() == 3
+
+    with pytest.raises(ValueError):
+        InterestService.accrue(db_session, date.today() + timedelta(days=1))
+
+
+def test_accrual_transactions_reconcile(db_session, accounts, tmp_path):
+    """Test accrued interest keeps balances consistent with transactions."""
+    InterestService.accrue(db_session, BUSINESS_DATE, rate=Decimal("0.05"))
+    run = ReconciliationService.start_run(db_session)
+    found = []
+    for first_id, last_id in ReconciliationService.account_ranges(db_session):
+        found += ReconciliationService.reconcile_range(
+            db_session, first_id, last_id, run.since_transaction_id, run.watermark
+        )[1]
+    assert found == []
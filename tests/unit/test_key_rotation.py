@@ -0,0 +1,92 @@
+"""
+Unit tests for multi-key encryption and key rotation.
+"""
+from datetime import date
+from decimal import Decimal
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.card import Card
+from app.services.key_rotation_service import KeyRotationService
+from app.utils.encryption import EncryptionService
+
+
+OLD_KEY = Fernet.generate_key().decode()
+NEW_KEY = Fernet.generate_key().decode()
+
+
+def test_envelope_carries_key_id_and_reads_legacy_tokens():
+    """Test new ciphertexts name their key and bare Fernet tokens still decrypt."""
+    service = EncryptionService({"new": NEW_KEY, "old": OLD_KEY})
+    encrypted = service.encrypt("123-45-6789")
+    assert encrypted.startswith(b"new$")
+    assert service.decrypt(encrypted) == "123-45-6789"
+
+    legacy = Fernet(OLD_KEY.encode()).encrypt(b"987-65-4321")
+    assert service.key_id(legacy) is None
+    assert service.decrypt(legacy) == "987-65-4321"
+    assert service.needs_rotation(legacy)
+    assert not service.needs_rotation(service.rotate(legacy))
+
+
+def test_unknown_key_id_is_rejected():
+    """Test ciphertexts under a retired key fail to decrypt."""
+    encrypted = EncryptionService({"old": OLD_KEY}).encrypt("secret")
+    with pytest.raises(InvalidToken):
+        EncryptionService({"new": NEW_KEY}).decrypt(encrypted)
+
+
+@pytest.fixture
+def old_key_rows(db_session):
+    """Three holders and one card encrypted under the old key."""
+    old = EncryptionService({"old": OLD_KEY})
+    holders = [AccountHolder(
+        name=f"Holder {i}", email=f"holder{i}@example.com", password_hash="x",
+        ssn_encrypted=old.encrypt(f"000-00-000{i}"), date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    ) for i in range(3)]
+    db_session.add_all(holders)
+    db_session.flush()
+    account = Account(account_holder_id=holders[0].id, account_number="1000000001",
+                      account_type="checking", balance=Decimal("0.00"))
+    db_session.add(account)
+    db_session.flush()
+    db_session.add(Card(account_id=account.id, card_number_encrypted=old.encrypt("4111111111111111"),
+                        card_type="debit", is_active=True))
+    db_session.commit()
+
+
+def test_rotation_reencrypts_all_columns_and_resumes(db_session, old_key_rows, tmp_path):
+    """Test rotation moves every row to the primary key, checkpointing progress."""
+    service = EncryptionService({"new": NEW_KEY, "old": OLD_KEY})
+    checkpoint = tmp_path / "rotation.json"
+    progress = []
+
+    results = KeyRotationService.rotate_all(
+        db_session, batch_size=2, rows_per_second=0, checkpoint_path=str(checkpoint),
+        service=service, progress=progress.append
+    )
+
+    assert [(r["column"], r["scanned"], r["rotated"]) for r in results] == [
+        ("account_holders.ssn_encrypted", 3, 3), ("cards.card_number_encrypted", 1, 1)
+    ]
+    assert [p["scanned"] for p in progress] == [2, 3, 1]
+    db_session.expire_all()
+    assert all(service.key_id(h.ssn_encrypted) == "new" for h in db_session.query(AccountHolder))
+    assert service.decrypt(db_session.query(Card).one().card_number_encrypted) == "4111111111111111"
+
+    # Resuming scans nothing; a new primary key starts over
+    again = KeyRotationService.rotate_all(db_session, rows_per_second=0, checkpoint_path=str(checkpoint), service=service)
+    assert sum(r["scanned"] for r in again) == 0
+    newer = EncryptionService({"newer": Fernet.generate_key().decode(), "new": NEW_KEY})
+    rerun = KeyRotationService.rotate_all(db_session, rows_per_second=0, checkpoint_path=str(checkpoint), service=newer)
+    assert sum(r["rotated"] for r in rerun) == 4
+
+
+def test_rotation_skips_rows_changed_concurrently(db_session, old_key_rows):
+    """Test the compare-and-swap write leaves rows rewritten by someone else alone."""
+    service = EncryptionService({"new": NEW_KEY, "old": OLD_KEY})
+    holder = db_session.query(AccountHolder).first()
+    stale = [{"b_id": holder.id, "b_old": b"not-the-current-value", "b_new": service.encrypt("x")}]
+
+    assert KeyRotationService._write_batch(db_session, AccountHolder, "ssn_encrypted", stale) == 0
@@ -0,0 +1,121 @@
+"""
+Unit tests for the double-entry ledger.
+"""
+from datetime import date
+from decimal import Decimal
+import pytest
+from app.config import settings
+from app.core.exceptions import InsufficientFundsError, TransactionError
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.journal_entry import JournalEntry
+from app.models.posting import Posting
+from app.models.transaction import Transaction
+from app.schemas.transaction import DepositRequest, WithdrawalRequest, TransferRequest
+from app.services.ledger_service import LedgerService, LEDGER_CASH, LEDGER_CUSTOMER
+from app.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def accounts(db_session):
+    """Holder with two accounts."""
+    holder = AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db_session.add(holder)
+    db_session.flush()
+    first = Account(account_holder_id=holder.id, account_number="1000000001",
+                    account_type="checking", balance=Decimal("0.00"))
+    second = Account(account_holder_id=holder.id, account_number="1000000002",
+                     account_type="savings", balance=Decimal("0.00"))
+    db_session.add_all([first, second])
+    db_session.commit()
+    return holder, first, second
+
+
+def test_money_movements_post_balanced_entries(db_session, accounts):
+    """Test deposits, withdrawals and transfers keep the projection equal to the ledger."""
+    holder, first, second = accounts
+    TransactionService.create_deposit(db_session, holder.id, DepositRequest(account_id=first.id, amount=Decimal("100.00")))
+    TransactionService.create_withdrawal(db_session, holder.id, WithdrawalRequest(account_id=first.id, amount=Decimal("30.00")))
+    TransactionService.create_transfer(db_session, holder.id, TransferRequest(
+        from_account_id=first.id, to_routing_number=settings.routing_number,
+        to_account_number=second.account_number, amount=Decimal("20.00")
+    ))
+
+    db_session.refresh(first)
+    db_session.refresh(second)
+    assert first.balance == Decimal("50.00")
+    assert second.balance == Decimal("20.00")
+    assert db_session.query(JournalEntry).count() == 3
+    assert LedgerService.find_unbalanced_entries(db_session) == []
+    assert LedgerService.find_balance_mismatches(db_session) == []
+
+
+def test_internal_transfer_legs_share_journal_id(db_session, accounts):
+    """Test both transfer legs reference one journal entry with opposite directions."""
+    holder, first, second = accounts
+    TransactionService.create_deposit(db_session, holder.id, DepositRequest(account_id=first.id, amount=Decimal("10.00")))
+    outgoing = TransactionService.create_transfer(db_session, holder.id, TransferRequest(
+        from_account_id=first.id, to_routing_number=settings.routing_number,
+        to_account_number=second.account_number, amount=Decimal("10.00")
+    ))
+
+    legs = db_session.query(Transaction).filter(Transaction.journal_id == outgoing.journal_id).all()
+    assert sorted((t.account_id, t.direction) for t in legs) == [(first.id, "debit"), (second.id, "credit")]
+
+
+def test_post_entry_rejects_unbalanced_and_overdraft(db_session, accounts):
+    """Test the ledger refuses unbalanced entries and negative balances."""
+    _, first, _ = accounts
+    with pytest.raises(TransactionError):
+        LedgerService.post_entry(db_session, "deposit", [(LEDGER_CUSTOMER, first.id, Decimal("5.00"))])
+    db_session.rollback()
+
+    with pytest.raises(InsufficientFundsError):
+        LedgerService.post_entry(db_session, "withdrawal", [
+            (LEDGER_CUSTOMER, first.id, Decimal("-5.00")), (LEDGER_CASH, None, Decimal("5.00"))
+        ])
+    db_session.rollback()
+
+
+def test_rebuild_projection_fixes_drift(db_session, accounts):
+    """Test a drifted cached balance is reported and rebuilt from postings."""
+    holder, first, _ = accounts
+    TransactionService.create_deposit(db_session, holder.id, DepositRequest(account_id=first.id, amount=Decimal("40.00")))
+    first.balance = Decimal("999.00")
+    db_session.commit()
+
+    mismatches = LedgerService.rebuild_projection(db_session)
+    assert mismatches == [{"account_id": first.id, "account_number": "1000000001",
+                           "cached": Decimal("999.00"), "ledger": Decimal("40.00")}]
+
+    LedgerService.rebuild_projection(db_session, apply=True)
+    db_session.refresh(first)
+    assert first.balance == Decimal("40.00")
+    assert LedgerService.find_balance_mismatches(db_session) == []
+
+
+def test_backfill_journals_legacy_transactions(db_session, accounts):
+    """Test pre-ledger transactions get entries that reproduce their balances."""
+    _, first, second = accounts
+    db_session.add_all([
+        Transaction(transaction_id="t1", account_id=first.id, transaction_type="deposit", amount=Decimal("50.00")),
+        Transaction(transaction_id="t2", account_id=first.id, transaction_type="transfer", amount=Decimal("15.00"),
+                    peer_routing_number=settings.routing_number, peer_account_number=second.account_number),
+        Transaction(transaction_id="t3", account_id=second.id, transaction_type="transfer", amount=Decimal("15.00"),
+                    description=f"Transfer from {first.account_number}"),
+    ])
+    first.balance = Decimal("35.00")
+    second.balance = Decimal("15.00")
+    db_session.commit()
+
+    assert LedgerService.backfill(db_session, batch_size=2) == 3
+    assert LedgerService.backfill(db_session) == 0
+    assert db_session.query(Posting).count() == 6
+    assert LedgerService.find_unbalanced_entries(db_session) == []
+    assert LedgerService.find_balance_mismatches(db_session) == []
+    assert {t.transaction_id: t.direction for t in db_session.query(Transaction)} == {
+        "t1": "credit", "t2": "debit", "t3": "credit"
+    }
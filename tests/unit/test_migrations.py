@@ -0,0 +1,115 @@
+"""
+Tests for Alembic migrations and hot-path query plans.
+"""
+import re
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.search_index import is_search_table
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.transaction import Transaction
+from app.services.statement_service import StatementService
+from app.services.transaction_service import TransactionService
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    """Engine on a database built by running every migration."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "migrations"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def migrated_db(migrated_engine):
+    """Session with one holder, two accounts and a few transactions."""
+    db = sessionmaker(bind=migrated_engine)()
+    holder = AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db.add(holder)
+    db.flush()
+    for number in ("1000000001", "1000000002"):
+        account = Account(account_holder_id=holder.id, account_number=number,
+                          account_type="checking", balance=Decimal("0.00"))
+        db.add(account)
+        db.flush()
+        for i in range(3):
+            db.add(Transaction(transaction_id=f"{number}-{i}", account_id=account.id,
+                               transaction_type="deposit", amount=Decimal("1.00")))
+    db.commit()
+    yield db
+    db.close()
+
+
+def _explain_transaction_queries(engine, call) -> list:
+    """Run ``call`` and return EXPLAIN QUERY PLAN output for each transactions query it issued."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if re.search(r"FROM transactions\b", statement):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append(" | ".join(row[-1] for row in rows))
+    assert plans, "no transactions query captured"
+    return plans
+
+
+def test_migrations_match_models(migrated_engine):
+    """Test the migrated schema matches the SQLAlchemy models."""
+    with migrated_engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={
+            "include_name": lambda name, type_, parents: not (type_ == "table" and is_search_table(name))
+        })
+        diff = compare_metadata(context, Base.metadata)
+    assert diff == []
+
+
+def test_account_listing_uses_composite_index(migrated_engine, migrated_db):
+    """Test single-account listing walks the composite index without sorting."""
+    account_id = migrated_db.query(Account.id).first().id
+    plans = _explain_transaction_queries(
+        migrated_engine, lambda: TransactionService.get_transactions(migrated_db, 1, account_id)
+    )
+    assert "ix_transactions_account_id_created_at" in plans[0]
+    assert "TEMP B-TREE" not in plans[0]
+
+
+def test_statement_uses_composite_index(migrated_engine, migrated_db):
+    """Test statement range scans use the composite index without sorting."""
+    plans = _explain_transaction_queries(
+        migrated_engine, lambda: StatementService.get_user_statement(migrated_db, 1)
+    )
+    for plan in plans:
+        assert "ix_transactions_account_id_created_at" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,125 @@
+"""
+Unit tests for the transactional outbox.
+"""
+import asyncio
+import json
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.outbox_event import OutboxEvent
+from app.schemas.transaction import DepositRequest
+from app.services.outbox_service import OutboxDispatcher, OutboxService, register_handler
+from app.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def account(db_session):
+    """Holder with one account."""
+    holder = AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db_session.add(holder)
+    db_session.flush()
+    account = Account(account_holder_id=holder.id, account_number="1000000001",
+                      account_type="checking", balance=Decimal("0.00"))
+    db_session.add(account)
+    db_session.commit()
+    return account
+
+
+def test_deposit_writes_event_in_same_transaction(db_session, account):
+    """Test a committed deposit leaves exactly one pending event with its details."""
+    txn = TransactionService.create_deposit(
+        db_session, account.account_holder_id, DepositRequest(account_id=account.id, amount=Decimal("12.50"))
+    )
+
+    event = db_session.query(OutboxEvent).one()
+    assert event.event_type == "transaction.created"
+    assert event.status == "pending"
+    payload = json.loads(event.payload)
+    assert payload["transaction_id"] == txn.transaction_id
+    assert payload["amount"] == "12.50"
+
+
+def test_rolled_back_event_is_discarded(db_session):
+    """Test events vanish with the transaction that produced them."""
+    OutboxService.enqueue(db_session, "test.rollback", {"n": 1})
+    db_session.rollback()
+    assert db_session.query(OutboxEvent).count() == 0
+
+
+def test_dispatch_delivers_once_to_handlers(db_session):
+    """Test a batch is delivered to registered handlers and marked delivered."""
+    received = []
+    register_handler("test.delivered")(lambda message: received.append(message.payload))
+    OutboxService.enqueue(db_session, "test.delivered", {"n": 1})
+    OutboxService.enqueue(db_session, "test.delivered", {"n": 2})
+    db_session.commit()
+
+    assert OutboxService.dispatch_batch(db_session) == 2
+    assert OutboxService.dispatch_batch(db_session) == 0
+    assert received == [{"n": 1}, {"n": 2}]
+    assert {e.status for e in db_session.query(OutboxEvent)} == {"delivered"}
+
+
+def test_failed_delivery_retries_then_dead_letters(db_session, monkeypatch):
+    """Test handler errors back off and give up after the attempt limit."""
+    monkeypatch.setattr(settings, "outbox_max_attempts", 2)
+    monkeypatch.setattr(settings, "outbox_retry_base_seconds", 60.0)
+
+    def failing(message):
+        raise RuntimeError("downstream unavailable")
+
+    register_handler("test.failing")(failing)
+    event = OutboxService.enqueue(db_session, "test.failing", {})
+    db_session.commit()
+
+    assert OutboxService.dispatch_batch(db_session) == 1
+    db_session.refresh(event)
+    assert (event.status, event.attempts, event.locked_by) == ("pending", 1, None)
+    assert event.available_at > datetime.utcnow()
+    assert "downstream unavailable" in event.last_error
+
+    # Not due yet
+    assert OutboxService.dispatch_batch(db_session) == 0
+
+    event.available_at = datetime.utcnow()
+    db_session.commit()
+    assert OutboxService.dispatch_batch(db_session) == 1
+    db_session.refresh(event)
+    assert (event.status, event.attempts) == ("dead", 2)
+
+
+def test_leased_events_are_not_reclaimed(db_session):
+    """Test a second worker cannot claim events leased to the first."""
+    OutboxService.enqueue(db_session, "test.leased", {})
+    db_session.commit()
+
+    assert len(OutboxService._claim(db_session, 10)) == 1
+    assert OutboxService._claim(db_session, 10) == []
+
+
+def test_async_dispatcher_drains_outbox(db_session):
+    """Test the asyncio dispatcher delivers events and stops cleanly."""
+    received = []
+    register_handler("test.async")(lambda message: received.append(message.id))
+    OutboxService.enqueue(db_session, "test.async", {})
+    db_session.commit()
+
+    dispatcher = OutboxDispatcher(sessionmaker(bind=db_session.get_bind()))
+
+    async def run():
+        dispatcher.start()
+        for _ in range(100):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+
+    asyncio.run(run())
+    assert len(received) == 1
@@ -0,0 +1,95 @@
+"""
+Unit tests for SQL instrumentation.
+"""
+import logging
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.config import settings
+from app.core.logging_config import slow_query_logger
+from app.db.instrumentation import normalize_sql, parameter_shape
+from app.utils.context import query_stats_var, start_query_stats
+from tests.conftest import engine
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def slow_log():
+    """Capture slow-query log records."""
+    handler = _ListHandler()
+    slow_query_logger.addHandler(handler)
+    yield handler.records
+    slow_query_logger.removeHandler(handler)
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    """Test statements differing only in values normalize identically."""
+    sql = """SELECT * FROM transactions
+             WHERE account_id IN (?, ?, ?) AND amount > 10.50 AND description = 'x''y'"""
+    assert normalize_sql(sql) == (
+        "SELECT * FROM transactions WHERE account_id IN (?...) AND amount > ? AND description = ?"
+    )
+
+
+def test_parameter_shape_reports_types_only():
+    """Test parameter shapes never include values."""
+    assert parameter_shape((1, "123-45-6789"), executemany=False) == ["int", "str"]
+    assert parameter_shape({"id": 1}, executemany=False) == {"id": "int"}
+    assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == {"rows": 2, "row": ["int", "str"]}
+
+
+def test_queries_recorded_in_context():
+    """Test executed statements are counted for the current request."""
+    stats = start_query_stats()
+    try:
+        with engine.connect() as conn:
+            for value in range(3):
+                conn.execute(text("SELECT :value"), {"value": value})
+    finally:
+        query_stats_var.set(None)
+
+    assert stats.count == 3
+    assert stats.as_log_fields()["db_max_statement_repeats"] == 3
+    assert stats.slowest_statement == "SELECT ?"
+
+
+def test_failed_statements_do_not_leak_start_times():
+    """Test a statement that raises leaves no timing entry on the connection."""
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.connection.info.get("query_start_time") == []
+
+
+def test_slow_queries_logged_with_trace_id(slow_log, monkeypatch):
+    """Test statements above the threshold go to the slow-query log."""
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0.0)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT :secret"), {"secret": "123-45-6789"})
+
+    record = slow_log[-1]
+    assert record.statement == "SELECT ?"
+    assert record.parameters == ["str"]
+    assert "123-45-6789" not in str(record.__dict__)
+
+
+def test_request_completed_log_includes_db_fields(client, caplog):
+    """Test the request log line carries per-request SQL statistics."""
+    with caplog.at_level(logging.INFO):
+        client.post("/api/v1/auth/login", json={"email": "nobody@example.com", "password": "wrongpassword"})
+
+    completed = [r for r in caplog.records if r.getMessage() == "Request completed"][-1]
+    assert completed.db_queries >= 1
+    assert completed.db_time_ms >= 0
+    assert "account_holders" in completed.db_slowest_statement
@@ -0,0 +1,69 @@
+"""
+Unit tests for read/write session routing.
+"""
+import asyncio
+from datetime import date
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.config import settings
+from app.db.session import SessionLocal, WriteTracker, write_tracker
+from app.db.sqlite_tuning import install_query_only
+from app.dependencies import get_user_read_db
+from app.db.base import Base
+from app.models.account_holder import AccountHolder
+
+
+def test_read_engine_rejects_writes(tmp_path):
+    """Test query_only connections refuse writes but allow reads."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))
+
+    read_engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    install_query_only(read_engine)
+    with read_engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+
+def test_write_tracker_window(monkeypatch):
+    """Test users are only routed to the primary within the window."""
+    tracker = WriteTracker()
+    tracker.mark(1)
+    assert tracker.recently_wrote(1)
+    assert not tracker.recently_wrote(2)
+
+    monkeypatch.setattr(settings, "read_your_writes_window_seconds", 0.0)
+    assert not tracker.recently_wrote(1)
+
+
+def test_user_read_db_falls_back_to_primary_after_write():
+    """Test the read dependency returns the primary session after a user's write."""
+    user = AccountHolder(id=4242)
+    read_db, primary_db = object(), object()
+
+    assert asyncio.run(get_user_read_db(user, read_db, primary_db)) is read_db
+    write_tracker.mark(user.id)
+    assert asyncio.run(get_user_read_db(user, read_db, primary_db)) is primary_db
+
+
+def test_primary_commit_marks_user(tmp_path):
+    """Test a commit that wrote on behalf of a user records the write."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal(bind=engine)
+    db.info["user_id"] = 5151
+    db.query(AccountHolder).all()
+    db.commit()
+    assert not write_tracker.recently_wrote(5151)
+
+    db.add(AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    ))
+    db.commit()
+    assert write_tracker.recently_wrote(5151)
+    db.close()
@@ -0,0 +1,146 @@
+"""
+Unit tests for balance reconciliation.
+"""
+import csv
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from app.config import settings
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.archived_transaction import ArchivedTransaction
+from app.models.reconciled_balance import ReconciledBalance
+from app.models.transaction import Transaction
+from app.schemas.transaction import DepositRequest, TransferRequest, WithdrawalRequest
+from app.services.reconciliation_service import ReconciliationService
+from app.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def accounts(db_session):
+    """Holder with two funded accounts."""
+    holder = AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db_session.add(holder)
+    db_session.flush()
+    first = Account(account_holder_id=holder.id, account_number="1000000001",
+                    account_type="checking", balance=Decimal("0.00"))
+    second = Account(account_holder_id=holder.id, account_number="1000000002",
+                     account_type="savings", balance=Decimal("0.00"))
+    db_session.add_all([first, second])
+    db_session.commit()
+
+    TransactionService.create_deposit(db_session, holder.id, DepositRequest(account_id=first.id, amount=Decimal("100.00")))
+    TransactionService.create_withdrawal(db_session, holder.id, WithdrawalRequest(account_id=first.id, amount=Decimal("30.00")))
+    TransactionService.create_transfer(db_session, holder.id, TransferRequest(
+        from_account_id=first.id, to_routing_number=settings.routing_number,
+        to_account_number=second.account_number, amount=Decimal("20.00")
+    ))
+    return holder, first, second
+
+
+def reconcile(db, full=False, chunk_size=1, report_dir=None):
+    """Run the whole job in-process, one account per chunk."""
+    run = ReconciliationService.start_run(db, full=full)
+    checked, discrepancies = 0, []
+    for first_id, last_id in ReconciliationService.account_ranges(db, chunk_size):
+        count, found = ReconciliationService.reconcile_range(
+            db, first_id, last_id, run.since_transaction_id, run.watermark, run.full
+        )
+        checked += count
+        discrepancies.extend(found)
+    return ReconciliationService.finish_run(db, run, checked, discrepancies, report_dir)
+
+
+def test_reconcile_reports_drifted_balance(db_session, accounts, tmp_path):
+    """Test a balance changed without a transaction is reported, and consistent accounts are not."""
+    _, first, second = accounts
+    run = reconcile(db_session, report_dir=tmp_path)
+    assert (run.accounts_checked, run.discrepancies) == (2, 0)
+
+    first.balance = Decimal("49.00")
+    db_session.commit()
+    run = reconcile(db_session, report_dir=tmp_path)
+    assert run.discrepancies == 1
+    with open(run.report_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows == [{"account_id": str(first.id), "account_number": "1000000001",
+                     "balance": "49.00", "expected": "50.00", "difference": "-1.00"}]
+
+
+def test_incremental_run_adds_only_new_transactions(db_session, accounts, tmp_path):
+    """Test a run continues from the previous watermark and keeps stored totals current."""
+    holder, first, second = accounts
+    first_run = reconcile(db_session, report_dir=tmp_path)
+    totals = {row.account_id: row.transaction_total for row in db_session.query(ReconciledBalance)}
+    assert totals == {first.id: Decimal("50.00"), second.id: Decimal("20.00")}
+
+    TransactionService.create_deposit(db_session, holder.id, DepositRequest(account_id=second.id, amount=Decimal("5.00")))
+    run = reconcile(db_session, report_dir=tmp_path)
+    assert run.since_transaction_id == first_run.watermark
+    assert run.watermark > first_run.watermark
+    assert run.discrepancies == 0
+    db_session.expire_all()
+    assert db_session.get(ReconciledBalance, second.id).transaction_total == Decimal("25.00")
+
+    # A full run recomputes the same totals from scratch
+    assert reconcile(db_session, full=True, report_dir=tmp_path).discrepancies == 0
+    assert db_session.get(ReconciledBalance, second.id).transaction_total == Decimal("25.00")
+
+
+def test_interrupted_run_does_not_double_count(db_session, accounts, tmp_path):
+    """Test chunks committed by an unfinished run are not aggregated twice by the next run."""
+    holder, first, second = accounts
+    reconcile(db_session, report_dir=tmp_path)
+    TransactionService.create_deposit(db_session, holder.id, DepositRequest(account_id=first.id, amount=Decimal("7.00")))
+
+    # Crash after the first chunk: the run never finishes, the watermark stays put
+    run = ReconciliationService.start_run(db_session)
+    ReconciliationService.reconcile_range(db_session, first.id, first.id, run.since_transaction_id, run.watermark)
+
+    run = reconcile(db_session, report_dir=tmp_path)
+    assert run.discrepancies == 0
+    db_session.expire_all()
+    assert db_session.get(ReconciledBalance, first.id).transaction_total == Decimal("57.00")
+
+
+def test_legacy_and_archived_rows_are_signed(db_session, accounts, tmp_path):
+    """Test pre-ledger rows without a direction and archived rows count toward the expected balance."""
+    _, first, second = accounts
+    now = datetime.utcnow()
+    db_session.add_all([
+        Transaction(transaction_id=str(uuid.uuid4()), account_id=second.id, transaction_type="transfer",
+                    amount=Decimal("3.00"), description="Transfer from 1000000001"),
+        Transaction(transaction_id=str(uuid.uuid4()), account_id=second.id, transaction_type="withdrawal",
+                    amount=Decimal("1.00")),
+        ArchivedTransaction(id=10_000, created_at=now, updated_at=now, transaction_id=str(uuid.uuid4()),
+                            account_id=second.id, transaction_type="deposit", amount=Decimal("4.00")),
+    ])
+    second.balance = Decimal("26.00")
+    db_session.commit()
+
+    assert reconcile(db_session, chunk_size=10, report_dir=tmp_path).discrepancies == 0
+
+
+def test_row_below_watermark_is_recounted(db_session, accounts, tmp_path):
+    """Test a transaction that appears at or below the last watermark is picked up instead of reported."""
+    _, first, second = accounts
+    run = reconcile(db_session, report_dir=tmp_path)
+    reused_id = db_session.query(Transaction).filter_by(account_id=first.id, transaction_type="withdrawal").one().id
+    db_session.query(Transaction).filter_by(id=reused_id).delete()
+    db_session.add(Transaction(id=reused_id, transaction_id=str(uuid.uuid4()), account_id=second.id,
+                               transaction_type="deposit", amount=Decimal("5.00"), direction="credit"))
+    first.balance = Decimal("80.00")  # its 30.00 withdrawal is gone
+    second.balance = Decimal("25.00")
+    db_session.commit()
+    assert reused_id <= run.watermark
+
+    assert reconcile(db_session, report_dir=tmp_path).discrepancies == 0
+    db_session.expire_all()
+    assert db_session.get(ReconciledBalance, first.id).transaction_total == Decimal("80.00")
+    assert db_session.get(ReconciledBalance, second.id).transaction_total == Decimal("25.00")
+    # The repaired totals keep later incremental runs clean
+    assert reconcile(db_session, report_dir=tmp_path).discrepancies == 0
@@ -0,0 +1,80 @@
+"""
+Unit tests for the production server configuration.
+"""
+import os
+from types import SimpleNamespace
+import pytest
+from app.config import settings
+from app.server import available_cpus, server_options
+
+
+def test_available_cpus_honors_cgroup_quota(tmp_path):
+    """Test the worker count follows a container CPU quota, rounded up."""
+    affinity = len(os.sched_getaffinity(0))
+    cpu_max = tmp_path / "cpu.max"
+
+    cpu_max.write_text("150000 100000\n")
+    assert available_cpus(cpu_max) == min(affinity, 2)
+
+    cpu_max.write_text("max 100000\n")
+    assert available_cpus(cpu_max) == affinity
+    assert available_cpus(tmp_path / "missing") == affinity
+
+
+def test_server_options_from_settings(monkeypatch):
+    """Test the gunicorn config preloads the app and recycles workers."""
+    monkeypatch.setattr(settings, "workers", 0)
+    monkeypatch.setattr(settings, "max_requests", 500)
+    monkeypatch.setattr(settings, "ssl_key_path", "missing-key.pem")
+    monkeypatch.setattr(settings, "velocity_backend", "redis")
+
+    options = server_options(port=9000)
+
+    assert options["bind"] == f"{settings.host}:9000"
+    assert options["workers"] == available_cpus()
+    assert options["worker_class"] == "app.server.BankUvicornWorker"
+    assert options["preload_app"] is True
+    assert options["max_requests"] == 500
+    assert options["graceful_timeout"] == settings.graceful_timeout_seconds
+    assert "keyfile" not in options
+
+    monkeypatch.setattr(settings, "max_requests", 0)
+    options = server_options(workers=3, ssl_keyfile="key.pem", ssl_certfile="cert.pem")
+    assert options["workers"] == 3
+    assert options["max_requests_jitter"] == 0
+    assert (options["keyfile"], options["certfile"]) == ("key.pem", "cert.pem")
+
+
+def test_server_options_reject_per_process_velocity_windows(monkeypatch):
+    """Test several workers require the shared velocity backend."""
+    monkeypatch.setattr(settings, "velocity_enabled", True)
+    monkeypatch.setattr(settings, "velocity_backend", "memory")
+    with pytest.raises(ValueError, match="VELOCITY_BACKEND=redis"):
+        server_options(workers=2)
+    assert server_options(workers=1)["workers"] == 1
+
+    # The default (one worker per CPU) falls back to a single worker instead of failing
+    monkeypatch.setattr(settings, "workers", 0)
+    monkeypatch.setattr("app.server.available_cpus", lambda: 4)
+    assert server_options()["workers"] == 1
+    monkeypatch.setattr(settings, "velocity_backend", "redis")
+    assert server_options()["workers"] == 4
+    monkeypatch.setattr(settings, "velocity_backend", "memory")
+
+    monkeypatch.setattr(settings, "velocity_enabled", False)
+    assert server_options(workers=2)["workers"] == 2
+
+
+def test_master_reports_through_gunicorn_logger(monkeypatch):
+    """Test the master's startup line goes to gunicorn's logger, not the app log inherited by workers."""
+    monkeypatch.setattr(settings, "velocity_backend", "redis")
+    options = server_options(workers=2)
+    lines = []
+    server = SimpleNamespace(
+        cfg=SimpleNamespace(bind=[options["bind"]], workers=2, keepalive=5, backlog=2048, max_requests=0),
+        app=SimpleNamespace(load_ms=12.5),
+        log=SimpleNamespace(info=lambda message, *args: lines.append(message % args)),
+    )
+    options["when_ready"](server)
+    assert lines == [f"Starting server: bind={options['bind']} workers=2 keepalive=5 backlog=2048 "
+                     "max_requests=0 preload_ms=12.5"]
@@ -0,0 +1,101 @@
+"""
+Unit tests for outbound ACH settlement.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from app.config import settings
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.ach_transfer import AchTransfer
+from app.schemas.transaction import DepositRequest, TransferRequest
+from app.services.ledger_service import LedgerService
+from app.services.settlement_service import SettlementService
+from app.services.transaction_service import TransactionService
+from app.utils import nacha
+
+
+@pytest.fixture
+def funded_account(db_session):
+    """Holder with one account holding $1000."""
+    holder = AccountHolder(
+        name="Jane Doe", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db_session.add(holder)
+    db_session.flush()
+    account = Account(account_holder_id=holder.id, account_number="1000000001",
+                      account_type="checking", balance=Decimal("0.00"))
+    db_session.add(account)
+    db_session.commit()
+    TransactionService.create_deposit(db_session, holder.id, DepositRequest(account_id=account.id, amount=Decimal("1000.00")))
+    return account
+
+
+def _send(db_session, account, routing: str, amount: str) -> None:
+    TransactionService.create_transfer(db_session, account.account_holder_id, TransferRequest(
+        from_account_id=account.id, to_routing_number=routing,
+        to_account_number="555000111", amount=Decimal(amount)
+    ))
+
+
+def test_external_transfer_is_queued(db_session, funded_account):
+    """Test external transfers are queued pending; internal ones are not."""
+    _send(db_session, funded_account, "021000021", "25.00")
+    _send(db_session, funded_account, settings.routing_number, "5.00")
+
+    queued = db_session.query(AchTransfer).one()
+    assert (queued.status, queued.to_routing_number, queued.amount) == ("pending", "021000021", Decimal("25.00"))
+
+
+def test_cycle_writes_grouped_nacha_file(db_session, funded_account, tmp_path):
+    """Test a cycle writes valid fixed-width records, one batch per routing number."""
+    for routing, amount in (("021000021", "10.00"), ("011000015", "20.00"), ("021000021", "30.00")):
+        _send(db_session, funded_account, routing, amount)
+
+    [summary] = SettlementService.run_cycle(db_session, str(tmp_path), chunk_size=2, now=datetime(2026, 1, 2, 3, 4))
+    assert (summary["batches"], summary["entries"], summary["total"]) == (2, 3, Decimal("60.00"))
+
+    lines = open(summary["path"]).read().splitlines()
+    assert all(len(line) == nacha.RECORD_SIZE for line in lines)
+    assert len(lines) % nacha.BLOCKING_FACTOR == 0
+    assert [line[0] for line in lines[:8]] == ["1", "5", "6", "8", "5", "6", "6", "8"]
+    assert lines[2][3:12] == "011000015" and lines[2][29:39] == "0000002000"
+    assert lines[8][0] == "9"
+    assert lines[8][1:7] == "000002" and lines[8][13:21] == "00000003"
+    assert lines[8][43:55] == "000000006000"
+    assert int(lines[8][21:31]) == 2 * 2100002 + 1100001  # first 8 routing digits per entry
+    assert set(lines[9:]) == {nacha.PADDING_RECORD}
+
+    transfers = db_session.query(AchTransfer).all()
+    assert {t.status for t in transfers} == {"batched"}
+    assert len({t.trace_number for t in transfers}) == 3
+    assert SettlementService.run_cycle(db_session, str(tmp_path)) == []
+
+
+def test_interrupted_cycle_is_completed(db_session, funded_account, tmp_path):
+    """Test a batch claimed without a file is written by the next cycle."""
+    _send(db_session, funded_account, "021000021", "10.00")
+    SettlementService._claim(db_session, "stalled-batch")
+
+    summaries = SettlementService.run_cycle(db_session, str(tmp_path))
+    assert [s["batch_id"] for s in summaries] == ["stalled-batch"]
+    assert SettlementService.file_path("stalled-batch", str(tmp_path)).exists()
+
+
+def test_settle_and_return(db_session, funded_account, tmp_path):
+    """Test settlement clears the batch and a return credits the source account."""
+    _send(db_session, funded_account, "021000021", "40.00")
+    [summary] = SettlementService.run_cycle(db_session, str(tmp_path))
+
+    assert SettlementService.settle(db_session, summary["batch_id"]) == 1
+    transfer = db_session.query(AchTransfer).one()
+    assert transfer.status == "settled"
+
+    assert SettlementService.process_returns(db_session, summary["batch_id"], [(transfer.trace_number, "R03")]) == 1
+    db_session.refresh(transfer)
+    db_session.refresh(funded_account)
+    assert (transfer.status, transfer.return_code) == ("returned", "R03")
+    assert funded_account.balance == Decimal("1000.00")
+    assert LedgerService.find_unbalanced_entries(db_session) == []
+    assert LedgerService.find_balance_mismatches(db_session) == []
@@ -0,0 +1,117 @@
+"""
+Unit tests for the SQLite tuning profile and busy retries.
+"""
+import asyncio
+import sqlite3
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.config import settings
+from app.core.concurrency import run_blocking
+from app.db.sqlite_tuning import install_sqlite_profile, retry_on_busy, sqlite_pragmas
+
+
+class _FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _busy_error() -> OperationalError:
+    return OperationalError("INSERT ...", {}, sqlite3.OperationalError("database is locked"))
+
+
+def test_profile_applies_pragmas(tmp_path):
+    """Test every new connection gets the configured pragmas."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    install_sqlite_profile(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.sqlite_busy_timeout_ms
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -settings.sqlite_cache_size_kib
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    engine.dispose()
+
+
+def test_invalid_pragma_keyword_rejected(monkeypatch):
+    """Test pragma keywords are validated before being interpolated."""
+    monkeypatch.setattr(settings, "sqlite_journal_mode", "WAL; DROP TABLE accounts")
+    with pytest.raises(ValueError):
+        sqlite_pragmas()
+
+
+def test_retry_on_busy_retries_then_succeeds(monkeypatch):
+    """Test busy errors roll back and re-run the unit of work."""
+    monkeypatch.setattr(settings, "db_busy_retry_base_ms", 0.0)
+    calls = []
+
+    @retry_on_busy
+    def work(db):
+        calls.append(1)
+        if len(calls) < 3:
+            raise _busy_error()
+        return "done"
+
+    db = _FakeSession()
+    assert work(db) == "done"
+    assert len(calls) == 3
+    assert db.rollbacks == 2
+
+
+def test_retry_on_busy_is_bounded(monkeypatch):
+    """Test retries stop after db_busy_retries attempts."""
+    monkeypatch.setattr(settings, "db_busy_retry_base_ms", 0.0)
+    monkeypatch.setattr(settings, "db_busy_retries", 2)
+
+    @retry_on_busy
+    def work(db):
+        raise _busy_error()
+
+    with pytest.raises(OperationalError):
+        work(_FakeSession())
+
+
+def test_retry_on_busy_ignores_other_errors():
+    """Test non-busy operational errors are not retried."""
+    @retry_on_busy
+    def work(db):
+        raise OperationalError("SELECT", {}, sqlite3.OperationalError("no such table: accounts"))
+
+    db = _FakeSession()
+    with pytest.raises(OperationalError):
+        work(db)
+    assert db.rollbacks == 0
+
+
+async def test_retry_backoff_does_not_block_event_loop(monkeypatch):
+    """Test retried work run with run_blocking backs off without stalling other coroutines."""
+    monkeypatch.setattr(settings, "db_busy_retry_base_ms", 100.0)
+    monkeypatch.setattr(settings, "db_busy_retry_max_ms", 100.0)
+    monkeypatch.setattr("app.db.sqlite_tuning.random.uniform", lambda low, high: high)
+    calls = []
+
+    @retry_on_busy
+    def work(db):
+        calls.append(1)
+        if len(calls) < 3:
+            raise _busy_error()
+        return "done"
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    try:
+        assert await run_blocking(work, _FakeSession()) == "done"
+    finally:
+        ticker.cancel()
+    assert ticks >= 10  # the loop kept running during the 200 ms of backoff
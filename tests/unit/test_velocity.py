@@ -0,0 +1,246 @@
+"""
+Unit tests for velocity rules.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.config import settings
+from app.core.exceptions import VelocityLimitError
+from app.models.account import Account
+from app.models.account_holder import AccountHolder
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransferRequest, WithdrawalRequest
+from app.services.transaction_service import TransactionService
+from app.services.velocity_service import (
+    AccountHistory, RedisVelocityBackend, SlidingWindow, VelocityReservation, VelocityService, velocity_backend,
+)
+
+
+@pytest.fixture
+def account(db_session):
+    """Funded checking account."""
+    holder = AccountHolder(
+        name="Jane", email="jane@example.com", password_hash="x", ssn_encrypted=b"x",
+        date_of_birth=date(1990, 1, 1), mailing_address="1 Main St"
+    )
+    db_session.add(holder)
+    db_session.flush()
+    account = Account(account_holder_id=holder.id, account_number="1000000001", account_type="checking",
+                      balance=Decimal("100000.00"))
+    db_session.add(account)
+    db_session.commit()
+    return account
+
+
+def _withdraw(db_session, account, amount="10.00"):
+    return TransactionService.create_withdrawal(
+        db_session, account.account_holder_id, WithdrawalRequest(account_id=account.id, amount=Decimal(amount))
+    )
+
+
+def _transfer(db_session, account, to_account_number, amount="10.00"):
+    return TransactionService.create_transfer(db_session, account.account_holder_id, TransferRequest(
+        from_account_id=account.id, to_routing_number="021000021", to_account_number=to_account_number,
+        amount=Decimal(amount)
+    ))
+
+
+def test_sliding_window_expires_old_buckets():
+    """Test events leave the window once their bucket is older than the span."""
+    window = SlidingWindow(span=60, width=5)
+    window.add(1000.0, 100)
+    window.add(1030.0, 50)
+
+    assert window.totals(1059.0) == (2, 150)
+    assert window.totals(1066.0) == (1, 50)  # 1000's bucket has left the window
+    assert window.totals(1000.0 + 10 ** 6) == (0, 0)
+
+    window.add(900.0, 1)  # older than the window: ignored
+    assert window.totals(1000.0 + 10 ** 6) == (0, 0)
+
+
+def test_count_and_amount_limits(db_session, account, monkeypatch):
+    """Test per-window count and amount limits block further outflows."""
+    monkeypatch.setattr(settings, "velocity_max_count_per_minute", 2)
+    _withdraw(db_session, account)
+    _withdraw(db_session, account)
+    with pytest.raises(VelocityLimitError) as exc_info:
+        _withdraw(db_session, account)
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers == {"Retry-After": "5"}
+
+    monkeypatch.setattr(settings, "velocity_max_count_per_minute", 0)
+    monkeypatch.setattr(settings, "velocity_max_amount_per_hour", Decimal("100.00"))
+    _withdraw(db_session, account, "80.00")
+    with pytest.raises(VelocityLimitError):
+        _withdraw(db_session, account, "0.01")  # 20.00 + 80.00 already this hour
+
+    # Rejected outflows are not counted and leave the balance untouched
+    assert db_session.query(Transaction).count() == 3
+
+
+def test_reservations_count_until_released(db_session, account, monkeypatch):
+    """Test concurrent outflows cannot pass against the same totals, and failed ones give their slot back."""
+    monkeypatch.setattr(settings, "velocity_max_count_per_minute", 2)
+    first = VelocityService.reserve(db_session, account.id, Decimal("1.00"))
+    VelocityService.reserve(db_session, account.id, Decimal("1.00"))  # still in flight
+    with pytest.raises(VelocityLimitError):
+        VelocityService.reserve(db_session, account.id, Decimal("1.00"))
+
+    VelocityService.release(first)
+    VelocityService.release(VelocityService.reserve(db_session, account.id, Decimal("1.00")))
+
+    # An outflow whose commit fails is released as well
+    def fail():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(db_session, "commit", fail)
+    with pytest.raises(RuntimeError):
+        _withdraw(db_session, account)
+    VelocityService.reserve(db_session, account.id, Decimal("1.00"))
+
+
+def test_windows_are_rebuilt_from_transactions(db_session, account, monkeypatch):
+    """Test a process that has not seen the account counts its recent history."""
+    now = datetime.utcnow()
+    for i, age in enumerate((timedelta(seconds=20), timedelta(seconds=40), timedelta(minutes=5))):
+        db_session.add(Transaction(
+            transaction_id=f"old-{i}", account_id=account.id, transaction_type="withdrawal",
+            amount=Decimal("1.00"), direction="debit", created_at=now - age, updated_at=now - age
+        ))
+    db_session.commit()
+    velocity_backend.clear()
+
+    monkeypatch.setattr(settings, "velocity_max_count_per_minute", 3)
+    monkeypatch.setattr(settings, "velocity_max_count_per_hour", 4)
+    _withdraw(db_session, account)
+    with pytest.raises(VelocityLimitError, match="per minute"):
+        _withdraw(db_session, account)
+
+    monkeypatch.setattr(settings, "velocity_max_count_per_minute", 0)
+    with pytest.raises(VelocityLimitError, match="per hour"):
+        _withdraw(db_session, account)
+
+
+def test_new_payee_limits(db_session, account, monkeypatch):
+    """Test first transfers to a payee are capped, and payees seen before are not."""
+    monkeypatch.setattr(settings, "velocity_new_payee_max_amount", Decimal("500.00"))
+    monkeypatch.setattr(settings, "velocity_new_payees_per_day", 2)
+
+    with pytest.raises(VelocityLimitError, match="new payee"):
+        _transfer(db_session, account, "5550001", "600.00")
+    _transfer(db_session, account, "5550001", "400.00")
+    _transfer(db_session, account, "5550001", "600.00")  # known payee now
+
+    # Known payees survive a rebuild from the database
+    velocity_backend.clear()
+    _transfer(db_session, account, "5550001", "600.00")
+
+    _transfer(db_session, account, "5550002")
+    with pytest.raises(VelocityLimitError, match="new payees per day"):
+        _transfer(db_session, account, "5550003")
+    _transfer(db_session, account, "5550002")
+
+
+def test_endpoint_returns_429(client, monkeypatch):
+    """Test a blocked withdrawal is answered with 429 and Retry-After."""
+    monkeypatch.setattr(settings, "velocity_max_count_per_minute", 1)
+    response = client.post("/api/v1/auth/signup", json={
+        "name": "Fast User", "email": "fast@example.com", "password": "securepassword123",
+        "ssn": "123-45-6789", "date_of_birth": "1990-01-01", "mailing_address": "1 Main St"
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    account = client.post("/api/v1/accounts", json={"account_type": "checking"}, headers=headers).json()
+    client.post("/api/v1/transactions/deposit", json={"account_id": account["id"], "amount": "100.00"},
+                headers=headers)
+
+    withdrawal = {"account_id": account["id"], "amount": "1.00"}
+    assert client.post("/api/v1/transactions/withdraw", json=withdrawal, headers=headers).status_code == 201
+    blocked = client.post("/api/v1/transactions/withdraw", json=withdrawal, headers=headers)
+    assert blocked.status_code == 429
+    assert blocked.headers["Retry-After"] == "5"
+    assert "per minute" in blocked.json()["error"]
+
+
+@pytest.fixture
+def redis_backend(monkeypatch):
+    """Redis backend on an in-process fake server, used by VelocityService."""
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = pytest.importorskip("redis")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda url: fakeredis.FakeRedis(server=server))
+    backend = RedisVelocityBackend("redis://velocity-test")
+    monkeypatch.setattr("app.services.velocity_service.velocity_backend", backend)
+    return backend
+
+
+def _no_history():
+    return AccountHistory([], set(), [])
+
+
+def test_redis_reservations_are_shared_by_workers(redis_backend):
+    """Test reservations, releases and confirmations are seen by every worker."""
+    other = RedisVelocityBackend("redis://velocity-test")  # a second worker
+    now = 1_000_000.0
+
+    first = redis_backend.reserve(1, 500, "021000021:1", now, _no_history)
+    assert (first.windows["minute"], first.new_payees, first.known_payee) == ((1, 500), 1, False)
+    second = other.reserve(1, 200, "021000021:1", now + 1, _no_history)
+    assert (second.windows["minute"], second.new_payees) == ((2, 700), 2)
+
+    other.release(VelocityReservation(1, 200, "021000021:1", now + 1, True))  # its commit failed
+    redis_backend.confirm(VelocityReservation(1, 500, "021000021:1", now, True))
+    third = other.reserve(1, 100, "021000021:1", now + 2, _no_history)
+    assert (third.windows["minute"], third.new_payees, third.known_payee) == ((2, 600), 1, True)
+
+
+def test_redis_concurrent_first_payments_count_one_new_payee(redis_backend):
+    """Test two in-flight first payments to the same payee end up as one new payee."""
+    now = 1_000_000.0
+    reservations = []
+    for offset in (0, 1):
+        snapshot = redis_backend.reserve(1, 100, "021000021:7", now + offset, _no_history)
+        assert not snapshot.known_payee
+        reservations.append(VelocityReservation(1, 100, "021000021:7", now + offset, True))
+    for reservation in reservations:
+        redis_backend.confirm(reservation)
+    assert redis_backend.reserve(1, 100, None, now + 2, _no_history).new_payees == 1
+
+
+def test_redis_windows_are_rebuilt_once(redis_backend):
+    """Test an account's history is loaded by one worker and counted once."""
+    other = RedisVelocityBackend("redis://velocity-test")
+    now = 1_000_000.0
+    loads = []
+
+    def load():
+        loads.append(1)
+        return AccountHistory([(now - 10, 300)], {"021000021:9"}, [now - 10])
+
+    snapshot = redis_backend.reserve(2, 100, "021000021:9", now, load)
+    assert (snapshot.windows["minute"], snapshot.known_payee, snapshot.new_payees) == ((2, 400), True, 1)
+    assert other.reserve(2, 100, None, now, load).windows["minute"] == (3, 500)
+    assert len(loads) == 1
+
+    # A worker that loses the race to rebuild an account discards its own copy
+    def racing_load():
+        other.reserve(3, 0, None, now, load)  # the other worker rebuilds meanwhile
+        return load()
+
+    assert redis_backend.reserve(3, 100, None, now, racing_load).windows["minute"] == (3, 400)
+
+
+def test_redis_limits_through_service(db_session, account, redis_backend, monkeypatch):
+    """Test VelocityService enforces limits and releases failed outflows with the Redis backend."""
+    monkeypatch.setattr(settings, "velocity_max_count_per_minute", 2)
+    _withdraw(db_session, account)
+    in_flight = VelocityService.reserve(db_session, account.id, Decimal("1.00"))
+    with pytest.raises(VelocityLimitError):
+        _withdraw(db_session, account)
+
+    VelocityService.release(in_flight)
+    _withdraw(db_session, account)
+    with pytest.raises(VelocityLimitError):
+        VelocityService.reserve(db_session, account.id, Decimal("1.00"))